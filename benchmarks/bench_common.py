@@ -0,0 +1,171 @@
+"""Helpers shared by the benchmark scripts; the benchmarks run against the source tree, not an installed wheel."""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spectra_assure_api_client import VERSION  # noqa: E402
+
+
+def quiet_logging() -> None:
+    # the benchmarks provoke 404, 429 and 5xx on purpose, do not report them on stderr
+    root = logging.getLogger()
+    root.handlers = [logging.NullHandler()]
+    root.setLevel(logging.CRITICAL + 1)
+
+
+def make_arg_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--output", default=None, help="write the JSON results to this file, default stdout")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer iterations, e.g. for CI")
+    return parser
+
+
+def percentile(
+    values: List[float],
+    p: float,
+) -> float:
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def latency_stats(
+    latencies: List[float],
+    elapsed: float,
+) -> Dict[str, Any]:
+    return {
+        "count": len(latencies),
+        "elapsed_s": round(elapsed, 6),
+        "requests_per_s": round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+def time_calls(
+    func: Callable[[], Any],
+    iterations: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t)
+    return latency_stats(latencies, time.perf_counter() - start)
+
+
+def cpu_per_call(
+    func: Callable[[], Any],
+    iterations: int,
+) -> Dict[str, Any]:
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    cpu = time.process_time() - start
+    return {
+        "iterations": iterations,
+        "cpu_us_per_call": round(cpu / iterations * 1e6, 3),
+    }
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def start_mock_process(**options: Any) -> Tuple["subprocess.Popen[bytes]", Dict[str, Any]]:
+    """Run the mock Portal in its own process, so it does not add to the CPU time and memory of the benchmark."""
+    port = free_port()
+    cmd = [sys.executable, "-m", "spectra_assure_api_client.mock", "--port", str(port)]
+    for k, v in options.items():
+        flag = "--" + k.replace("_", "-")
+        if v is True:
+            cmd.append(flag)
+        elif v is not None and v is not False:
+            cmd.extend([flag, str(v)])
+
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=repo_dir)
+    process = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"the mock portal did not start: {cmd}")
+            time.sleep(0.05)
+
+    client_args = {
+        "server": "local",
+        "host": f"127.0.0.1:{port}",
+        "organization": "mock-org",
+        "group": "mock-group",
+        "token": str(options.get("token") or "mock-token"),
+    }
+    return process, client_args
+
+
+def stop_mock_process(process: "subprocess.Popen[bytes]") -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "sdk_version": VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def write_results(
+    *,
+    benchmark: str,
+    results: Dict[str, Any],
+    output: str | None,
+) -> None:
+    data = {
+        "benchmark": benchmark,
+        "environment": environment(),
+        "results": results,
+    }
+    text = json.dumps(data, indent=2, sort_keys=True)
+    if output is None:
+        print(text)
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
@@ -0,0 +1,159 @@
+#! /usr/bin/env python3
+"""
+Import time benchmarks for short-lived invocations (a CI step, a serverless function).
+
+Every measurement runs in a fresh interpreter:
+the time to import the package, the exceptions and SpectraAssureApiOperations,
+and a one-shot status() against the mock Portal (import, client creation and one request).
+The heaviest modules of the import are listed from 'python -X importtime'.
+The script exits with 1 if 'import spectra_assure_api_client' loads a module that must stay lazy.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+import bench_common
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that only the operations (requests) or an enabled feature (profiling) may load
+LAZY_MODULES: List[str] = ["requests", "urllib3", "cProfile", "pstats", "tracemalloc", "uuid"]
+
+CASES: Dict[str, str] = {
+    "package": "import spectra_assure_api_client",
+    "exceptions": "from spectra_assure_api_client import SpectraAssureInvalidAction",
+    "operations": "from spectra_assure_api_client import SpectraAssureApiOperations",
+}
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+{code}
+t1 = time.perf_counter()
+{after}
+t2 = time.perf_counter()
+print(json.dumps({{"import_s": t1 - t0, "after_s": t2 - t1, "lazy": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+STATUS = """
+client = SpectraAssureApiOperations(**{client_args!r})
+data = client.status(project="project-000", package="package-000", version="1.0.0")
+assert data.status_code == 200, data.status_code
+"""
+
+
+def run_child(
+    code: str,
+    after: str = "pass",
+) -> Dict[str, Any]:
+    script = CHILD.format(code=code, after=after, lazy=LAZY_MODULES)
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result: Dict[str, Any] = json.loads(out.strip().splitlines()[-1])
+    return result
+
+
+def bench_case(
+    code: str,
+    repeat: int,
+    after: str = "pass",
+) -> Dict[str, Any]:
+    import_times: List[float] = []
+    after_times: List[float] = []
+    lazy: List[str] = []
+    for _ in range(repeat):
+        r = run_child(code, after)
+        import_times.append(r["import_s"])
+        after_times.append(r["after_s"])
+        lazy = r["lazy"]
+
+    result: Dict[str, Any] = {
+        "repeat": repeat,
+        "import_p50_ms": round(bench_common.percentile(import_times, 50) * 1000, 3),
+        "import_min_ms": round(min(import_times) * 1000, 3),
+        "loaded_lazy_modules": lazy,
+    }
+    if after != "pass":
+        result["call_p50_ms"] = round(bench_common.percentile(after_times, 50) * 1000, 3)
+        total = [a + b for a, b in zip(import_times, after_times)]
+        result["total_p50_ms"] = round(bench_common.percentile(total, 50) * 1000, 3)
+    return result
+
+
+def heaviest_modules(
+    code: str,
+    top: int,
+) -> List[Dict[str, Any]]:
+    """Return the modules with the largest cumulative import time, from 'python -X importtime'."""
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+    modules: List[Dict[str, Any]] = []
+    for line in err.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[0].startswith("import time:") or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        modules.append(
+            {
+                "module": name,
+                "self_ms": int(parts[0].split(":")[1]) / 1000,
+                "cumulative_ms": int(parts[1]) / 1000,
+            }
+        )
+    modules.sort(key=lambda x: float(x["cumulative_ms"]), reverse=True)
+    return modules[:top]
+
+
+def main() -> None:
+    parser = bench_common.make_arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=None, help="fresh interpreters per case, default 20")
+    args = parser.parse_args()
+
+    repeat = args.repeat or (5 if args.quick else 20)
+
+    results: Dict[str, Any] = {}
+    for name, code in CASES.items():
+        results[name] = bench_case(code, repeat)
+
+    process, client_args = bench_common.start_mock_process()
+    try:
+        results["status_one_shot"] = bench_case(
+            CASES["operations"],
+            repeat,
+            after=STATUS.format(client_args=client_args),
+        )
+    finally:
+        bench_common.stop_mock_process(process)
+
+    results["heaviest_modules"] = heaviest_modules(CASES["operations"], top=10 if args.quick else 25)
+
+    bench_common.write_results(benchmark="import", results=results, output=args.output)
+
+    loaded = results["package"]["loaded_lazy_modules"]
+    if len(loaded) > 0:
+        print(f"LAZY IMPORT BROKEN: 'import spectra_assure_api_client' loads {loaded}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#! /usr/bin/env python3
+"""
+Memory regression benchmarks for large crawls and download planning.
+
+The download planning code paths (_get_extended_info_versions, _remove_skipped_versions_from_result, _flatten_list)
+run against synthetic packages of up to 100k versions served from memory,
+while tracemalloc records the peak allocation of each path.
+The script exits with 1 if a peak exceeds its budget in memory_budgets.json,
+so memory wins stay won; use --update-budgets after an intended change.
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+import bench_common
+
+from spectra_assure_api_client import (
+    SpectraAssureApiOperations,
+    SpectraAssureDownloadCriteria,
+)
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_budgets.json")
+BUDGET_HEADROOM = 1.25  # new budgets are the measured peak plus 25%
+
+PROJECT = "project-000"
+PACKAGE = "package-000"
+
+
+class SyntheticResponse:
+    # like requests.Response: the json is parsed on every call, so the parse is part of the measurement
+
+    def __init__(
+        self,
+        text: str,
+        status_code: int = 200,
+    ) -> None:
+        self.text = text
+        self.status_code = status_code
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class SyntheticOperations(SpectraAssureApiOperations):  # pylint: disable=too-many-ancestors
+    # serves list() and status() from memory, so only the SDK allocations are measured
+
+    def __init__(
+        self,
+        n_versions: int,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            server="local",
+            host="127.0.0.1:1",
+            organization="org",
+            group="group",
+            token="token",
+            **kwargs,
+        )
+        self.versions = [f"1.0.{i}" for i in range(n_versions)]
+        items = [
+            {
+                "version": v,
+                # every other version is approved, the rest is skipped
+                "approval_status": "approved" if i % 2 == 0 else "pending",
+                "approval_information": {"timestamp": f"2024-01-01T00:00:00.{i:06d}Z"},
+                "is_released": False,
+            }
+            for i, v in enumerate(self.versions)
+        ]
+        self.list_text = json.dumps({"versions": items})
+
+    def list(
+        self,
+        **kwargs: Any,
+    ) -> SyntheticResponse:
+        return SyntheticResponse(self.list_text)
+
+    def status(
+        self,
+        *,
+        version: str,
+        **kwargs: Any,
+    ) -> SyntheticResponse:
+        info = {
+            "file": {
+                "name": f"{PACKAGE}-{version}.bin",
+                "hashes": [["sha1", "0" * 40], ["sha256", "0" * 64]],
+            },
+            "statistics": {"quality": {"status": "pass"}},
+        }
+        return SyntheticResponse(json.dumps({"analysis": {"status": "done", "report": {"info": info}}}))
+
+
+def measure(func: Callable[[], Any]) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "peak_mb": round(peak / 2**20, 3),
+        "retained_mb": round(current / 2**20, 3),
+        "elapsed_traced_s": round(elapsed, 3),  # tracemalloc slows the code down
+    }
+
+
+def bench_paths(n_versions: int) -> Dict[str, Dict[str, Any]]:
+    client = SyntheticOperations(n_versions)
+    criteria = SpectraAssureDownloadCriteria(
+        current_strategy="AllApproved",
+        wait_for_scan_done=False,
+    )
+
+    # the inputs of the single path benchmarks are built before the measurement starts
+    list_data = json.loads(client.list_text)
+    info_dict = {
+        v: {
+            "analysis": "done",
+            "hashes": [["sha1", "0" * 40], ["sha256", "0" * 64]],
+            "file-name": f"{PACKAGE}-{v}.bin",
+            "approved": "approved",
+        }
+        for v in client.versions
+    }
+    skip = client.versions[1::2]
+
+    paths: Dict[str, Callable[[], Any]] = {
+        "flatten_list": lambda: client._flatten_list(  # pylint: disable=protected-access
+            list_data, multiple="versions", single="version"
+        ),
+        "remove_skipped_versions_from_result": lambda: client._remove_skipped_versions_from_result(  # pylint: disable=protected-access
+            info_dict=info_dict, skip=set(skip)
+        ),
+        "get_extended_info_versions": lambda: client._get_extended_info_versions(  # pylint: disable=protected-access
+            project=PROJECT, package=PACKAGE, criteria=criteria
+        ),
+    }
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, func in paths.items():
+        results[f"{name}_{n_versions}"] = measure(func)
+    return results
+
+
+def check_budgets(
+    results: Dict[str, Dict[str, Any]],
+    budgets: Dict[str, float],
+) -> List[str]:
+    failures: List[str] = []
+    for name, result in sorted(results.items()):
+        budget = budgets.get(name)
+        result["budget_mb"] = budget
+        if budget is not None and result["peak_mb"] > budget:
+            failures.append(f"{name}: peak {result['peak_mb']} MB exceeds the budget of {budget} MB")
+    return failures
+
+
+def main() -> None:
+    parser = bench_common.make_arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=None, help="comma separated version counts, default 1000,100000")
+    parser.add_argument("--update-budgets", action="store_true", help="write the measured peaks as new budgets")
+    args = parser.parse_args()
+
+    bench_common.quiet_logging()
+
+    sizes = [1000, 10000] if args.quick else [1000, 100000]
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for n_versions in sizes:
+        results.update(bench_paths(n_versions))
+
+    budgets: Dict[str, float] = {}
+    if os.path.exists(BUDGETS_FILE):
+        with open(BUDGETS_FILE, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+
+    if args.update_budgets:
+        for name, result in results.items():
+            budgets[name] = round(result["peak_mb"] * BUDGET_HEADROOM, 3)
+        with open(BUDGETS_FILE, "w", encoding="utf-8") as f:
+            json.dump(budgets, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    failures = check_budgets(results, budgets)
+    bench_common.write_results(benchmark="memory", results=results, output=args.output)
+
+    for failure in failures:
+        print(f"MEMORY BUDGET EXCEEDED: {failure}", file=sys.stderr)
+    if len(failures) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
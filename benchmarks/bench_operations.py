@@ -0,0 +1,228 @@
+#! /usr/bin/env python3
+"""
+Benchmark the API operations and the per-call overhead of the SDK against the local mock Portal.
+
+ - requests per second and p50/p99 latency per operation
+ - the time to crawl synthetic groups of 10, 1k and 100k versions (list walk plus status of every version)
+ - the time spent in throttle handling
+ - the CPU cost of URL building, header creation and response logging
+
+Note: the mock Portal runs in the same process, so the numbers include its cost;
+compare results of the same machine and the same Python version only.
+"""
+
+import concurrent.futures
+import logging
+import math
+import os
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+import requests
+
+import bench_common
+
+from spectra_assure_api_client import SpectraAssureApiOperations
+from spectra_assure_api_client.mock import SpectraAssureMockPortal
+
+logger = logging.getLogger(__name__)
+
+PROJECT = "project-000"
+PACKAGE = "package-000"
+VERSION = "1.0.0"
+
+
+def bench_operations(iterations: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with SpectraAssureMockPortal(n_projects=1, n_packages=1, n_versions=10) as portal:
+        client = SpectraAssureApiOperations(**portal.client_args())
+        version: Dict[str, Any] = {"project": PROJECT, "package": PACKAGE, "version": VERSION}
+
+        operations: Dict[str, Any] = {
+            "list_group": lambda: client.list(),
+            "list_project": lambda: client.list(project=PROJECT),
+            "list_package": lambda: client.list(project=PROJECT, package=PACKAGE),
+            "list_version": lambda: client.list(**version),
+            "status": lambda: client.status(**version),
+            "status_download": lambda: client.status(download=True, **version),
+            "checks": lambda: client.checks(**version),
+            "report_rl_json": lambda: client.report(report_type="rl-json", **version),
+            "edit_version": lambda: client.edit(is_released=True, **version),
+        }
+        for name, func in operations.items():
+            func()  # warm up the connection
+            results[name] = bench_common.time_calls(func, iterations)
+
+        # create and delete alternate, so every call succeeds
+        counter = iter(range(10**9))
+
+        def create_delete() -> None:
+            project = f"bench-{next(counter)}"
+            client.create(project=project)
+            client.delete(project=project)
+
+        results["create_delete_pair"] = bench_common.time_calls(create_delete, iterations // 2)
+
+        # the same client shared by threads
+        for workers in [4, 16]:
+            n = iterations * workers
+            latencies: List[float] = []
+
+            def timed_status() -> None:
+                t = time.perf_counter()
+                client.status(**version)
+                latencies.append(time.perf_counter() - t)
+
+            start = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(timed_status) for _ in range(n)]:
+                    future.result()
+            results[f"status_threads_{workers}"] = bench_common.latency_stats(latencies, time.perf_counter() - start)
+
+    return results
+
+
+def crawl(
+    client: SpectraAssureApiOperations,
+    workers: int,
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    targets: List[Dict[str, Any]] = []
+    n_requests = 1
+    for p in client.list().json()["projects"]:
+        n_requests += 1
+        for k in client.list(project=p["name"]).json()["packages"]:
+            n_requests += 1
+            for v in client.list(project=p["name"], package=k["name"]).json()["versions"]:
+                targets.append({"project": p["name"], "package": k["name"], "version": v["version"]})
+    list_elapsed = time.perf_counter() - start
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        codes = list(pool.map(lambda t: client.status(**t).status_code, targets))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "versions": len(targets),
+        "requests": n_requests + len(targets),
+        "errors": sum(1 for code in codes if code != 200),
+        "list_walk_s": round(list_elapsed, 6),
+        "elapsed_s": round(elapsed, 6),
+        "versions_per_s": round(len(targets) / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def bench_crawl(sizes: List[int], workers: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for size in sizes:
+        n_versions = min(size, 1000)
+        n_packages = math.ceil(size / n_versions)
+        with SpectraAssureMockPortal(n_projects=1, n_packages=n_packages, n_versions=n_versions) as portal:
+            client = SpectraAssureApiOperations(**portal.client_args())
+            results[f"versions_{size}"] = crawl(client, workers)
+    return results
+
+
+def bench_throttle(n_calls: int) -> Dict[str, Any]:
+    # the client waits the announced seconds plus one before it retries
+    with SpectraAssureMockPortal(throttle_rate=0.2, throttle_seconds=0, seed=1) as portal:
+        client = SpectraAssureApiOperations(**portal.client_args())
+        start = time.perf_counter()
+        codes = [client.list(auto_adapt_to_throttle=True).status_code for _ in range(n_calls)]
+        elapsed = time.perf_counter() - start
+
+        return {
+            "calls": n_calls,
+            "ok": sum(1 for code in codes if code == 200),
+            "throttled_responses": portal.stats.get("throttled", 0),
+            "throttle_events": client.rate_governor.throttle_events,
+            "throttle_sleep_s": round(client.rate_governor.seconds_slept, 6),
+            "elapsed_s": round(elapsed, 6),
+            "throttle_share": round(client.rate_governor.seconds_slept / elapsed, 4) if elapsed > 0 else None,
+        }
+
+
+def make_response(status_code: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    body = b'{"detail": "Request was throttled. Expected available in 1 seconds."}'
+    response._content = body  # pylint: disable=protected-access
+    return response
+
+
+def bench_overhead(iterations: int) -> Dict[str, Any]:
+    client = SpectraAssureApiOperations(
+        server="local",
+        host="127.0.0.1:1",
+        organization="org",
+        group="group",
+        token="token",
+    )
+    url = client._make_current_url(  # pylint: disable=protected-access
+        action="status", project=PROJECT, package=PACKAGE, version=VERSION
+    )
+
+    results: Dict[str, Any] = {
+        "make_current_url_version": bench_common.cpu_per_call(
+            lambda: client._make_current_url(  # pylint: disable=protected-access
+                action="status", project=PROJECT, package=PACKAGE, version=VERSION
+            ),
+            iterations,
+        ),
+        "make_current_url_report": bench_common.cpu_per_call(
+            lambda: client._make_current_url(  # pylint: disable=protected-access
+                action="report", project=PROJECT, package=PACKAGE, version=VERSION, report_type="rl-json"
+            ),
+            iterations,
+        ),
+        "make_headers": bench_common.cpu_per_call(
+            lambda: client._make_headers(),  # pylint: disable=protected-access
+            iterations,
+        ),
+    }
+
+    # response logging with logging off (the default) and with a handler that formats every record
+    root = logging.getLogger()
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for mode in ["logging_off", "logging_on"]:
+            if mode == "logging_on":
+                root.handlers = [logging.StreamHandler(devnull)]
+                root.setLevel(logging.DEBUG)
+            for status_code in [200, 404, 429]:
+                response = make_response(status_code)
+                results[f"log_response_status_{status_code}_{mode}"] = bench_common.cpu_per_call(
+                    lambda: client._log_response_status(url, response),  # pylint: disable=protected-access
+                    iterations,
+                )
+        bench_common.quiet_logging()
+
+    return results
+
+
+def main() -> None:
+    parser = bench_common.make_arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=None, help="comma separated crawl sizes, default 10,1000,100000")
+    parser.add_argument("--workers", type=int, default=8, help="the crawl concurrency")
+    args = parser.parse_args()
+
+    bench_common.quiet_logging()
+
+    iterations = 50 if args.quick else 500
+    sizes = [10, 1000] if args.quick else [10, 1000, 100000]
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+
+    results = {
+        "operations": bench_operations(iterations),
+        "crawl": bench_crawl(sizes, args.workers),
+        "throttle": bench_throttle(10 if args.quick else 40),
+        "overhead": bench_overhead(iterations * 100),
+    }
+    bench_common.write_results(benchmark="operations", results=results, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#! /usr/bin/env python3
+"""
+Concurrency stress test: many threads share one SpectraAssureApiOperations against the local mock Portal.
+
+The threads mix download() with different selection strategies on one shared SpectraAssureDownloadCriteria,
+status() and list() on the same client, and every result is compared to a sequential run.
+The script reports the throughput and exits with 1 on any wrong result,
+or if the shared criteria were modified.
+A second run downloads all versions of a package concurrently into one directory with a verification manifest,
+directly and with sync(), and fails if the manifest misses any file.
+"""
+
+import concurrent.futures
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+)
+
+import bench_common
+
+from spectra_assure_api_client import (
+    SpectraAssureApiOperations,
+    SpectraAssureDownloadCriteria,
+)
+from spectra_assure_api_client.communication.downloader_manifest import MANIFEST_FILE_NAME
+from spectra_assure_api_client.mock import SpectraAssureMockPortal
+
+STRATEGIES: List[str] = ["AllApproved", "LatestApproved_ByApprovalTimeStamp"]
+
+Task = Tuple[str, Callable[[], Any]]
+
+
+def targets(client: SpectraAssureApiOperations) -> List[Tuple[str, str]]:
+    r: List[Tuple[str, str]] = []
+    for project in client.list().json()["projects"]:
+        for package in client.list(project=project["name"]).json()["packages"]:
+            r.append((project["name"], package["name"]))
+    return r
+
+
+def downloaded(result: Dict[str, Dict[str, Any]] | None) -> Dict[str, str]:
+    # version -> file name, independent of the target directory
+    return {version: os.path.basename(info["target_file_path"]) for version, info in (result or {}).items()}
+
+
+def make_tasks(  # pylint: disable=too-many-arguments
+    *,
+    client: SpectraAssureApiOperations,
+    packages: List[Tuple[str, str]],
+    shared: Dict[str, SpectraAssureDownloadCriteria],
+    work_dir: str,
+    round_: int,
+) -> List[Task]:
+    tasks: List[Task] = []
+    for project, package in packages:
+        for strategy in STRATEGIES:
+            target_dir = os.path.join(work_dir, f"{round_}", strategy, project, package)
+            os.makedirs(target_dir)
+            tasks.append(
+                (
+                    f"download:{strategy}:{project}/{package}",
+                    lambda p=project, q=package, d=target_dir, s=strategy: downloaded(
+                        client.download(target_dir=d, project=p, package=q, download_criteria=shared[s])
+                    ),
+                )
+            )
+
+        tasks.append(
+            (
+                f"list:{project}/{package}",
+                lambda p=project, q=package: client.list(project=p, package=q).json(),
+            )
+        )
+        tasks.append(
+            (
+                f"status:{project}/{package}@1.0.0",
+                lambda p=project, q=package: client.status(project=p, package=q, version="1.0.0").json(),
+            )
+        )
+    return tasks
+
+
+def run_stress(  # pylint: disable=too-many-locals
+    *,
+    threads: int,
+    rounds: int,
+) -> Dict[str, Any]:
+    work_dir = tempfile.mkdtemp(prefix="bench-threads-")
+    # one criteria object per strategy, shared by all threads; must_be_approved=False must not be overwritten
+    shared = {s: SpectraAssureDownloadCriteria(current_strategy=s, must_be_approved=False) for s in STRATEGIES}
+
+    try:
+        with SpectraAssureMockPortal(n_projects=2, n_packages=4, n_versions=6, approved_ratio=0.5, seed=7) as portal:
+            client = SpectraAssureApiOperations(**portal.client_args())
+            packages = targets(client)
+
+            # the expected results: the same tasks, one at a time
+            expected = {
+                name: func()
+                for name, func in make_tasks(
+                    client=client, packages=packages, shared=shared, work_dir=work_dir, round_=-1
+                )
+            }
+
+            tasks: List[Task] = []
+            for round_ in range(rounds):
+                tasks.extend(
+                    make_tasks(client=client, packages=packages, shared=shared, work_dir=work_dir, round_=round_)
+                )
+
+            failures: List[str] = []
+            start = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+                futures = {pool.submit(func): name for name, func in tasks}
+                for future in concurrent.futures.as_completed(futures):
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:  # pylint:disable=broad-exception-caught
+                        failures.append(f"{name}: {type(e).__name__}: {e}")
+                        continue
+                    if result != expected[name]:
+                        failures.append(f"{name}: {result} != {expected[name]}")
+            elapsed = time.perf_counter() - start
+
+            for strategy, criteria in shared.items():
+                if criteria.must_be_approved is not False or criteria.current_strategy != strategy:
+                    failures.append(f"the shared criteria of {strategy} were modified")
+
+            return {
+                "threads": threads,
+                "rounds": rounds,
+                "operations": len(tasks),
+                "elapsed_s": round(elapsed, 3),
+                "operations_per_s": round(len(tasks) / elapsed, 2) if elapsed > 0 else None,
+                "failures": failures,
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def manifest_failures(package_dir: str) -> List[str]:
+    # every downloaded file must be in the manifest of its directory
+    files = {f for f in os.listdir(package_dir) if not f.startswith(".")}
+    try:
+        with open(os.path.join(package_dir, MANIFEST_FILE_NAME), "r", encoding="utf-8") as f:
+            recorded = set(json.load(f)["files"])
+    except FileNotFoundError:
+        recorded = set()
+    missing = sorted(files - recorded)
+    return [f"{package_dir}: not in the manifest: {missing}"] if len(missing) > 0 else []
+
+
+def run_manifest_stress(
+    *,
+    threads: int,
+) -> Dict[str, Any]:
+    work_dir = tempfile.mkdtemp(prefix="bench-threads-manifest-")
+    criteria = SpectraAssureDownloadCriteria(current_strategy="AllApproved", with_verification_manifest=True)
+
+    try:
+        with SpectraAssureMockPortal(n_projects=2, n_packages=4, n_versions=8, approved_ratio=0.7, seed=11) as portal:
+            client = SpectraAssureApiOperations(**portal.client_args())
+            failures: List[str] = []
+
+            # download(): every version of a package on its own thread, all into the same directory
+            tasks: List[Tuple[str, str, str]] = []
+            for project, package in targets(client):
+                os.makedirs(os.path.join(work_dir, "download", project, package))
+                for item in client.list(project=project, package=package).json()["versions"]:
+                    tasks.append((project, package, item["version"]))
+
+            start = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+                futures = [
+                    pool.submit(
+                        client.download,
+                        target_dir=os.path.join(work_dir, "download", project, package),
+                        project=project,
+                        package=package,
+                        version=version,
+                        download_criteria=criteria,
+                    )
+                    for project, package, version in tasks
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:  # pylint:disable=broad-exception-caught
+                        failures.append(f"download: {type(e).__name__}: {e}")
+            elapsed = time.perf_counter() - start
+
+            # sync(): the versions of a package are downloaded concurrently as well
+            sync_dir = os.path.join(work_dir, "sync")
+            os.makedirs(sync_dir)
+            report = client.sync(target_dir=sync_dir, max_workers=threads, download_criteria=criteria)
+            failures.extend(f"sync: {e['target']}: {e['error']}" for e in report["errors"])
+
+            for root in [os.path.join(work_dir, "download"), sync_dir]:
+                for project, package in targets(client):
+                    package_dir = os.path.join(root, project, package)
+                    if os.path.isdir(package_dir):
+                        failures.extend(manifest_failures(package_dir))
+
+            return {
+                "threads": threads,
+                "downloads": len(tasks),
+                "elapsed_s": round(elapsed, 3),
+                "synced": len(report["downloaded"]),
+                "failures": failures,
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = bench_common.make_arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32, help="the threads sharing one client")
+    parser.add_argument("--rounds", type=int, default=None, help="the repeats of all tasks, default 20")
+    args = parser.parse_args()
+
+    bench_common.quiet_logging()
+
+    rounds = args.rounds or (4 if args.quick else 20)
+    results = {
+        "shared_client": run_stress(threads=args.threads, rounds=rounds),
+        "shared_manifest": run_manifest_stress(threads=args.threads),
+    }
+    bench_common.write_results(benchmark="threads", results=results, output=args.output)
+
+    failures = results["shared_client"]["failures"] + results["shared_manifest"]["failures"]
+    for failure in failures:
+        print(f"CONCURRENCY FAILURE: {failure}", file=sys.stderr)
+    if len(failures) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#! /usr/bin/env python3
+"""
+Benchmark scan() uploads and UrlDownloader.download_file_from_url() against the local mock Portal.
+
+For synthetic payloads of 1 MB up to 10 GB it measures MB/s, CPU seconds per GB and the peak RSS,
+for downloads across chunk sizes, verification modes and concurrency levels,
+for uploads across concurrency levels.
+
+The mock Portal runs in its own process and every case runs in a fresh worker process,
+so the CPU time and the peak RSS are those of the SDK only.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+import bench_common
+
+from spectra_assure_api_client import (
+    SpectraAssureApiOperations,
+    UrlDownloader,
+)
+
+UNITS = {"K": 2**10, "M": 2**20, "G": 2**30}
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().upper()
+    if value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+    return int(value)
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss / 2**20  # bytes
+    return rss / 2**10  # KBytes
+
+
+def make_payload(
+    file_path: str,
+    size: int,
+) -> None:
+    block = os.urandom(2**20)
+    with open(file_path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            f.write(block[: min(remaining, len(block))])
+            remaining -= len(block)
+
+
+# WORKER: runs one case in a fresh process
+
+
+def worker_download(case: Dict[str, Any]) -> None:
+    downloaders: List[UrlDownloader] = []
+    for i in range(case["concurrency"]):
+        target_dir = os.path.join(case["work_dir"], f"download-{i}")
+        os.makedirs(target_dir, exist_ok=True)
+        downloaders.append(
+            UrlDownloader(
+                target_dir=target_dir,
+                chunk_size=case["chunk_size"],
+                hash_key=case["verify"] if case["verify"] != "none" else "sha256",
+                with_verify_after_download=case["verify"] != "none",
+                with_overwrite_existing_files=True,
+            )
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=case["concurrency"]) as pool:
+        futures = [
+            pool.submit(ud.download_file_from_url, download_url=case["url"], hashes=case["hashes"])
+            for ud in downloaders
+        ]
+        for future in futures:
+            future.result()
+
+
+def worker_upload(case: Dict[str, Any]) -> None:
+    client = SpectraAssureApiOperations(timeout=3600, **case["client_args"])
+
+    def upload(i: int) -> None:
+        response = client.scan(
+            project="bench",
+            package="upload",
+            version=f"{case['name']}-{i}",
+            file_path=case["file_path"],
+            replace=True,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"upload failed: {response.status_code} {response.text}")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=case["concurrency"]) as pool:
+        for future in [pool.submit(upload, i) for i in range(case["concurrency"])]:
+            future.result()
+
+
+def run_worker(case: Dict[str, Any]) -> Dict[str, Any]:
+    bench_common.quiet_logging()
+    baseline = peak_rss_mb()
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    if case["kind"] == "download":
+        worker_download(case)
+    else:
+        worker_upload(case)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+
+    n_bytes = case["size"] * case["concurrency"]
+    return {
+        "bytes": n_bytes,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "mb_per_s": round(n_bytes / 2**20 / wall, 2) if wall > 0 else None,
+        "cpu_s_per_gb": round(cpu / (n_bytes / 2**30), 3),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+# DRIVER
+
+
+def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    work_dir = tempfile.mkdtemp(prefix="bench-transfer-", dir=case["work_root"])
+    case = dict(case, work_dir=work_dir)
+    try:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", json.dumps(case)],
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1:]}
+    data: Dict[str, Any] = json.loads(result.stdout)
+    return data
+
+
+def download_cases() -> List[Dict[str, Any]]:
+    # vary one dimension at a time from the default: 16K chunks, sha256 verification, one transfer
+    cases: List[Dict[str, Any]] = []
+    for chunk_size in [4 * 2**10, 16 * 2**10, 64 * 2**10]:
+        cases.append({"chunk_size": chunk_size, "verify": "sha256", "concurrency": 1})
+    for verify in ["none", "sha1"]:
+        cases.append({"chunk_size": 16 * 2**10, "verify": verify, "concurrency": 1})
+    for concurrency in [4]:
+        cases.append({"chunk_size": 16 * 2**10, "verify": "sha256", "concurrency": concurrency})
+
+    for case in cases:
+        case["name"] = f"chunk_{case['chunk_size'] // 2**10}k_verify_{case['verify']}_x{case['concurrency']}"
+    return cases
+
+
+def bench_size(
+    size: int,
+    work_root: str,
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"download": {}, "upload": {}}
+    process, client_args = bench_common.start_mock_process(
+        projects=1,
+        packages=1,
+        versions=1,
+        artifact_size=size,
+        discard_uploads=True,
+    )
+    try:
+        client = SpectraAssureApiOperations(timeout=3600, **client_args)
+        target: Dict[str, Any] = {"project": "project-000", "package": "package-000", "version": "1.0.0"}
+
+        for case in download_cases():
+            # a fresh signed URL per case, the mock hashes the artifact on the first request
+            data = client.status(download=True, **target).json()
+            info = data["analysis"]["report"]["info"]
+            case.update(
+                kind="download",
+                size=size,
+                url=info["portal"]["download"],
+                hashes=client._extract_hashes(info["file"]["hashes"]),  # pylint: disable=protected-access
+                work_root=work_root,
+            )
+            results["download"][case["name"]] = run_case(case)
+
+        payload_path = os.path.join(work_root, f"payload-{size}.bin")
+        make_payload(payload_path, size)
+        try:
+            for concurrency in [1, 4]:
+                case = {
+                    "kind": "upload",
+                    "name": f"x{concurrency}",
+                    "size": size,
+                    "concurrency": concurrency,
+                    "file_path": payload_path,
+                    "client_args": client_args,
+                    "work_root": work_root,
+                }
+                results["upload"][case["name"]] = run_case(case)
+        finally:
+            os.remove(payload_path)
+    finally:
+        bench_common.stop_mock_process(process)
+
+    return results
+
+
+def main() -> None:
+    parser = bench_common.make_arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=None, help="comma separated payload sizes, default 1M,100M,1G; e.g. 10G")
+    parser.add_argument("--work-dir", default=None, help="where payloads and downloads are written, default: tmp")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)  # internal: run one case, see run_case()
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return
+
+    bench_common.quiet_logging()
+
+    sizes = "1M,16M" if args.quick else "1M,100M,1G"
+    if args.sizes:
+        sizes = args.sizes
+
+    work_root = tempfile.mkdtemp(prefix="bench-transfer-", dir=args.work_dir)
+    try:
+        results = {f"size_{s.strip()}": bench_size(parse_size(s), work_root) for s in sizes.split(",")}
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    bench_common.write_results(benchmark="transfer", results=results, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
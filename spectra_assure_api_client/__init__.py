@@ -1,24 +1,93 @@
-from spectra_assure_api_client.communication.download_criteria import SpectraAssureDownloadCriteria
-from spectra_assure_api_client.communication.exceptions import (
-    SpectraAssureExceptions,
-    SpectraAssureInvalidAction,
-    SpectraAssureInvalidPath,
-    SpectraAssureUnexpectedNoDataFound,
-    SpectraAssureNoDownloadUrlInResult,
-    SpectraAssureUnsupportedStrategy,
+# The public names are loaded on first access (PEP 562),
+# so 'import spectra_assure_api_client' stays cheap and e.g. the exceptions do not import requests.
+import importlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
 )
-from spectra_assure_api_client.communication.downloader import UrlDownloader
-from spectra_assure_api_client.communication.downloader_exceptions import (
-    UrlDownloaderExceptions,
-    UrlDownloaderUnknownHashKey,
-    UrlDownloaderTargetDirectoryIssue,
-    UrlDownloaderTargetFileIssue,
-    UrlDownloaderTempFileIssue,
-    UrlDownloaderFileVerifyIssue,
-)
-from .spectra_assure_api_operations import SpectraAssureApiOperations
+
 from .version import VERSION
 
+if TYPE_CHECKING:
+    from spectra_assure_api_client.communication.bandwidth import SpectraAssureBandwidthLimiter
+    from spectra_assure_api_client.communication.cassette import (
+        SpectraAssureCassetteRecorder,
+        SpectraAssureCassettePlayer,
+    )
+    from spectra_assure_api_client.communication.download_criteria import SpectraAssureDownloadCriteria
+    from spectra_assure_api_client.communication.metrics import SpectraAssureMetrics
+    from spectra_assure_api_client.communication.request_timing import SpectraAssureTimingAdapter
+    from spectra_assure_api_client.communication.exceptions import (
+        SpectraAssureExceptions,
+        SpectraAssureInvalidAction,
+        SpectraAssureInvalidPath,
+        SpectraAssureUnexpectedNoDataFound,
+        SpectraAssureNoDownloadUrlInResult,
+        SpectraAssureUnsupportedStrategy,
+        SpectraAssureScanJobFailed,
+        SpectraAssureCassetteMiss,
+    )
+    from spectra_assure_api_client.communication.downloader import UrlDownloader
+    from spectra_assure_api_client.communication.downloader_exceptions import (
+        UrlDownloaderExceptions,
+        UrlDownloaderUnknownHashKey,
+        UrlDownloaderTargetDirectoryIssue,
+        UrlDownloaderTargetFileIssue,
+        UrlDownloaderTempFileIssue,
+        UrlDownloaderFileVerifyIssue,
+    )
+    from .spectra_assure_api_operations import SpectraAssureApiOperations
+    from .spectra_assure_api_client_pool import SpectraAssureApiClientPool
+    from .spectra_assure_api_process_pool import SpectraAssureApiProcessPool
+
+# public name -> the module that defines it
+_LAZY_IMPORTS: Dict[str, str] = {
+    "SpectraAssureExceptions": "spectra_assure_api_client.communication.exceptions",
+    "SpectraAssureInvalidAction": "spectra_assure_api_client.communication.exceptions",
+    "SpectraAssureInvalidPath": "spectra_assure_api_client.communication.exceptions",
+    "SpectraAssureUnexpectedNoDataFound": "spectra_assure_api_client.communication.exceptions",
+    "SpectraAssureNoDownloadUrlInResult": "spectra_assure_api_client.communication.exceptions",
+    "SpectraAssureUnsupportedStrategy": "spectra_assure_api_client.communication.exceptions",
+    "SpectraAssureScanJobFailed": "spectra_assure_api_client.communication.exceptions",
+    "SpectraAssureCassetteMiss": "spectra_assure_api_client.communication.exceptions",
+    #
+    "SpectraAssureApiOperations": "spectra_assure_api_client.spectra_assure_api_operations",
+    "SpectraAssureApiClientPool": "spectra_assure_api_client.spectra_assure_api_client_pool",
+    "SpectraAssureApiProcessPool": "spectra_assure_api_client.spectra_assure_api_process_pool",
+    "SpectraAssureDownloadCriteria": "spectra_assure_api_client.communication.download_criteria",
+    "SpectraAssureBandwidthLimiter": "spectra_assure_api_client.communication.bandwidth",
+    "SpectraAssureCassetteRecorder": "spectra_assure_api_client.communication.cassette",
+    "SpectraAssureCassettePlayer": "spectra_assure_api_client.communication.cassette",
+    "SpectraAssureMetrics": "spectra_assure_api_client.communication.metrics",
+    "SpectraAssureTimingAdapter": "spectra_assure_api_client.communication.request_timing",
+    #
+    "UrlDownloaderExceptions": "spectra_assure_api_client.communication.downloader_exceptions",
+    "UrlDownloaderUnknownHashKey": "spectra_assure_api_client.communication.downloader_exceptions",
+    "UrlDownloaderTargetDirectoryIssue": "spectra_assure_api_client.communication.downloader_exceptions",
+    "UrlDownloaderTargetFileIssue": "spectra_assure_api_client.communication.downloader_exceptions",
+    "UrlDownloaderTempFileIssue": "spectra_assure_api_client.communication.downloader_exceptions",
+    "UrlDownloaderFileVerifyIssue": "spectra_assure_api_client.communication.downloader_exceptions",
+    #
+    "UrlDownloader": "spectra_assure_api_client.communication.downloader",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # the next access does not come here
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
     "VERSION",
     #
@@ -28,9 +97,18 @@ __all__ = [
     "SpectraAssureUnexpectedNoDataFound",
     "SpectraAssureNoDownloadUrlInResult",
     "SpectraAssureUnsupportedStrategy",
+    "SpectraAssureScanJobFailed",
+    "SpectraAssureCassetteMiss",
     #
     "SpectraAssureApiOperations",
+    "SpectraAssureApiClientPool",
+    "SpectraAssureApiProcessPool",
     "SpectraAssureDownloadCriteria",
+    "SpectraAssureBandwidthLimiter",
+    "SpectraAssureCassetteRecorder",
+    "SpectraAssureCassettePlayer",
+    "SpectraAssureMetrics",
+    "SpectraAssureTimingAdapter",
     #
     "UrlDownloaderExceptions",
     "UrlDownloaderUnknownHashKey",
@@ -0,0 +1,7 @@
+from .batch import SpectraAssureBatch
+from .main import main
+
+__all__ = [
+    "SpectraAssureBatch",
+    "main",
+]
@@ -0,0 +1,127 @@
+import concurrent.futures
+import json
+import logging
+import threading
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Set,
+    TextIO,
+)
+
+from spectra_assure_api_client.spectra_assure_api_operations import SpectraAssureApiOperations
+
+from .operations import run_operation
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureBatch:
+
+    def __init__(
+        self,
+        *,
+        client: SpectraAssureApiOperations,
+        output: TextIO,
+        parallel: int = 4,
+    ) -> None:
+        """
+        Action:
+            Run operations from NDJSON lines on one client, 'parallel' at a time,
+            and write one NDJSON result line per operation as soon as it finishes.
+
+        Args:
+         - client: SpectraAssureApiOperations, mandatory;
+            All operations share its connection pool, caches, throttle governor and bandwidth limit.
+
+         - output: TextIO, mandatory;
+            Where the result lines are written, e.g. sys.stdout.
+
+         - parallel: int, default 4, optional;
+            The number of operations running at the same time.
+
+        Notes:
+            An input line is a JSON object:
+            {"id": <any, optional>, "operation": "status", "args": {"project": "p", "package": "q", "version": "1"}}
+            Empty lines and lines starting with '#' are skipped.
+
+            A result line is a JSON object:
+            {"id", "line", "operation", "ok", "elapsed", "status_code" (for a response), "result" | "error"};
+            the results are in the order the operations finish, use 'id' or 'line' to match them.
+
+            At most 2 * parallel lines are read ahead, so the input can be a stream of any length.
+        """
+        assert parallel >= 1, "parallel must be at least 1"
+
+        self.client = client
+        self.output = output
+        self.parallel = parallel
+
+        self._output_lock = threading.Lock()
+        self.count = 0
+        self.failed = 0
+
+    def _write(
+        self,
+        result: Dict[str, Any],
+    ) -> None:
+        line = json.dumps(result, default=str)
+        with self._output_lock:
+            self.count += 1
+            if result.get("ok") is not True:
+                self.failed += 1
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def _run_line(
+        self,
+        line_number: int,
+        line: str,
+    ) -> Dict[str, Any]:
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError("a batch line must be a JSON object")
+        except ValueError as e:
+            return {"id": None, "line": line_number, "operation": None, "ok": False, "error": f"invalid line: {e}"}
+
+        args = item.get("args") or {}
+        result = run_operation(self.client, str(item.get("operation")), args)
+        return {"id": item.get("id"), "line": line_number, **result}
+
+    # PUBLIC
+
+    def run(
+        self,
+        lines: Iterable[str],
+    ) -> bool:
+        """
+        Action:
+            Run all lines.
+
+        Return:
+            True if all operations were ok.
+        """
+        in_flight: Set[concurrent.futures.Future[Dict[str, Any]]] = set()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.parallel) as pool:
+            for line_number, line in enumerate(lines, start=1):
+                line = line.strip()
+                if line == "" or line.startswith("#"):
+                    continue
+
+                if len(in_flight) >= 2 * self.parallel:
+                    done, in_flight = concurrent.futures.wait(
+                        in_flight,
+                        return_when=concurrent.futures.FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        self._write(future.result())
+
+                in_flight.add(pool.submit(self._run_line, line_number, line))
+
+            for future in concurrent.futures.as_completed(in_flight):
+                self._write(future.result())
+
+        logger.info("batch: %d operations, %d failed", self.count, self.failed)
+        return self.failed == 0
@@ -0,0 +1,90 @@
+import logging
+import os
+from typing import (
+    Any,
+    Dict,
+)
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "RLPORTAL_"
+PROXY_PREFIX = "RLSECURE_PROXY_"
+
+# client argument -> (environment variable, type)
+ENVIRONMENT_VARS: Dict[str, Dict[str, str]] = {
+    "server": {"env": f"{PREFIX}SERVER", "v_type": "str"},
+    "organization": {"env": f"{PREFIX}ORG", "v_type": "str"},
+    "group": {"env": f"{PREFIX}GROUP", "v_type": "str"},
+    "token": {"env": f"{PREFIX}ACCESS_TOKEN", "v_type": "str"},
+    #
+    "proxy_server": {"env": f"{PROXY_PREFIX}SERVER", "v_type": "str"},
+    "proxy_port": {"env": f"{PROXY_PREFIX}PORT", "v_type": "int"},
+    "proxy_user": {"env": f"{PROXY_PREFIX}USER", "v_type": "str"},
+    "proxy_password": {"env": f"{PROXY_PREFIX}PASSWORD", "v_type": "str"},
+}
+
+# the cli options of the client, all default to None so a config file or the environment can provide them
+CLIENT_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "server": {"type": str, "help": f"the Portal server name, or {PREFIX}SERVER"},
+    "organization": {"type": str, "help": f"the Portal organization, or {PREFIX}ORG"},
+    "group": {"type": str, "help": f"the Portal group, or {PREFIX}GROUP"},
+    "token": {"type": str, "help": f"the Portal access token, or {PREFIX}ACCESS_TOKEN"},
+    "proxy_server": {"type": str, "help": f"an optional proxy server, or {PROXY_PREFIX}SERVER"},
+    "proxy_port": {"type": int, "help": f"the proxy port, or {PROXY_PREFIX}PORT"},
+    "proxy_user": {"type": str, "help": f"the proxy user, or {PROXY_PREFIX}USER"},
+    "proxy_password": {"type": str, "help": f"the proxy password, or {PROXY_PREFIX}PASSWORD"},
+    "timeout": {"type": int, "help": "the request timeout in seconds"},
+    "max_bytes_per_second": {"type": float, "help": "limit the transfer rate of all uploads and downloads"},
+    "profile": {"type": str, "help": "profile every operation: cprofile, tracemalloc or all"},
+    "profile_dir": {"type": str, "help": "where the profile is written"},
+    "config_file": {"type": str, "help": "a JSON config file with the client arguments"},
+    "host": {"type": str, "help": "the Portal host, do not change; e.g. for a local mock Portal"},
+}
+
+
+def coerce_type(
+    value: str,
+    v_type: str,
+) -> Any:
+    if v_type == "int":
+        return int(value)
+    if v_type == "float":
+        return float(value)
+    if v_type == "bool":
+        return value.lower() in ["1", "true", "yes", "on"]
+    return value
+
+
+def environment_args() -> Dict[str, Any]:
+    """Return the client arguments set in the environment."""
+    r: Dict[str, Any] = {}
+    for name, info in ENVIRONMENT_VARS.items():
+        value = os.getenv(info["env"])
+        if value is None or value == "":
+            continue
+        try:
+            r[name] = coerce_type(value, info["v_type"])
+        except ValueError as e:
+            logger.warning("ignore %s: %s", info["env"], e)
+    return r
+
+
+def client_args(
+    cli_args: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Action:
+        Merge the client arguments: the cli wins over the environment,
+        and both win over the config file (that is read by the client itself).
+
+    Return:
+        The keyword arguments for SpectraAssureApiOperations.
+    """
+    r = environment_args()
+    for name in CLIENT_OPTIONS:
+        value = cli_args.get(name)
+        if value is not None:
+            r[name] = value
+    if cli_args.get("auto_adapt_to_throttle") is True:
+        r["auto_adapt_to_throttle"] = True
+    return r
@@ -0,0 +1,197 @@
+import argparse
+import inspect
+import json
+import logging
+import os
+import sys
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from spectra_assure_api_client.spectra_assure_api_operations import SpectraAssureApiOperations
+
+from .batch import SpectraAssureBatch
+from .config import (
+    CLIENT_OPTIONS,
+    client_args,
+)
+from .operations import (
+    OPERATIONS,
+    operation_args,
+    parse_cli_value,
+    parse_qp,
+    run_operation,
+)
+
+logger = logging.getLogger(__name__)
+
+PROG_NAME = "spectra-assure"
+
+EPILOG = """
+The client arguments come from the command line, then the environment
+(RLPORTAL_SERVER, RLPORTAL_ORG, RLPORTAL_GROUP, RLPORTAL_ACCESS_TOKEN, RLSECURE_PROXY_*),
+then the optional --config-file.
+Use 'batch' to run many operations from NDJSON lines on one client.
+"""
+
+OPERATION_HELP: Dict[str, str] = {
+    "list": "list the projects, packages or versions",
+    "status": "get the status of a version",
+    "checks": "get the policy checks of a version",
+    "report": "get a report of a version, e.g. --report-type cyclonedx",
+    "scan": "upload a file and scan it as a new version",
+    "submit_scan": "scan and wait until the analysis is done",
+    "wait_until_done": "wait until the analysis of versions (--versions project/package@version,...) is done",
+    "create": "create a project or package",
+    "edit": "edit a project, package or version",
+    "delete": "delete a project, package or version",
+    "download": "download the approved file(s) of a package or version",
+    "sync": "mirror the approved versions of the group (or --projects) to a directory",
+    "verify_mirror": "verify a download directory against the Portal hashes",
+    "bulk": "run create, scan, edit, delete, ... operations (--operations JSON list) in dependency order",
+}
+
+
+def _option(name: str) -> str:
+    return "--" + name.replace("_", "-")
+
+
+def _type_name(annotation: Any) -> str:
+    if isinstance(annotation, type):
+        return annotation.__name__
+    return str(annotation).replace("typing.", "").split(".")[-1]
+
+
+def _add_operation_parser(
+    subparsers: Any,
+    operation: str,
+) -> None:
+    summary = OPERATION_HELP.get(operation, "")
+    aliases = [operation.replace("_", "-")] if "_" in operation else []
+    parser = subparsers.add_parser(operation, aliases=aliases, help=summary, description=summary)
+    parser.set_defaults(operation=operation)
+
+    for name, p in operation_args(operation).items():
+        required = p.default is inspect.Parameter.empty
+        default = "" if required else f", default {p.default}"
+        parser.add_argument(
+            _option(name),
+            dest=f"op_{name}",
+            required=required,
+            metavar=name.upper(),
+            help=f"{_type_name(p.annotation)}{default}".replace("%", "%%"),
+        )
+
+    parser.add_argument(
+        "--qp",
+        action="append",
+        default=None,
+        metavar="KEY=VALUE",
+        help="an additional query parameter, repeatable; values are JSON if possible",
+    )
+
+
+def make_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=PROG_NAME,
+        description="Use the Spectra Assure Portal API from the command line.",
+        epilog=EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    for name, option in CLIENT_OPTIONS.items():
+        parser.add_argument(_option(name), dest=name, default=None, type=option["type"], help=option["help"])
+    parser.add_argument(
+        "--auto-adapt-to-throttle",
+        dest="auto_adapt_to_throttle",
+        action="store_true",
+        help="wait and retry when the Portal throttles requests",
+    )
+    parser.add_argument(
+        "--log-level",
+        default=os.getenv("LOG_LEVEL", "WARNING"),
+        help="the level of the log on stderr, default LOG_LEVEL or WARNING",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="OPERATION", required=True)
+    for operation in OPERATIONS:
+        _add_operation_parser(subparsers, operation)
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="run NDJSON operation lines from a file or stdin, write NDJSON results",
+        description=inspect.getdoc(SpectraAssureBatch.__init__),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    batch.set_defaults(operation="batch")
+    batch.add_argument("--input", default="-", help="the NDJSON input file, default '-' (stdin)")
+    batch.add_argument("--output", default="-", help="the NDJSON output file, default '-' (stdout)")
+    batch.add_argument("--parallel", type=int, default=4, help="operations running at the same time, default 4")
+
+    return parser
+
+
+def _operation_kwargs(
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = parse_qp(args.qp)
+    for name, p in operation_args(args.operation).items():
+        text = getattr(args, f"op_{name}", None)
+        if text is not None:
+            kwargs[name] = parse_cli_value(p, text)
+    return kwargs
+
+
+def _run_batch(
+    client: SpectraAssureApiOperations,
+    args: argparse.Namespace,
+) -> bool:
+    # pylint: disable=consider-using-with
+    input_file = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        batch = SpectraAssureBatch(client=client, output=output_file, parallel=args.parallel)
+        return batch.run(input_file)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+# PUBLIC
+
+
+def main(
+    argv: List[str] | None = None,
+) -> int:
+    """
+    Action:
+        The 'spectra-assure' command.
+
+    Return:
+        The exit code: 0 if all operations were ok, 1 if not, 2 if the client cannot be created.
+    """
+    parser = make_arg_parser()
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=str(args.log_level).upper(),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+
+    try:
+        kwargs = {} if args.operation == "batch" else _operation_kwargs(args)
+        client = SpectraAssureApiOperations(**client_args(vars(args)))
+    except Exception as e:  # pylint:disable=broad-exception-caught
+        print(f"{PROG_NAME}: {type(e).__name__}: {e}", file=sys.stderr)
+        return 2
+
+    if args.operation == "batch":
+        return 0 if _run_batch(client, args) else 1
+
+    result = run_operation(client, args.operation, kwargs)
+    print(json.dumps(result, indent=2, default=str))
+    return 0 if result.get("ok") is True else 1
@@ -0,0 +1,181 @@
+import concurrent.futures
+import inspect
+import json
+import logging
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+import requests
+
+from spectra_assure_api_client.communication.download_criteria import SpectraAssureDownloadCriteria
+from spectra_assure_api_client.spectra_assure_api_operations import SpectraAssureApiOperations
+
+logger = logging.getLogger(__name__)
+
+# the operations of the cli; the cli name is the method name of SpectraAssureApiOperations
+OPERATIONS: List[str] = [
+    "list",
+    "status",
+    "checks",
+    "report",
+    "scan",
+    "submit_scan",
+    "wait_until_done",
+    "create",
+    "edit",
+    "delete",
+    "download",
+    "sync",
+    "verify_mirror",
+    "bulk",
+]
+
+# arguments that cannot be given on the command line or in a batch line
+SKIPPED_ARGS: List[str] = [
+    "self",
+    "qp",
+    "auto_adapt_to_throttle",  # a client option: --auto-adapt-to-throttle
+    "bandwidth_limiter",  # see: --max-bytes-per-second
+    "stop_event",
+    "on_run",
+]
+
+# a report dict with any of these is not ok
+FAILURE_KEYS: List[str] = ["missing", "corrupt", "errors"]
+
+# the key that tells if an item of a generator result succeeded, in order of preference:
+# 'ok' for bulk(), fan_out() and map_versions(), 'done' for wait_until_done()
+ITEM_SUCCESS_KEYS: List[str] = ["ok", "done"]
+
+
+def operation_args(
+    operation: str,
+) -> Dict[str, inspect.Parameter]:
+    """Return the keyword arguments of an operation that the cli supports, by name."""
+    method = getattr(SpectraAssureApiOperations, operation)
+    return {
+        name: p
+        for name, p in inspect.signature(method).parameters.items()
+        if name not in SKIPPED_ARGS and p.kind == inspect.Parameter.KEYWORD_ONLY
+    }
+
+
+def annotation_name(
+    p: inspect.Parameter,
+) -> str:
+    return str(p.annotation)
+
+
+def parse_cli_value(
+    p: inspect.Parameter,
+    text: str,
+) -> Any:
+    """Convert a command line string to the type of the argument."""
+    t = annotation_name(p)
+    if "SpectraAssureDownloadCriteria" in t or text[:1] in ["[", "{"]:
+        return json.loads(text)
+    if "List" in t:
+        return [item for item in text.split(",") if item]
+    if "bool" in t:
+        return text.lower() in ["1", "true", "yes", "on"]
+    if "int" in t:
+        return int(text)
+    if "float" in t:
+        return float(text)
+    return text
+
+
+def parse_qp(
+    items: List[str] | None,
+) -> Dict[str, Any]:
+    """Convert 'key=value' strings to query parameters; values are JSON if possible (true, 10, ...)."""
+    qp: Dict[str, Any] = {}
+    for item in items or []:
+        k, sep, v = item.partition("=")
+        if sep == "" or k == "":
+            raise ValueError(f"a query parameter must be 'key=value': {item}")
+        try:
+            qp[k] = json.loads(v)
+        except ValueError:
+            qp[k] = v
+    return qp
+
+
+def _item_ok(item: Any) -> bool:
+    if isinstance(item, dict):
+        for k in ITEM_SUCCESS_KEYS:
+            if k in item:
+                return item[k] is True
+    return True
+
+
+def to_jsonable(
+    result: Any,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Return:
+        (ok, fields) for the output of an operation;
+        a Response is ok if its status code is below 400, a report if it has no FAILURE_KEYS,
+        a list (or generator) if all its items are ok, see: ITEM_SUCCESS_KEYS.
+    """
+    if isinstance(result, requests.Response):
+        data: Any = result.text
+        try:
+            data = result.json()
+        except ValueError:
+            pass
+        return result.status_code < 400, {"status_code": result.status_code, "result": data}
+
+    if isinstance(result, concurrent.futures.Future):
+        return to_jsonable(result.result())
+
+    if inspect.isgenerator(result):
+        result = list(result)
+    if isinstance(result, dict):
+        # a verify_mirror() or sync() report
+        return not any(result.get(k) for k in FAILURE_KEYS), {"result": result}
+    if isinstance(result, list):
+        # e.g. bulk() with a failed (or skipped) operation, wait_until_done() with a version not done
+        return all(_item_ok(item) for item in result), {"result": result}
+    return True, {"result": result}
+
+
+def run_operation(
+    client: SpectraAssureApiOperations,
+    operation: str,
+    args: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Action:
+        Run one operation with keyword arguments and return a result that can be serialized as JSON:
+        {operation, ok, elapsed, status_code (if a response), result | error}.
+
+    Notes:
+        Exceptions are returned as an error, they are not raised.
+        A 'download_criteria' given as a dict is converted to a SpectraAssureDownloadCriteria.
+    """
+    start = time.monotonic()
+    r: Dict[str, Any] = {"operation": operation}
+    try:
+        if operation not in OPERATIONS:
+            raise ValueError(f"unknown operation: {operation}; use one of {OPERATIONS}")
+
+        kwargs = dict(args)
+        if isinstance(kwargs.get("download_criteria"), dict):
+            kwargs["download_criteria"] = SpectraAssureDownloadCriteria(**kwargs["download_criteria"])
+
+        ok, fields = to_jsonable(getattr(client, operation)(**kwargs))
+        r["ok"] = ok
+        r.update(fields)
+    except Exception as e:  # pylint:disable=broad-exception-caught
+        logger.debug("%s failed", operation, exc_info=True)
+        r["ok"] = False
+        r["error"] = f"{type(e).__name__}: {e}"
+
+    r["elapsed"] = round(time.monotonic() - start, 6)
+    return r
@@ -1,6 +1,8 @@
+import copy
 import json
 import logging
 from typing import (
+    TypeVar,
     List,
     Tuple,
     Dict,
@@ -17,6 +19,8 @@ from .post import SpectraAssureApiPost
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T", bound="SpectraAssureApi")
+
 
 class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
     SpectraAssureApiGet,
@@ -35,6 +39,9 @@ class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
         "proxy_port",
         "proxy_user",
         "proxy_password",
+        "max_bytes_per_second",
+        "profile",
+        "profile_dir",
     ]
 
     def __init__(  # pylint: disable=too-many-arguments,too-many-locals
@@ -53,6 +60,11 @@ class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
         timeout: int = 10,  # in seconds
         auto_adapt_to_throttle: bool = False,
         #
+        max_bytes_per_second: float | None = None,
+        #
+        profile: str | None = None,
+        profile_dir: str | None = None,
+        #
         host: str = "my.secure.software",
         api_version: str = "v1",
         #
@@ -85,6 +97,20 @@ class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
             and for the required time to pass.
             This approach is recommended for 'batch' type processing.
 
+         - max_bytes_per_second: float | None = None;
+            Limit the transfer rate of all uploads (scan) and downloads of this client together.
+            The limit can be changed at runtime with: bandwidth_limiter.set_rate(bytes_per_second=...).
+
+         - profile: str | None = None;
+            Profile every operation with 'cprofile', 'tracemalloc' or 'all';
+            by default the environment variable SPECTRA_ASSURE_PROFILE is used.
+            The statistics are aggregated per operation, see: profiler.summary() and profiler.dump().
+
+         - profile_dir: str | None = None;
+            Where the profile is written; if set, or if profiling is enabled via the environment,
+            the profile is also written when the program exits.
+            By default SPECTRA_ASSURE_PROFILE_DIR or '<program name>-profile'.
+
          - host: str = "my.secure.software";
             Current default host; do not change.
 
@@ -106,6 +132,9 @@ class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
             - proxy_password
             - timeout
             - auto_adapt_to_throttle
+            - max_bytes_per_second
+            - profile
+            - profile_dir
 
          - additional_args: Any;
             Any additional arguments will be collected in a dictionary that can be used via:
@@ -137,14 +166,19 @@ class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
             "proxy_port": proxy_port,
             "proxy_user": proxy_user,
             "proxy_password": proxy_password,
+            "max_bytes_per_second": max_bytes_per_second,
+            "profile": profile,
+            "profile_dir": profile_dir,
         }
 
-        logger.debug("old_args %s before merge", old_args)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("old_args %s before merge", self._redact(old_args))
         new_args = self._get_config_file(
             config_file,
             old_args,
         )
-        logger.debug("new_args %s after merge", new_args)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("new_args %s after merge", self._redact(new_args))
 
         # START: all args used
         super().__init__(
@@ -157,6 +191,11 @@ class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
             proxy_port=new_args.get("proxy_port", None),
             proxy_user=new_args.get("proxy_user", None),
             proxy_password=new_args.get("proxy_password", None),
+            #
+            max_bytes_per_second=new_args.get("max_bytes_per_second", None),
+            #
+            profile=new_args.get("profile", None),
+            profile_dir=new_args.get("profile_dir", None),
         )
 
         self.server = new_args.get("server", None)
@@ -266,8 +305,46 @@ class SpectraAssureApi(  # pylint: disable=too-many-instance-attributes
             msg = "FATAL: minimal required parameters are not set properly; " + ", ".join(ll)
             raise SpectraAssureInvalidAction(message=msg)
 
+    def _init_view(self) -> None:
+        # state of one view that must not be shared with the client it was made from, see: view()
+        self.additional_args = dict(self.additional_args)
+
     # PUBLIC
 
+    def view(
+        self: T,
+        *,
+        organization: str | None = None,
+        group: str | None = None,
+        token: str | None = None,
+    ) -> T:
+        """
+        Action:
+            Return a lightweight client for another organization and/or group on the same server.
+
+        Args:
+         - organization: str | None = None, optional; default: the organization of this client.
+         - group: str | None = None, optional; default: the group of this client.
+         - token: str | None = None, optional; default: the token of this client.
+
+        Return:
+            A shallow copy of this client: it shares the session (connection pool), the rate governor,
+            the bandwidth limiter, the download URL cache, the metrics and the profiler with this client.
+
+        Raises:
+         - SpectraAssureInvalidAction: if the organization or group is empty.
+        """
+        r = copy.copy(self)
+        if organization is not None:
+            r.organization = organization
+        if group is not None:
+            r.group = group
+        if token is not None:
+            r.token = token
+        r._init_view()  # pylint: disable=protected-access
+        r._validate_minimal_config_complete()  # pylint: disable=protected-access
+        return r
+
     def get_customer_context(self) -> str:
         return f"{self.server}:{self.organization}:{self.group}"
 
@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+import time
+from typing import (
+    BinaryIO,
+    Iterator,
+    List,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureBandwidthLimiter:
+
+    def __init__(
+        self,
+        *,
+        bytes_per_second: float | None = None,
+        burst: float | None = None,
+    ) -> None:
+        """
+        Action:
+            Initialize a token bucket that limits the transfer rate of all transfers sharing it.
+
+        Args:
+         - bytes_per_second: float | None, default None, optional;
+            The average transfer rate; None (or 0) means unlimited.
+
+         - burst: float | None, default None, optional;
+            The number of bytes that may be transferred at once after an idle period;
+            by default one second worth of transfer.
+
+        Notes:
+            The limiter is safe to share between threads, e.g. by all concurrent downloads of a sync,
+            and the rate can be changed at runtime with set_rate().
+        """
+        self._lock = threading.Lock()
+        self._rate = 0.0
+        self._burst = 0.0
+        self._tokens = 0.0
+        self._last = time.monotonic()
+
+        self.bytes_transferred = 0
+        self.seconds_slept = 0.0
+
+        self.set_rate(bytes_per_second=bytes_per_second, burst=burst)
+
+    def _refill(self, now: float) -> None:
+        # call with self._lock held
+        self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    @property
+    def bytes_per_second(self) -> float | None:
+        with self._lock:
+            return self._rate or None
+
+    def set_rate(
+        self,
+        *,
+        bytes_per_second: float | None,
+        burst: float | None = None,
+    ) -> None:
+        """Change the rate (and optionally the burst) at runtime; None (or 0) means unlimited."""
+        with self._lock:
+            now = time.monotonic()
+            if self._rate > 0:
+                self._refill(now)
+            self._last = now
+
+            self._rate = max(0.0, bytes_per_second or 0.0)
+            self._burst = max(1.0, burst if burst is not None else self._rate)
+            self._tokens = min(self._tokens, self._burst)
+
+        logger.info("bandwidth limit set to: %s bytes per second", bytes_per_second)
+
+    def consume(
+        self,
+        n_bytes: int,
+    ) -> float:
+        """
+        Action:
+            Account for 'n_bytes' transferred and sleep as long as needed to keep to the rate.
+
+        Return:
+            The seconds slept.
+        """
+        with self._lock:
+            self.bytes_transferred += n_bytes
+            if self._rate <= 0:
+                return 0.0
+
+            self._refill(time.monotonic())
+            # the bucket may go negative: the debt is paid by sleeping, also by the next caller
+            self._tokens -= n_bytes
+            delay = 0.0
+            if self._tokens < 0:
+                delay = -self._tokens / self._rate
+            self.seconds_slept += delay
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+
+def consume_all(
+    limiters: List[SpectraAssureBandwidthLimiter],
+    n_bytes: int,
+) -> float:
+    """Account for 'n_bytes' in every limiter, e.g. a per-transfer and a per-client limit; return the seconds slept."""
+    return sum(limiter.consume(n_bytes) for limiter in limiters)
+
+
+class SpectraAssureThrottledReader:
+
+    def __init__(
+        self,
+        *,
+        file: BinaryIO,
+        limiters: List[SpectraAssureBandwidthLimiter],
+        chunk_size: int = 2**16,  # 64KByte
+    ) -> None:
+        """
+        Action:
+            Wrap an open binary file, so that reading it (e.g. as an upload body) keeps to the rate of all limiters.
+
+        Notes:
+            __len__ lets 'requests' send a Content-Length header instead of a chunked body.
+            The file must not be read by anyone else while it is wrapped.
+        """
+        self.file = file
+        self.limiters = limiters
+        self.chunk_size = chunk_size
+
+        position = file.tell()
+        self._length = os.fstat(file.fileno()).st_size - position
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(
+        self,
+        size: int = -1,
+    ) -> bytes:
+        if size is None or size < 0:
+            return b"".join(self)  # the rest of the file, still in limited chunks
+
+        data = self.file.read(min(size, self.chunk_size))
+        if len(data) > 0:
+            consume_all(self.limiters, len(data))
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            data = self.read(self.chunk_size)
+            if len(data) == 0:
+                return
+            yield data
@@ -0,0 +1,324 @@
+import base64
+import collections
+import gzip
+import io
+import json
+import logging
+import threading
+import time
+import urllib.parse
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+)
+
+import requests
+import requests.adapters
+import urllib3
+
+from spectra_assure_api_client.version import VERSION
+from .exceptions import SpectraAssureCassetteMiss
+
+logger = logging.getLogger(__name__)
+
+# query parameters of signed download URLs that change with every status(download=True)
+VOLATILE_QUERY_PARAMETERS: List[str] = [
+    "x-amz-date",
+    "x-amz-expires",
+    "x-amz-signature",
+    "x-amz-credential",
+    "x-amz-security-token",
+    "x-goog-date",
+    "x-goog-expires",
+    "x-goog-signature",
+    "x-goog-credential",
+    "expires",
+    "signature",
+    "se",
+    "sig",
+]
+
+
+def strip_volatile_query_parameters(url: str) -> str:
+    """Return the url without the volatile parameters of signed URLs (the signature, credential and token)."""
+    u_info = urllib.parse.urlsplit(url)
+    query = [
+        (k, v)
+        for k, v in urllib.parse.parse_qsl(u_info.query, keep_blank_values=True)
+        if k.lower() not in VOLATILE_QUERY_PARAMETERS
+    ]
+    return urllib.parse.urlunsplit(u_info._replace(query=urllib.parse.urlencode(query)))
+
+
+def cassette_key(
+    method: str,
+    url: str,
+) -> str:
+    """Return the key that matches a replayed request to a recorded one: the method and the url without volatile parameters."""
+    u_info = urllib.parse.urlsplit(strip_volatile_query_parameters(url))
+    query_string = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(u_info.query, keep_blank_values=True)))
+    return f"{method.upper()} {u_info.scheme}://{u_info.netloc}{u_info.path}?{query_string}"
+
+
+class _CassetteAdapter(requests.adapters.HTTPAdapter):
+
+    def install(
+        self,
+        session: requests.Session,
+    ) -> None:
+        """Route all http and https requests of 'session' (e.g. api_client.session) through this adapter."""
+        session.mount("https://", self)
+        session.mount("http://", self)
+
+
+class SpectraAssureCassetteRecorder(_CassetteAdapter):
+
+    def __init__(
+        self,
+        *,
+        file_path: str,
+        max_body_size: int = 64 * 2**20,  # 64MByte
+        **kwargs: Any,
+    ) -> None:
+        """
+        Action:
+            Initialize a transport adapter that passes all requests to the network
+            and records every interaction to a gzip compressed JSON lines cassette.
+
+        Args:
+         - file_path: str, mandatory;
+            The cassette to write, e.g. 'session.jsonl.gz'; an existing file is replaced.
+
+         - max_body_size: int, default 64M, optional;
+            Larger response bodies (e.g. big downloads) are recorded with their size only
+            and replayed as zero bytes of that size; they are never held in memory.
+
+         - kwargs: passed on to requests.adapters.HTTPAdapter, e.g. pool_maxsize.
+
+        Notes:
+            Per interaction we record the method, the url, the response status, headers and body,
+            and the seconds until the body was complete.
+            Request headers and bodies are not recorded, so no credentials end up in the cassette;
+            the signature, credential and token of signed URLs (see: VOLATILE_QUERY_PARAMETERS)
+            are removed from the recorded urls. Response bodies are recorded as received:
+            the download url in the body of status(download=True) keeps its (short-lived) signature.
+
+            A streamed response (stream=True, e.g. a download) is recorded when the caller has consumed or closed it;
+            its chunks are copied while they pass, up to max_body_size.
+
+            Use it as:
+                with SpectraAssureCassetteRecorder(file_path="session.jsonl.gz") as recorder:
+                    recorder.install(api_client.session)
+                    ... run the operations ...
+        """
+        super().__init__(**kwargs)
+        self.file_path = file_path
+        self.max_body_size = max_body_size
+
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._file = gzip.open(file_path, "wt", encoding="utf-8")
+        self._write({"cassette": 1, "sdk_version": VERSION, "created": time.time()})
+        self.interactions = 0
+
+    def _write(
+        self,
+        record: Dict[str, Any],
+    ) -> None:
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            if self._file.closed:
+                # e.g. a stream consumed after the recorder was closed
+                logger.warning("cassette %s is closed, not recorded: %s", self.file_path, record.get("url"))
+                return
+            self._file.write(line)
+
+    def send(  # pylint: disable=too-many-arguments
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: None | float | Tuple[float, float] | Tuple[float, None] = None,
+        verify: bool | str = True,
+        cert: None | bytes | str | Tuple[bytes | str, bytes | str] = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        start = time.monotonic()
+        response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        record: Dict[str, Any] = {
+            "method": request.method,
+            "url": strip_volatile_query_parameters(str(request.url)),
+            "offset": round(start - self._start, 6),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+        }
+
+        if not stream:
+            body = response.content  # what requests would do next anyway
+            self._record(record, start, [body], len(body))
+            return response
+
+        self._tee_stream(response, record, start)
+        return response
+
+    def _tee_stream(
+        self,
+        response: requests.Response,
+        record: Dict[str, Any],
+        start: float,
+    ) -> None:
+        # copy the chunks while the caller reads them: a large download is never buffered as a whole
+        raw = response.raw
+        raw_stream = raw.stream
+
+        def stream(*args: Any, **kwargs: Any) -> Iterator[bytes]:
+            chunks: List[bytes] | None = []
+            size = 0
+            try:
+                for chunk in raw_stream(*args, **kwargs):
+                    size += len(chunk)
+                    if chunks is not None:
+                        chunks.append(chunk)
+                        if size > self.max_body_size:
+                            chunks = None
+                    yield chunk
+            finally:
+                self._record(record, start, chunks, size)
+
+        raw.stream = stream  # type: ignore[method-assign]
+
+    def _record(
+        self,
+        record: Dict[str, Any],
+        start: float,
+        chunks: List[bytes] | None,
+        size: int,
+    ) -> None:
+        record["elapsed"] = round(time.monotonic() - start, 6)
+        record["body_size"] = size
+        if chunks is not None and size <= self.max_body_size:
+            record["body"] = base64.b64encode(b"".join(chunks)).decode("ascii")
+
+        self._write(record)
+        with self._lock:
+            self.interactions += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info("cassette %s: %d interactions recorded", self.file_path, self.interactions)
+        super().close()
+
+    def __enter__(self) -> "SpectraAssureCassetteRecorder":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class SpectraAssureCassettePlayer(_CassetteAdapter):
+
+    def __init__(
+        self,
+        *,
+        file_path: str,
+        speed: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Action:
+            Initialize a transport adapter that answers all requests from a cassette, without any network access.
+
+        Args:
+         - file_path: str, mandatory;
+            The cassette written by SpectraAssureCassetteRecorder.
+
+         - speed: float | None, default None, optional;
+            None (or 0) replays as fast as possible;
+            1.0 takes as long as the recorded interaction, 2.0 twice as fast, 0.5 half as fast.
+
+        Raises:
+            SpectraAssureCassetteMiss: from send(), if the cassette has no interaction for a request.
+
+        Notes:
+            A request matches a recorded one with the same method and url;
+            the volatile parameters of signed URLs (e.g. X-Amz-Date) are ignored.
+            Interactions with the same key are replayed in the recorded order,
+            after the last one it is repeated, e.g. when a replay polls status() more often than the recording.
+        """
+        super().__init__(**kwargs)
+        self.file_path = file_path
+        self.speed = speed
+
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, Deque[Dict[str, Any]]] = collections.defaultdict(collections.deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self.replayed = 0
+        self._load()
+
+    def _load(self) -> None:
+        n = 0
+        with gzip.open(self.file_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if "method" not in record:
+                    continue  # the header
+                self._interactions[cassette_key(record["method"], record["url"])].append(record)
+                n += 1
+        logger.info("cassette %s: %d interactions loaded", self.file_path, n)
+
+    def _next(
+        self,
+        key: str,
+    ) -> Dict[str, Any] | None:
+        with self._lock:
+            queue = self._interactions.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            self.replayed += 1
+            return self._last.get(key)
+
+    def send(  # pylint: disable=too-many-arguments,unused-argument
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: None | float | Tuple[float, float] | Tuple[float, None] = None,
+        verify: bool | str = True,
+        cert: None | bytes | str | Tuple[bytes | str, bytes | str] = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        key = cassette_key(str(request.method), str(request.url))
+        record = self._next(key)
+        if record is None:
+            raise SpectraAssureCassetteMiss(f"no interaction in cassette {self.file_path} for: {key}")
+
+        if self.speed:
+            time.sleep(record["elapsed"] / self.speed)
+
+        if "body" in record:
+            body = base64.b64decode(record["body"])
+        else:
+            body = bytes(record["body_size"])
+
+        # the recorded body is already decoded, so the encoding headers no longer apply
+        headers = {
+            k: v for k, v in record["headers"].items() if k.lower() not in ["content-encoding", "transfer-encoding"]
+        }
+        headers["Content-Length"] = str(len(body))
+
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=record["status"],
+            reason=record.get("reason"),
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
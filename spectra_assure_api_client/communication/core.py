@@ -1,12 +1,18 @@
 from typing import (
+    TypeVar,
     Dict,
     Callable,
     Any,
+    List,
+    Set,
 )
 
 import logging
+import os
+import re
 import time
 import requests
+import requests.adapters
 import urllib.request
 
 from .exceptions import (
@@ -14,10 +20,23 @@ from .exceptions import (
 )
 
 from spectra_assure_api_client.version import VERSION
+from .bandwidth import SpectraAssureBandwidthLimiter
+from .metrics import (
+    SpectraAssureMetrics,
+    Sample,
+    action_from_url,
+)
+from .profiling import SpectraAssureProfiler
+from .rate_governor import SpectraAssureRateGovernor
 
 
 logger = logging.getLogger(__name__)
 
+# values never written to the log, see: _redact()
+SECRET_KEYS = ["authorization", "token", "proxy_password"]
+
+C = TypeVar("C", bound="SpectraAssureApiCore")
+
 
 class Executor:
     def __init__(  # pylint: disable=too-many-arguments
@@ -66,6 +85,11 @@ class SpectraAssureApiCore:
         proxy_port: int | None = None,
         proxy_user: str | None = None,
         proxy_password: str | None = None,
+        #
+        max_bytes_per_second: float | None = None,
+        #
+        profile: str | None = None,
+        profile_dir: str | None = None,
     ) -> None:
         self.token = token
         self.timeout = timeout
@@ -78,6 +102,14 @@ class SpectraAssureApiCore:
 
         self.proxies: Dict[str, str] = {}
 
+        # secret attribute -> environment variable, pickled instead of the secret, see: reference_secrets()
+        self.secret_references: Dict[str, str] = {}
+
+        self._init_transport(max_bytes_per_second=max_bytes_per_second)
+
+        # disabled unless 'profile' or SPECTRA_ASSURE_PROFILE is set, can be toggled at runtime with enable()/disable()
+        self.profiler = SpectraAssureProfiler.from_environment(modes=profile, output_dir=profile_dir)
+
         self._set_proxy(
             server=self.proxy_server,
             port=self.proxy_port,
@@ -88,6 +120,158 @@ class SpectraAssureApiCore:
             # also parse for default proxies using case insensitive http(s)_proxy
             self.proxies = urllib.request.getproxies()
 
+    def _init_transport(
+        self,
+        *,
+        max_bytes_per_second: float | None = None,
+        min_interval: float = 0.0,
+    ) -> None:
+        # the state that is never pickled but made again in every process, see: __getstate__()
+
+        # shared by all requests of this client, see execute_with_retry()
+        self.rate_governor = SpectraAssureRateGovernor(min_interval=min_interval)
+
+        # shared by all uploads and downloads of this client, adjustable at runtime with set_rate()
+        self.bandwidth_limiter = SpectraAssureBandwidthLimiter(bytes_per_second=max_bytes_per_second)
+
+        # shared by all requests of this client: connections are kept alive and reused
+        self.session = self._make_session()
+
+        # fed by the transport layer, see: SDK_METRICS; export with metrics.export() or metrics.start_exporter()
+        self.metrics = SpectraAssureMetrics()
+        self.metrics.add_collector(self._collect_metrics)
+
+    def _transport_attributes(self) -> Set[str]:
+        # the attributes made by _init_transport() (and the profiler), extended by the operations that add some
+        return {"rate_governor", "bandwidth_limiter", "session", "metrics", "profiler"}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # only the configuration is pickled: e.g. for a worker process of a ProcessPoolExecutor
+        skip = self._transport_attributes()
+        state = {k: v for k, v in self.__dict__.items() if k not in skip}
+        for attribute in self.secret_references:
+            state[attribute] = None
+        if "proxy_password" in self.secret_references and self.proxy_user is not None:
+            state["proxies"] = {}  # the proxy urls contain the password, they are made again in __setstate__()
+        state["_policies"] = {
+            "max_bytes_per_second": self.bandwidth_limiter.bytes_per_second,
+            "min_interval": self.rate_governor.min_interval,
+            "profile": list(self.profiler.modes),
+            "profile_dir": self.profiler.output_dir,
+        }
+        return state
+
+    def __setstate__(
+        self,
+        state: Dict[str, Any],
+    ) -> None:
+        state = dict(state)
+        policies = state.pop("_policies")
+        self.__dict__.update(state)
+
+        for attribute, env in self.secret_references.items():
+            value = os.getenv(env)
+            if not value:
+                msg = f"the environment variable {env} (for the {attribute} of the unpickled client) is not set"
+                raise SpectraAssureInvalidAction(message=msg)
+            setattr(self, attribute, value)
+        if "proxy_password" in self.secret_references and self.proxy_user is not None:
+            self._set_proxy(
+                server=self.proxy_server,
+                port=self.proxy_port,
+                user=self.proxy_user,
+                password=self.proxy_password,
+            )
+
+        # a new session, rate governor, bandwidth limit and metrics for this process
+        self._init_transport(
+            max_bytes_per_second=policies["max_bytes_per_second"],
+            min_interval=policies["min_interval"],
+        )
+        # no dump at exit here: the program that made the client decides where its profile goes
+        self.profiler = SpectraAssureProfiler(modes=policies["profile"], output_dir=policies["profile_dir"])
+
+    def __copy__(self: C) -> C:
+        # a shallow copy shares the transport (see: view()), only pickling makes a new one
+        r = self.__class__.__new__(self.__class__)
+        r.__dict__.update(self.__dict__)
+        return r
+
+    def reference_secrets(
+        self,
+        *,
+        token: str | None = None,
+        proxy_password: str | None = None,
+    ) -> None:
+        """
+        Action:
+            Pickle the name of an environment variable instead of the token and/or the proxy password.
+
+        Args:
+         - token: str | None, default None, optional;
+            The environment variable with the token in the process that unpickles the client,
+            e.g. 'RLPORTAL_ACCESS_TOKEN'.
+         - proxy_password: str | None, default None, optional;
+            The environment variable with the proxy password, e.g. 'RLSECURE_PROXY_PASSWORD'.
+
+        Raises:
+            SpectraAssureInvalidAction: when unpickling, if the environment variable is not set (or empty).
+
+        Notes:
+            Without a reference, the pickle of a client contains the secret itself.
+            A process pool worker inherits the environment of the program, so setting the variable there is enough.
+        """
+        for attribute, env in [("token", token), ("proxy_password", proxy_password)]:
+            if env is not None:
+                self.secret_references[attribute] = env
+
+    @staticmethod
+    def _make_session() -> requests.Session:
+        session = requests.Session()
+        # more connections than the default 10, so concurrent operations do not discard them
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=32)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _collect_metrics(self) -> List[Sample]:
+        # values that are counted elsewhere or only known now
+        samples: List[Sample] = [
+            ("throttle_seconds_slept", {}, self.rate_governor.seconds_slept),
+            ("bandwidth_seconds_slept", {}, self.bandwidth_limiter.seconds_slept),
+            ("bandwidth_limit_bytes_per_second", {}, self.bandwidth_limiter.bytes_per_second or 0.0),
+        ]
+
+        in_use = 0
+        max_size = 0
+        for adapter in set(self.session.adapters.values()):
+            pool_manager = getattr(adapter, "poolmanager", None)
+            if pool_manager is None:
+                continue
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is None:
+                    continue
+                # the queue of a pool holds the idle connections and a placeholder for every connection not yet made
+                in_use += pool.pool.maxsize - pool.pool.qsize() if pool.pool is not None else 0
+                max_size = max(max_size, pool.pool.maxsize if pool.pool is not None else 0)
+        samples.append(("pool_connections_in_use", {}, float(in_use)))
+        samples.append(("pool_connections_max", {}, float(max_size)))
+        return samples
+
+    def _count_request(
+        self,
+        *,
+        url: str,
+        response: requests.Response,
+        start: float,
+    ) -> None:
+        action = action_from_url(url)
+        self.metrics.inc("requests", action=action, status=str(response.status_code))
+        self.metrics.observe("request_duration_seconds", time.perf_counter() - start, action=action)
+        if response.status_code == 429:
+            self.metrics.inc("throttle_events", action=action)
+
     @staticmethod
     def _get_throttle_delay(
         s: str,
@@ -143,6 +327,24 @@ class SpectraAssureApiCore:
             "https": f"http://{user}:{password}@{server}:{port}",
         }
 
+    @staticmethod
+    def _redact(
+        a_dict: Dict[str, Any] | None,
+    ) -> Dict[str, Any] | None:
+        """Return a copy for debug logging: without tokens and passwords, also not in proxy urls."""
+        if a_dict is None:
+            return None
+
+        r: Dict[str, Any] = {}
+        for k, v in a_dict.items():
+            if str(k).lower() in SECRET_KEYS and v is not None:
+                r[k] = "***"
+            elif isinstance(v, str) and "@" in v:
+                r[k] = re.sub(r"://([^:/@]+):[^@]*@", r"://\1:***@", v)
+            else:
+                r[k] = v
+        return r
+
     def _make_headers(
         self,
         a_dict: Dict[str, str] | None = None,
@@ -215,22 +417,30 @@ class SpectraAssureApiCore:
         while current_try < max_try:
             current_try += 1
 
+            self.rate_governor.wait()
+            start = time.perf_counter()
             response = executor.execute()
+            self._count_request(url=executor.url, response=response, start=start)
 
             if response.status_code != 429:
                 return response
 
-            # first try for Throttle
-            if response.status_code == 429 and current_try < max_try:  # auto retry 5 times if requested
-                logger.warning(
-                    "THROTTLE: %s; %s: current try: %d",
-                    executor.url,
-                    response.text,
-                    current_try,
-                )
-                delay_time = SpectraAssureApiCore._get_throttle_delay(
-                    response.text,
-                )
-                time.sleep(delay_time)
-                continue
+            if current_try >= max_try:
+                # no retry follows, so the other requests of this client are not held back
+                break
+
+            # Throttle: auto retry 5 times if requested
+            logger.warning(
+                "THROTTLE: %s; %s: current try: %d",
+                executor.url,
+                response.text,
+                current_try,
+            )
+            delay_time = SpectraAssureApiCore._get_throttle_delay(
+                response.text,
+            )
+            # all requests of this client wait, not only this one; the wait happens before the next try
+            self.rate_governor.penalize(delay_time)
+            self.metrics.inc("retries", action=action_from_url(executor.url))
+
         return response
@@ -3,6 +3,7 @@ from typing import (
     List,
 )
 
+from .bandwidth import SpectraAssureBandwidthLimiter
 from .exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -34,6 +35,13 @@ class SpectraAssureDownloadCriteria:
         with_overwrite_existing_files: bool = False,
         with_verify_after_download: bool = True,
         with_verify_existing_files: bool = True,
+        with_verification_manifest: bool = False,
+        with_journal: bool = False,
+        #
+        blob_store_dir: str | None = None,
+        blob_store_link_mode: str = "hardlink",
+        #
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None,
     ) -> None:
         """
         Args:
@@ -45,7 +53,7 @@ class SpectraAssureDownloadCriteria:
             If waiting for the scan to finish, by default wait max 60 seconds per scan item.
             Max time per item <= 1h (3600 seconds)
             Min time > 10 seconds
-            Wait intervals are never greater than 30 seconds and never smaller than 10 seconds.
+            The wait interval starts at 1 second and grows up to 30 seconds.
 
         mustHaveQualityStatusPass: bool = False; Optional.
             If True, the 'quality' status must be 'pass' before we consider this version a candidate for download.
@@ -81,6 +89,30 @@ class SpectraAssureDownloadCriteria:
             we verify the currently existing target file against the sha256 from the status response.
             On mismatch, we raise 'ExistingTargetFileDigestFailure' and report the path to the file.
 
+        with_verification_manifest: bool = False; Optional.
+            If True, we keep a manifest file in the target directory
+            recording size, mtime, inode, sha1 and sha256 of every verified file.
+            An existing file is only hashed again when its size, mtime or inode changed.
+
+        with_journal: bool = False; Optional.
+            If True, we append every state change of every artifact (planned, in-progress, verified, renamed)
+            to a journal file in the target directory.
+            A version completed in an earlier run is then skipped without a status() request and without rehashing,
+            as long as its file still exists with the recorded size.
+
+        blob_store_dir: str | None = None; Optional.
+            If set, use a content addressable store in this (existing) directory.
+            Every verified download is stored once by its sha256,
+            and a file already in the store is linked into the target directory
+            before any download URL is requested.
+
+        blob_store_link_mode: str = "hardlink"; Optional.
+            How files are placed from the blob store: 'hardlink', 'reflink' or 'copy'.
+
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None; Optional.
+            If set, limit the transfer rate of the downloads.
+            All downloads using the same limiter share its rate, also when they run in parallel.
+
         """
         self.current_strategy = ""
         for strategy in SUPPORTED_STRATEGIES:
@@ -106,3 +138,10 @@ class SpectraAssureDownloadCriteria:
         self.with_overwrite_existing_files = with_overwrite_existing_files
         self.with_verify_after_download = with_verify_after_download
         self.with_verify_existing_files = with_verify_existing_files
+        self.with_verification_manifest = with_verification_manifest
+        self.with_journal = with_journal
+
+        self.blob_store_dir = blob_store_dir
+        self.blob_store_link_mode = blob_store_link_mode
+
+        self.bandwidth_limiter = bandwidth_limiter
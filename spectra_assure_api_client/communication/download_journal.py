@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE_NAME = ".spectra-assure-journal.jsonl"
+
+JOURNAL_STATES: List[str] = [
+    "planned",  # selected for download, file name and hashes known
+    "in-progress",  # transfer started
+    "verified",  # the transferred temp file verified
+    "renamed",  # the verified file is in place under its final name: the artifact is complete
+]
+
+
+class UrlDownloaderJournal:
+
+    def __init__(
+        self,
+        *,
+        target_dir: str,
+        file_name: str = JOURNAL_FILE_NAME,
+        compact_min_lines: int = 1000,
+    ) -> None:
+        """
+        Actions:
+            Initialize an append-only download journal in 'target_dir'.
+
+        Args:
+         - target_dir: str, mandatory;
+            The directory holding the downloaded files and the journal.
+
+         - file_name: str, default: ".spectra-assure-journal.jsonl", optional.
+
+         - compact_min_lines: int, default 1000, optional;
+            When loading, a journal with more lines than this and more than 4 lines per artifact
+            is rewritten with one line per artifact.
+
+        Notes:
+            Every state change is appended as one JSON line and flushed to disk (fsync) before we continue,
+            so after a crash the journal shows exactly which artifacts were completed.
+            A line torn by a crash is ignored when loading.
+
+            Loading costs O(journal) and needs neither the Portal nor any hashing:
+            an artifact whose last state is 'renamed' is complete
+            as long as its file still exists with the recorded size.
+        """
+        self.target_dir = target_dir
+        self.journal_path = f"{target_dir}/{file_name}"
+        self.compact_min_lines = compact_min_lines
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._needs_newline = False
+
+        self._load()
+
+    def _load(self) -> None:
+        n_lines = 0
+        try:
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        self._needs_newline = len(data) > 0 and not data.endswith(b"\n")
+        for line in data.splitlines():
+            n_lines += 1
+            try:
+                record = json.loads(line)
+                key = record["key"]
+            except Exception:  # pylint:disable=broad-exception-caught
+                logger.warning("ignoring a broken line in journal %s", self.journal_path)
+                continue
+            self._merge(key, record)
+
+        if n_lines > self.compact_min_lines and n_lines > 4 * len(self._entries):
+            self._compact()
+
+    def _merge(
+        self,
+        key: str,
+        record: Dict[str, Any],
+    ) -> None:
+        # keep the fields of earlier states (file name, hashes) unless a new state starts a new plan
+        entry = self._entries.get(key)
+        if entry is None or record.get("state") == "planned":
+            entry = {}
+        entry.update(record)
+        self._entries[key] = entry
+
+    def _compact(self) -> None:
+        temp_path = f"{self.journal_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for entry in self._entries.values():
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+        self._needs_newline = False
+        logger.info("journal compacted: %s, %d entries", self.journal_path, len(self._entries))
+
+    # PUBLIC
+
+    def record(
+        self,
+        key: str,
+        state: str,
+        **fields: Any,
+    ) -> None:
+        """
+        Action:
+            Append a state change for the artifact 'key' and flush it to disk.
+
+        Args:
+         - key: str; the artifact, e.g. 'project/package@version'.
+         - state: str; one of JOURNAL_STATES.
+         - fields: additional JSON serializable fields, e.g. file, hashes, path, size.
+        """
+        assert state in JOURNAL_STATES, f"unsupported journal state: {state}"
+
+        record: Dict[str, Any] = {"key": key, "state": state, "time": time.time()}
+        record.update(fields)
+        line = json.dumps(record, sort_keys=True) + "\n"
+
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                if self._needs_newline:
+                    f.write("\n")  # terminate a line torn by an earlier crash
+                    self._needs_newline = False
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._merge(key, record)
+
+    def record_renamed(
+        self,
+        key: str,
+        file_path: str,
+    ) -> None:
+        """Record that the artifact 'key' is complete as 'file_path', with its real path and size."""
+        self.record(
+            key,
+            "renamed",
+            path=os.path.realpath(file_path),
+            size=os.stat(file_path).st_size,
+        )
+
+    def get(
+        self,
+        key: str,
+    ) -> Dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry is not None else None
+
+    def completed(
+        self,
+        key: str,
+    ) -> Dict[str, Any] | None:
+        """
+        Return:
+            The journal entry if the artifact is complete:
+            its last state is 'renamed' and the file exists with the recorded size; otherwise None.
+        """
+        entry = self.get(key)
+        if entry is None or entry.get("state") != "renamed":
+            return None
+
+        try:
+            size = os.stat(str(entry.get("path", ""))).st_size
+        except OSError:
+            return None
+
+        if entry.get("size") is not None and entry["size"] != size:
+            return None
+
+        return entry
@@ -0,0 +1,157 @@
+import calendar
+import logging
+import threading
+import time
+import urllib.parse
+from typing import (
+    Dict,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureDownloadUrlCache:
+
+    def __init__(
+        self,
+        *,
+        refresh_margin: int = 30,  # in seconds
+        default_ttl: int = 0,  # in seconds
+    ) -> None:
+        """
+        Action:
+            Initialize a cache for signed download URLs.
+
+        Args:
+         - refresh_margin: int, default 30, optional;
+            A cached URL is no longer handed out when it expires within this many seconds,
+            so a new one is requested just in time before the transfer starts.
+
+         - default_ttl: int, default 0, optional;
+            The validity in seconds assumed for URLs where no expiry can be found in the signature parameters.
+            With the default of 0, such URLs are never reused.
+
+        Notes:
+            Every time a download URL is requested, the Portal download capacity is reduced,
+            so reusing a still valid URL for retries and resumed transfers saves capacity and a status() round-trip.
+            The cache is safe to use from multiple threads.
+        """
+        self.refresh_margin = max(0, refresh_margin)
+        self.default_ttl = max(0, default_ttl)
+
+        self._lock = threading.Lock()
+        self._urls: Dict[str, Tuple[str, float]] = {}  # key -> (url, expires at epoch seconds)
+
+    @staticmethod
+    def _parse_amz_date(value: str) -> float | None:
+        # e.g. 20240521T095821Z
+        try:
+            return float(calendar.timegm(time.strptime(value, "%Y%m%dT%H%M%SZ")))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _parse_iso_date(value: str) -> float | None:
+        # e.g. 2024-05-21T09:58:21Z
+        try:
+            return float(calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ")))
+        except ValueError:
+            return None
+
+    @classmethod
+    def get_expiry(
+        cls,
+        download_url: str,
+    ) -> float | None:
+        """
+        Action:
+            Find the expiry time of a signed URL from its signature query parameters.
+
+        Args:
+         - download_url: str, mandatory.
+
+        Return:
+            The expiry as epoch seconds, or None if no supported signature parameters are found.
+
+        Notes:
+            Supported are:
+             - 'X-Amz-Date' with 'X-Amz-Expires' (AWS signature v4),
+             - 'X-Goog-Date' with 'X-Goog-Expires' (GCS signature v4),
+             - 'Expires' as epoch seconds (AWS signature v2, CloudFront),
+             - 'se' as an ISO timestamp (Azure SAS).
+        """
+        u_query = urllib.parse.parse_qs(urllib.parse.urlparse(download_url).query)
+        query: Dict[str, str] = {k.lower(): v[0] for k, v in u_query.items() if len(v) > 0}
+
+        for prefix in ["x-amz-", "x-goog-"]:
+            date = query.get(f"{prefix}date")
+            expires = query.get(f"{prefix}expires")
+            if date is None or expires is None:
+                continue
+
+            signed_at = cls._parse_amz_date(date)
+            if signed_at is not None and expires.isdigit():
+                return signed_at + int(expires)
+
+        expires = query.get("expires")
+        if expires is not None and expires.isdigit():
+            return float(expires)
+
+        se = query.get("se")
+        if se is not None:
+            return cls._parse_iso_date(se)
+
+        return None
+
+    # PUBLIC
+
+    def get(
+        self,
+        key: str,
+    ) -> str | None:
+        """
+        Return:
+            The cached URL for this key if it is still valid for at least 'refresh_margin' seconds,
+            otherwise None (and the expired entry is dropped).
+        """
+        with self._lock:
+            entry = self._urls.get(key)
+            if entry is None:
+                return None
+
+            url, expires_at = entry
+            if expires_at - self.refresh_margin > time.time():
+                logger.debug("download url cache hit: %s", key)
+                return url
+
+            del self._urls[key]
+
+        logger.debug("download url cache expired: %s", key)
+        return None
+
+    def put(
+        self,
+        key: str,
+        download_url: str,
+    ) -> None:
+        expires_at = self.get_expiry(download_url)
+        if expires_at is None:
+            if self.default_ttl == 0:
+                logger.debug("download url has no known expiry, not cached: %s", key)
+                return
+            expires_at = time.time() + self.default_ttl
+
+        with self._lock:
+            self._urls[key] = (download_url, expires_at)
+
+    def invalidate(
+        self,
+        key: str,
+    ) -> None:
+        with self._lock:
+            self._urls.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._urls.clear()
@@ -1,17 +1,25 @@
-import hashlib
 import logging
 import os
 import re
 import urllib.parse
-import uuid
 from pathlib import Path
 from typing import (
     Dict,
+    List,
     Tuple,
 )
 
 import requests
 
+from .bandwidth import (
+    SpectraAssureBandwidthLimiter,
+    consume_all,
+)
+from .download_journal import UrlDownloaderJournal
+from .downloader_blob_store import UrlDownloaderBlobStore
+from .downloader_manifest import UrlDownloaderManifest
+from .hashing import file_hex_digests
+from .metrics import SpectraAssureMetrics
 from .downloader_exceptions import (
     UrlDownloaderUnknownHashKey,
     UrlDownloaderTargetDirectoryIssue,
@@ -39,6 +47,13 @@ class UrlDownloader:
         with_overwrite_existing_files: bool = False,
         with_verify_after_download: bool = True,
         with_verify_existing_files: bool = True,
+        with_verification_manifest: bool = False,
+        manifest: UrlDownloaderManifest | None = None,
+        blob_store: UrlDownloaderBlobStore | None = None,
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | List[SpectraAssureBandwidthLimiter] | None = None,
+        journal: UrlDownloaderJournal | None = None,
+        session: requests.Session | None = None,
+        metrics: SpectraAssureMetrics | None = None,
     ) -> None:
         """
         Actions:
@@ -59,7 +74,8 @@ class UrlDownloader:
             When downloading the file, the HTTPS request timeout is set to 1 hour.
 
          - block_size: int, default 64k, optional;
-            When validating the hash of the downloaded or existing file, we read data in blocks of 64k.
+            When validating the hash of the downloaded or existing file, we read data in blocks of 64k
+            (unless hashlib.file_digest() or a memory map is used, see: hashing.file_hex_digests()).
 
          - with_overwrite_existing_files: bool = False, optional;
             If the file exists in target directory, we can choose to overwrite it
@@ -71,6 +87,32 @@ class UrlDownloader:
          - with_verify_existing_files: bool = True, optional;
             If the file already exists in target directory, we can verify against the provided hash.
 
+         - with_verification_manifest: bool = False, optional;
+            Keep a manifest in the target directory with the size, mtime, inode, sha1 and sha256
+            of every verified file, so an unchanged existing file is not hashed again on the next run.
+
+         - manifest: UrlDownloaderManifest | None = None, optional;
+            With with_verification_manifest: use this manifest of the target directory,
+            e.g. one shared by the downloaders of concurrent versions; its owner calls flush().
+
+         - blob_store: UrlDownloaderBlobStore | None = None, optional;
+            A content addressable store shared between target directories.
+            Verified downloads are added to the store by sha256,
+            and a file already in the store is linked into the target directory instead of downloaded.
+
+         - bandwidth_limiter: SpectraAssureBandwidthLimiter | List[SpectraAssureBandwidthLimiter] | None, optional;
+            Limit the transfer rate; a limiter may be shared by several downloaders.
+            With a list, all limits apply, e.g. a per-transfer limit and the limit of a client.
+
+         - journal: UrlDownloaderJournal | None = None, optional;
+            Record the 'verified' and 'renamed' states of every download_file_from_url() with a 'journal_key'.
+
+         - session: requests.Session | None = None, optional;
+            Download with this session, e.g. the one of the client, to reuse its connections and transport adapters.
+
+         - metrics: SpectraAssureMetrics | None = None, optional;
+            Count the bytes downloaded and hashed and the hits of the blob store and the manifest, e.g. in the client metrics.
+
         Raises:
          - UrlDownloaderTargetDirectoryIssue:
             If the target file path does not exist or is not a directory, we raise an exception.
@@ -90,6 +132,20 @@ class UrlDownloader:
         self._validate_timeout(timeout)
         self._validate_block_size(block_size)
 
+        self.blob_store = blob_store
+        self.bandwidth_limiters: List[SpectraAssureBandwidthLimiter] = []
+        if isinstance(bandwidth_limiter, SpectraAssureBandwidthLimiter):
+            self.bandwidth_limiters = [bandwidth_limiter]
+        elif bandwidth_limiter is not None:
+            self.bandwidth_limiters = list(bandwidth_limiter)
+        self.journal = journal
+        self.session = session
+        self.metrics = metrics
+
+        self.manifest: UrlDownloaderManifest | None = None
+        if with_verification_manifest is True:
+            self.manifest = manifest or UrlDownloaderManifest(target_dir=self.target_dir_posix)
+
     def _validate_block_size(self, block_size: int) -> None:
         min_block_size = 4 * 1024
         max_block_size = 2**16  # 64k
@@ -150,25 +206,25 @@ class UrlDownloader:
         self.target_dir_posix = target_dir_posix
         logger.info("set target path to: %s", self.target_dir_posix)
 
-    def _get_hex_digest(
+    def _get_hex_digests(
         self,
         *,
         file_path: str,
-    ) -> str | None:
+    ) -> Dict[str, str]:
         assert self.hash_key in ["sha1", "sha256"]
 
-        if self.hash_key == "sha1":
-            sha_sum = hashlib.sha1()
-        else:
-            sha_sum = hashlib.sha256()
+        # with a manifest we record both digests, so any later hash_key can use the entry
+        hash_keys = [self.hash_key]
+        if self.manifest is not None:
+            hash_keys = ["sha1", "sha256"]
 
         try:
-            with open(file_path, mode="rb") as f:
-                block = f.read(self.block_size)
-                while len(block) != 0:
-                    sha_sum.update(block)
-                    block = f.read(self.block_size)
-            return sha_sum.hexdigest()
+            return file_hex_digests(
+                file_path,
+                hash_keys,
+                block_size=self.block_size,
+                metrics=self.metrics,
+            )
 
         except Exception as e:  # pylint:disable=broad-exception-caught
             msg = f"cannot calculate {self.hash_key} of file: {file_path} -> {e}"
@@ -197,6 +253,8 @@ class UrlDownloader:
         url: str,
         dir_path: str,
     ) -> Tuple[str, bool]:
+        import uuid  # pylint: disable=import-outside-toplevel
+
         uuid_name = uuid.uuid5(
             uuid.NAMESPACE_URL,
             url,
@@ -214,14 +272,17 @@ class UrlDownloader:
         *,
         file_path: str,
         hashes: Dict[str, str],
-    ) -> None:
+        manifest_file_name: str | None = None,
+    ) -> Dict[str, str]:
         """
         Args:
          - file_path: str,
          - hashes: Dict[str, str],
+         - manifest_file_name: str | None,
+            If given and a manifest is used, an unchanged file recorded in the manifest is not hashed again.
 
         Return:
-           None if successful.
+           The digests of the file if successful.
 
         Raises:
          - UrlDownloaderUnknownHashKey: if we cannot find the proper key we support
@@ -234,7 +295,16 @@ class UrlDownloader:
             logger.exception(msg)
             raise UrlDownloaderUnknownHashKey(message=msg)
 
-        my_hex_digest = self._get_hex_digest(file_path=file_path)
+        if self.manifest is not None and manifest_file_name is not None:
+            known_digests = self.manifest.get_verified_digests(manifest_file_name)
+            if known_digests is not None and known_digests.get(self.hash_key) == digest:
+                logger.info("verify of '%s' ok from manifest: '%s:%s'", file_path, self.hash_key, digest)
+                self._count_cache("verification_manifest", hit=True)
+                return known_digests
+            self._count_cache("verification_manifest", hit=False)
+
+        my_digests = self._get_hex_digests(file_path=file_path)
+        my_hex_digest = my_digests[self.hash_key]
 
         if digest != my_hex_digest:
             msg = f"verify of '{file_path}' fails, expected: '{self.hash_key}:{digest}' but got: '{my_hex_digest}'"
@@ -243,6 +313,20 @@ class UrlDownloader:
 
         logger.info("verify of '%s' ok: '%s:%s'", file_path, self.hash_key, digest)
 
+        if self.manifest is not None and manifest_file_name is not None:
+            self.manifest.record(manifest_file_name, my_digests)
+
+        return my_digests
+
+    def _count_cache(
+        self,
+        cache: str,
+        *,
+        hit: bool,
+    ) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("cache_hits" if hit else "cache_misses", cache=cache)
+
     @staticmethod
     def _remove_temp_file_if_exists(file_path: str) -> None:
         fp = Path(file_path)
@@ -255,7 +339,7 @@ class UrlDownloader:
         download_url: str,
         file_path: str,
         hashes: Dict[str, str],
-    ) -> None:
+    ) -> Dict[str, str] | None:
         """
         Args:
          - download_url: str;    The actual URL from which the file will be downloaded. Valid for a short interval only
@@ -263,7 +347,7 @@ class UrlDownloader:
          - hashes: Dict[str, str]; The current dict of hashes (sha1 and sha256 are supported for verification)
 
         Return:
-            None if successful.
+            The digests of the downloaded file if it was verified, otherwise None.
 
         Raises:
             Whatever the GET request raises on HTTPS errors
@@ -271,15 +355,23 @@ class UrlDownloader:
         Notes:
         """
         try:
-            response = requests.get(
+            getter = self.session.get if self.session is not None else requests.get
+            response = getter(
                 download_url,
                 stream=True,
                 timeout=self.timeout,
             )
+            if self.metrics is not None:
+                self.metrics.inc("requests", action="download", status=str(response.status_code))
+            response.raise_for_status()  # an expired or rejected URL must not end up as file content
             with open(file_path, mode="wb") as file:
                 for chunk in response.iter_content(chunk_size=self.chunk_size):
                     file.write(chunk)
+                    if len(self.bandwidth_limiters) > 0:
+                        consume_all(self.bandwidth_limiters, len(chunk))
                 logger.info("file downloaded: %s, size: %d", file_path, file.tell())
+                if self.metrics is not None:
+                    self.metrics.inc("download_bytes", file.tell())
 
         except Exception as e:  # pylint:disable=broad-exception-caught
             msg = f"cannot download to {file_path}; {e}"
@@ -288,11 +380,13 @@ class UrlDownloader:
             raise e
 
         if self.with_verify_after_download is True:
-            self._verify_existing_file(  # raises error on verify fail
+            return self._verify_existing_file(  # raises error on verify fail
                 file_path=file_path,
                 hashes=hashes,
             )
 
+        return None
+
     def _check_target_path(
         self,
         *,
@@ -340,6 +434,7 @@ class UrlDownloader:
             self._verify_existing_file(  # raises error if verify fails
                 file_path=target_file_path,
                 hashes=hashes,
+                manifest_file_name=target_file_name,
             )
             logger.info("Skip download of %s - verification passed", target_file_name)
 
@@ -458,6 +553,9 @@ class UrlDownloader:
             logger.exception(msg)
             raise UrlDownloaderTargetFileIssue(msg)
 
+        return self._sanitize_target_file_name(target_file_name)
+
+    def _sanitize_target_file_name(self, target_file_name: str) -> str:
         target_file_name_posix = self._simple_path_to_posix(target_file_name)
         if "/" in target_file_name_posix:
             target_file_name_posix = os.path.basename(target_file_name_posix)
@@ -471,11 +569,97 @@ class UrlDownloader:
 
     # PUBLIC
 
+    def check_target_file(
+        self,
+        *,
+        target_file_name: str,
+        hashes: Dict[str, str],
+    ) -> Tuple[bool, str]:
+        """
+        Action:
+            Decide, without a download URL, if the named file must be transferred
+            or can be skipped as it already exists in the target directory (and verifies if requested).
+
+        Args:
+         - target_file_name: str; The file name (not the file path), e.g. from the status response
+         - hashes: Dict[str, str]; A dict with hashes for sha1 or sha256 (key is 'sha1' or 'sha256')
+
+        Return: Tuple[must_transfer: bool, file_path: str]
+            If must_transfer is False, the target already exists and validates ok (if requested),
+            we report the existing file path.
+            If must_transfer is True, we report the path the file would be downloaded to.
+
+        Raises:
+         - UrlDownloaderUnknownHashKey:
+            If we cannot find the 'hash_key' specified during __init__().
+         - UrlDownloaderFileVerifyIssue:
+            If the existing file does not verify.
+        """
+        self._validate_hashes(hashes)
+
+        return self._check_target_path(
+            target_file_name=self._sanitize_target_file_name(target_file_name),
+            hashes=hashes,
+        )
+
+    def link_from_blob_store(
+        self,
+        *,
+        target_file_name: str,
+        hashes: Dict[str, str],
+    ) -> Tuple[bool, str]:
+        """
+        Action:
+            If the blob store has the file with the sha256 from 'hashes',
+            place it in the target directory without downloading it.
+
+        Args:
+         - target_file_name: str; The file name (not the file path)
+         - hashes: Dict[str, str]; A dict with hashes, 'sha256' is needed to find the blob
+
+        Return: Tuple[linked: bool, file_path: str]
+            If linked is False there is no blob store or no blob for this file,
+            and the file must be downloaded.
+
+        Notes:
+            Call this only after check_target_file() decided the file must be transferred,
+            an existing target file is replaced.
+        """
+        target_file_path = f"{self.target_dir_posix}/{self._sanitize_target_file_name(target_file_name)}"
+
+        sha256 = hashes.get("sha256")
+        if self.blob_store is None or sha256 is None:
+            return False, target_file_path
+
+        if not self.blob_store.has_blob(sha256):
+            self._count_cache("blob_store", hit=False)
+            return False, target_file_path
+        self._count_cache("blob_store", hit=True)
+
+        self.blob_store.link_to(sha256=sha256, target_path=target_file_path)
+
+        if self.manifest is not None:
+            digests = {k: v for k, v in hashes.items() if k in ["sha1", "sha256"]}
+            self.manifest.record(self._sanitize_target_file_name(target_file_name), digests)
+
+        return True, os.path.realpath(target_file_path)
+
+    def _journal_renamed(
+        self,
+        journal_key: str | None,
+        target_file_path: str,
+    ) -> None:
+        if self.journal is None or journal_key is None:
+            return
+
+        self.journal.record_renamed(journal_key, target_file_path)
+
     def download_file_from_url(
         self,
         *,
         download_url: str,
         hashes: Dict[str, str],
+        journal_key: str | None = None,
     ) -> Tuple[bool, str]:
         """
         Action:
@@ -486,6 +670,7 @@ class UrlDownloader:
         Args:
          - download_url: str; The download URL
          - hashes: Dict[str, str]; A dict with hashes for sha1 or sha256 (key is 'sha1' or 'sha256')
+         - journal_key: str | None; The key of this artifact in the journal, if a journal is used
 
         Return: Tuple[downloaded: bool, file_path: str]
             If downloaded is False, we skipped the download as the target already exist and validates ok,
@@ -518,6 +703,7 @@ class UrlDownloader:
             hashes=hashes,
         )
         if shall_we_process is False:  # skip this file
+            self._journal_renamed(journal_key, target_file_path)
             return False, target_file_path
 
         # now we have a full path to the actual target file,
@@ -528,16 +714,27 @@ class UrlDownloader:
             download_url=download_url,
         )
 
-        self._download_with_optional_verify(  # raises error on download or verify fail
+        digests = self._download_with_optional_verify(  # raises error on download or verify fail
             download_url=download_url,
             file_path=temp_file_path,
             hashes=hashes,
         )
+        if self.journal is not None and journal_key is not None and digests is not None:
+            self.journal.record(journal_key, "verified", hashes=digests)
 
         self._rename_temp_file_to_target(  # raises error if rename fails
             file_path=temp_file_path,
             target_path=target_file_path,
         )
+        self._journal_renamed(journal_key, target_file_path)
+
+        if self.manifest is not None and digests is not None:
+            # the rename keeps size, mtime and inode, so the digests of the temp file apply
+            self.manifest.record(target_file_name, digests)
+
+        if self.blob_store is not None and digests is not None and hashes.get("sha256"):
+            # only verified files go into the store
+            self.blob_store.adopt(file_path=target_file_path, sha256=hashes["sha256"])
         target_file_path = os.path.realpath(target_file_path)
 
         return True, target_file_path
@@ -0,0 +1,243 @@
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import (
+    List,
+)
+
+from .downloader_exceptions import (
+    UrlDownloaderTargetDirectoryIssue,
+    UrlDownloaderTargetFileIssue,
+)
+from .hashing import file_hex_digests
+
+logger = logging.getLogger(__name__)
+
+
+def _temp_id() -> str:
+    # uuid is imported on first use, it is not needed to import the SDK
+    import uuid  # pylint: disable=import-outside-toplevel
+
+    return str(uuid.uuid4())
+
+
+SUPPORTED_LINK_MODES: List[str] = [
+    "hardlink",  # default
+    "reflink",
+    "copy",
+]
+
+FICLONE = 0x40049409  # linux ioctl: clone a file (reflink) on btrfs, xfs, ...
+
+
+class UrlDownloaderBlobStore:
+
+    def __init__(
+        self,
+        *,
+        store_dir: str,
+        link_mode: str = "hardlink",
+    ) -> None:
+        """
+        Actions:
+            Initialize a content addressable blob store.
+
+        Args:
+         - store_dir: str, mandatory;
+            The root of the blob store; the directory MUST exist.
+            Blobs are stored once as: '<store_dir>/<sha256[:2]>/<sha256>'.
+
+         - link_mode: str, default "hardlink", optional;
+            How per-package views are created from a blob:
+             - hardlink: the view and the blob share the same inode (same file system only),
+             - reflink: a copy-on-write clone (linux, on file systems that support it),
+             - copy: a plain copy.
+            If a hardlink or reflink cannot be made, we fall back to a plain copy.
+
+        Raises:
+         - UrlDownloaderTargetDirectoryIssue:
+            If the store directory does not exist or is not a directory,
+            or the link mode is not supported.
+
+        Notes:
+            Only verified files are added to the store, with their size and mtime in '<blob>.stat'.
+            A blob is only linked while its size and mtime are unchanged, otherwise it is dropped and downloaded again;
+            a blob without '.stat' (from an older store) is hashed once.
+            With hardlinks, modifying a view in place also modifies the blob (which is then no longer used)
+            and all other views.
+        """
+        store_dir_posix = store_dir.replace("\\", "/")
+        if not Path(store_dir_posix).is_dir():
+            msg = f"the specified blob store path does not exist or is not a directory; {store_dir_posix}"
+            logger.error(msg)
+            raise UrlDownloaderTargetDirectoryIssue(msg)
+
+        if link_mode not in SUPPORTED_LINK_MODES:
+            msg = f"the link mode you provided is not supported; it must be one of {SUPPORTED_LINK_MODES}"
+            logger.error(msg)
+            raise UrlDownloaderTargetDirectoryIssue(msg)
+
+        self.store_dir_posix = store_dir_posix
+        self.link_mode = link_mode
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _validate_sha256(sha256: str) -> str:
+        sha256 = sha256.lower()
+        if len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256):
+            msg = f"not a valid sha256 digest: {sha256}"
+            raise UrlDownloaderTargetFileIssue(msg)
+        return sha256
+
+    @staticmethod
+    def _reflink(source_path: str, target_path: str) -> None:
+        import fcntl  # pylint: disable=import-outside-toplevel; not available on windows
+
+        with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+    def _place(
+        self,
+        *,
+        source_path: str,
+        target_path: str,
+        link_mode: str,
+    ) -> None:
+        """link or copy source_path to target_path, target_path must not exist"""
+        try:
+            if link_mode == "hardlink":
+                os.link(source_path, target_path)
+                return
+
+            if link_mode == "reflink":
+                self._reflink(source_path, target_path)
+                return
+
+        except (OSError, ImportError) as e:
+            # e.g. EXDEV for a hardlink across file systems, EOPNOTSUPP for a reflink
+            logger.info("cannot %s %s -> %s, falling back to copy; %s", link_mode, source_path, target_path, e)
+            Path(target_path).unlink(missing_ok=True)
+
+        shutil.copyfile(source_path, target_path)
+
+    @staticmethod
+    def _stat_line(path: str) -> str:
+        st = os.stat(path)
+        return f"{st.st_size} {st.st_mtime_ns}"
+
+    def _write_stat(self, blob_path: str) -> None:
+        with open(f"{blob_path}.stat", "w", encoding="utf-8") as f:
+            f.write(self._stat_line(blob_path))
+
+    def _is_intact(
+        self,
+        sha256: str,
+    ) -> bool:
+        # the blob exists and is unchanged since it was added; a changed blob is removed from the store
+        blob_path = self.blob_path(sha256)
+        try:
+            current = self._stat_line(blob_path)
+        except OSError:
+            return False
+
+        try:
+            with open(f"{blob_path}.stat", "r", encoding="utf-8") as f:
+                intact = f.read().strip() == current
+        except FileNotFoundError:
+            # added by an older version of the store: hash it once
+            intact = file_hex_digests(blob_path, ["sha256"])["sha256"] == sha256
+            if intact:
+                self._write_stat(blob_path)
+
+        if not intact:
+            # e.g. a hardlinked view that was modified in place
+            logger.warning("blob modified after it was added, removing it from the store: %s", blob_path)
+            for path in [blob_path, f"{blob_path}.stat"]:
+                Path(path).unlink(missing_ok=True)
+        return intact
+
+    # PUBLIC
+
+    def blob_path(
+        self,
+        sha256: str,
+    ) -> str:
+        sha256 = self._validate_sha256(sha256)
+        return f"{self.store_dir_posix}/{sha256[:2]}/{sha256}"
+
+    def has_blob(
+        self,
+        sha256: str,
+    ) -> bool:
+        """Return True if the store has the blob and it is unchanged since it was added."""
+        return self._is_intact(sha256)
+
+    def link_to(
+        self,
+        *,
+        sha256: str,
+        target_path: str,
+    ) -> None:
+        """
+        Action:
+            Create (or replace) 'target_path' as a view of the blob with this sha256.
+
+        Raises:
+            UrlDownloaderTargetFileIssue: if the blob does not exist or was modified after it was added.
+            OSError: if the view cannot be created.
+
+        Notes:
+            The view is created under a temp name in the target directory and renamed into place,
+            so a reader never sees a partial file.
+        """
+        blob_path = self.blob_path(sha256)
+        if not self._is_intact(sha256):
+            msg = f"no (unmodified) blob in the store for sha256: {sha256}"
+            raise UrlDownloaderTargetFileIssue(msg)
+
+        temp_path = f"{os.path.dirname(target_path) or '.'}/.{_temp_id()}.tmp"
+        try:
+            self._place(source_path=blob_path, target_path=temp_path, link_mode=self.link_mode)
+            os.replace(temp_path, target_path)
+        except Exception as e:
+            Path(temp_path).unlink(missing_ok=True)
+            raise e
+
+        logger.info("%s from blob store: %s -> %s", self.link_mode, blob_path, target_path)
+
+    def adopt(
+        self,
+        *,
+        file_path: str,
+        sha256: str,
+    ) -> None:
+        """
+        Action:
+            Add a verified file to the store if no blob with this sha256 exists yet.
+
+        Notes:
+            With 'hardlink' the blob shares the inode with 'file_path', so no data is copied;
+            with 'reflink' the blob shares the data blocks until one of them is modified.
+            Otherwise the file is copied into the store.
+        """
+        blob_path = self.blob_path(sha256)
+
+        with self._lock:
+            if Path(blob_path).is_file():
+                return
+
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            temp_path = f"{os.path.dirname(blob_path)}/.{_temp_id()}.tmp"
+            try:
+                self._place(source_path=file_path, target_path=temp_path, link_mode=self.link_mode)
+                os.replace(temp_path, blob_path)
+                self._write_stat(blob_path)
+            except Exception as e:  # pylint:disable=broad-exception-caught
+                # failing to fill the store never fails the download itself
+                Path(temp_path).unlink(missing_ok=True)
+                logger.warning("cannot add %s to the blob store; %s", file_path, e)
+                return
+
+        logger.info("added to blob store: %s -> %s", file_path, blob_path)
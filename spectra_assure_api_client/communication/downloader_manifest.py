@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import (
+    Any,
+    Dict,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = ".spectra-assure-manifest.json"
+
+
+class _SharedManifest:  # pylint: disable=too-few-public-methods
+    # the state of one manifest file, shared by all UrlDownloaderManifest instances for it in this process
+    __slots__ = ("lock", "entries", "dirty", "users")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] | None = None
+        self.dirty = 0  # records not yet saved
+        self.users = 0
+
+
+# manifest path -> its shared state, see: _acquire()
+_shared: Dict[str, _SharedManifest] = {}
+_shared_lock = threading.Lock()
+
+
+def _acquire(manifest_path: str) -> _SharedManifest:
+    with _shared_lock:
+        shared = _shared.get(manifest_path)
+        if shared is None:
+            shared = _SharedManifest()
+            _shared[manifest_path] = shared
+        shared.users += 1
+        return shared
+
+
+def _release(manifest_path: str) -> None:
+    # called when an instance is garbage collected (or at exit): save what is left, forget the last user
+    with _shared_lock:
+        shared = _shared.get(manifest_path)
+        if shared is None:
+            return
+        shared.users -= 1
+        if shared.users > 0:
+            return
+        del _shared[manifest_path]
+
+    with shared.lock:
+        if shared.dirty > 0 and shared.entries is not None:
+            _save(manifest_path, shared)
+
+
+def _read(manifest_path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return dict(data.get("files", {}))
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # pylint:disable=broad-exception-caught
+        # a broken manifest only costs us a rehash, never a wrong verification
+        logger.warning("ignoring unreadable manifest %s; %s", manifest_path, e)
+    return {}
+
+
+def _save(
+    manifest_path: str,
+    shared: _SharedManifest,
+) -> None:
+    # call with shared.lock held
+    assert shared.entries is not None
+
+    # merge with the file: another process may have recorded files since we loaded it
+    entries = _read(manifest_path)
+    entries.update(shared.entries)
+    shared.entries = entries
+
+    temp_path = f"{manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "files": entries}, f, indent=1, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, manifest_path)
+    shared.dirty = 0
+
+
+class UrlDownloaderManifest:
+
+    def __init__(
+        self,
+        *,
+        target_dir: str,
+        file_name: str = MANIFEST_FILE_NAME,
+        save_every: int = 100,
+    ) -> None:
+        """
+        Actions:
+            Initialize a verification manifest for the files in 'target_dir'.
+
+        Args:
+         - target_dir: str, mandatory;
+            The directory holding the verified files and the manifest.
+
+         - file_name: str, default: ".spectra-assure-manifest.json", optional;
+            The name of the manifest file in the target directory.
+
+         - save_every: int, default 100, optional;
+            Save the manifest after this many records, or after half as many records as it holds if that is more
+            (so a long run rewrites it O(log n) times, not once per file); flush() saves the rest.
+
+        Notes:
+            The manifest maps a file name to the stat tuple (size, mtime_ns, inode)
+            seen when the file was last hashed, together with its sha1 and sha256.
+            As long as the stat tuple is unchanged, the recorded digests are trusted
+            and the file is not hashed again.
+
+            The manifest is always replaced atomically (write to a temp file and rename),
+            so an interrupted run never leaves a partial manifest behind;
+            records not yet saved only cost a rehash on the next run.
+            Saving merges with the file on disk, so concurrent processes do not drop each other's records.
+
+            All instances for the same manifest file in a process share their entries and lock,
+            so concurrent downloads into one directory never lose each other's records.
+            What is left is saved by flush(), or when the last instance is garbage collected or at exit.
+        """
+        self.target_dir = target_dir
+        self.manifest_path = os.path.realpath(f"{target_dir}/{file_name}")
+        self.save_every = max(1, save_every)
+
+        self._shared = _acquire(self.manifest_path)
+        weakref.finalize(self, _release, self.manifest_path)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        # call with self._shared.lock held
+        if self._shared.entries is None:
+            self._shared.entries = _read(self.manifest_path)
+        return self._shared.entries
+
+    @staticmethod
+    def _stat_tuple(file_path: str) -> Dict[str, int] | None:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+
+        return {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "inode": st.st_ino,
+        }
+
+    # PUBLIC
+
+    def get_verified_digests(
+        self,
+        file_name: str,
+    ) -> Dict[str, str] | None:
+        """
+        Return:
+            The recorded digests for 'file_name' if the file is unchanged since it was hashed,
+            otherwise None.
+        """
+        current = self._stat_tuple(f"{self.target_dir}/{file_name}")
+        if current is None:
+            return None
+
+        with self._shared.lock:
+            entry = self._load().get(file_name)
+
+        if entry is None:
+            return None
+
+        for k, v in current.items():
+            if entry.get(k) != v:
+                logger.debug("manifest entry for %s is stale: %s changed", file_name, k)
+                return None
+
+        return {k: str(entry[k]) for k in ["sha1", "sha256"] if k in entry}
+
+    def record(
+        self,
+        file_name: str,
+        digests: Dict[str, str],
+    ) -> None:
+        """
+        Action:
+            Record the current stat tuple and the digests of 'file_name';
+            the manifest is saved every 'save_every' records and by flush().
+        """
+        current = self._stat_tuple(f"{self.target_dir}/{file_name}")
+        if current is None:
+            return
+
+        entry: Dict[str, Any] = dict(current)
+        for k in ["sha1", "sha256"]:
+            if k in digests:
+                entry[k] = digests[k]
+
+        with self._shared.lock:
+            entries = self._load()
+            entries[file_name] = entry
+            self._shared.dirty += 1
+            if self._shared.dirty >= max(self.save_every, len(entries) // 2):
+                _save(self.manifest_path, self._shared)
+
+        logger.debug("manifest updated for %s", file_name)
+
+    def flush(self) -> None:
+        """Save the records of all instances for this manifest file, if any are not saved yet."""
+        with self._shared.lock:
+            if self._shared.dirty > 0:
+                _save(self.manifest_path, self._shared)
@@ -38,3 +38,17 @@ class SpectraAssureUnsupportedStrategy(SpectraAssureExceptions):
 
     def __init__(self, message: str = "Attempted strategy is not supported"):
         super().__init__(message)
+
+
+class SpectraAssureScanJobFailed(SpectraAssureExceptions):
+    """A custom exception class for Spectra Assure Api."""
+
+    def __init__(self, message: str = "The scan job did not finish successfully"):
+        super().__init__(message)
+
+
+class SpectraAssureCassetteMiss(SpectraAssureExceptions):
+    """A custom exception class for Spectra Assure Api."""
+
+    def __init__(self, message: str = "The cassette has no recorded interaction for this request"):
+        super().__init__(message)
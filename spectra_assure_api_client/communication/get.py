@@ -35,10 +35,11 @@ class SpectraAssureApiGet(
             payload=payload,
             headers=headers,
             url_params=url_params,
-            request_callable=requests.get,
+            request_callable=self.session.get,
         )
 
-        logger.debug("Proxies: %s", self.proxies)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Proxies: %s", self._redact(self.proxies))
         return self.execute_with_retry(
             auto_adapt_to_throttle=auto_adapt_to_throttle or self.auto_adapt_to_throttle,
             executor=executor,
@@ -53,8 +54,9 @@ class SpectraAssureApiGet(
         auto_adapt_to_throttle: bool = False,
         **qp: Any,
     ) -> requests.Response:
-        logger.debug("URL: %s", url)
-        logger.debug("QUERY PARAMS: %s", qp)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("URL: %s", url)
+            logger.debug("QUERY PARAMS: %s", qp)
 
         response = self._get_with_retry(
             url=url,
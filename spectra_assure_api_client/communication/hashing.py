@@ -0,0 +1,101 @@
+import hashlib
+import logging
+import mmap
+import os
+import time
+from typing import (
+    Dict,
+    List,
+)
+
+from .metrics import SpectraAssureMetrics
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_HASH_KEYS: List[str] = [
+    "sha1",
+    "sha256",
+]
+
+
+def file_hex_digests(
+    file_path: str,
+    hash_keys: List[str],
+    *,
+    block_size: int = 2**20,  # 1MByte
+    mmap_threshold: int = 2**26,  # 64MByte
+    metrics: SpectraAssureMetrics | None = None,
+) -> Dict[str, str]:
+    """
+    Action:
+        Calculate the hex digests of a file for all requested hash keys in a single pass.
+
+    Args:
+     - file_path: str, mandatory.
+     - hash_keys: List[str], mandatory; each must be one of SUPPORTED_HASH_KEYS.
+     - block_size: int, default 1M, optional;
+        The read size when the file is read in blocks.
+     - mmap_threshold: int, default 64M, optional;
+        Files of this size and larger are mapped into memory when more than one digest is requested.
+     - metrics: SpectraAssureMetrics | None, default None, optional;
+        Count the bytes and seconds hashed (hash_bytes, hash_seconds).
+
+    Return:
+        A dict hash_key -> hex digest.
+
+    Raises:
+        OSError if the file cannot be read.
+
+    Notes:
+        hashlib releases the GIL while hashing larger buffers,
+        so this function can be used from a thread pool to hash several files in parallel.
+
+        With a single hash key, hashlib.file_digest() is used when available (python >= 3.11).
+        Otherwise, large files are memory mapped and fed to all hashes without copying,
+        small files are read in blocks.
+    """
+    for k in hash_keys:
+        assert k in SUPPORTED_HASH_KEYS, f"unsupported hash key: {k}"
+
+    start = time.perf_counter()
+    result = _file_hex_digests(file_path, hash_keys, block_size=block_size, mmap_threshold=mmap_threshold)
+
+    if metrics is not None:
+        label = ",".join(sorted(hash_keys))
+        metrics.inc("hash_bytes", os.path.getsize(file_path), hash_keys=label)
+        metrics.inc("hash_seconds", time.perf_counter() - start, hash_keys=label)
+
+    return result
+
+
+def _file_hex_digests(
+    file_path: str,
+    hash_keys: List[str],
+    *,
+    block_size: int,
+    mmap_threshold: int,
+) -> Dict[str, str]:
+    if len(hash_keys) == 1 and hasattr(hashlib, "file_digest"):
+        with open(file_path, mode="rb") as f:
+            return {hash_keys[0]: hashlib.file_digest(f, hash_keys[0]).hexdigest()}
+
+    sha_sums = {k: hashlib.new(k) for k in hash_keys}
+
+    with open(file_path, mode="rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for sha_sum in sha_sums.values():
+                        sha_sum.update(view)
+                finally:
+                    view.release()
+        else:
+            block = f.read(block_size)
+            while len(block) != 0:
+                for sha_sum in sha_sums.values():
+                    sha_sum.update(block)
+                block = f.read(block_size)
+
+    return {k: sha_sum.hexdigest() for k, sha_sum in sha_sums.items()}
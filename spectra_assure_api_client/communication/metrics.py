@@ -0,0 +1,350 @@
+import bisect
+import logging
+import math
+import os
+import threading
+import urllib.parse
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+METRIC_TYPES: List[str] = ["counter", "gauge", "histogram"]
+TEXT_FORMATS: List[str] = ["openmetrics", "prometheus"]
+
+DEFAULT_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0]
+
+# name -> (type, help); the names get the prefix of the registry
+SDK_METRICS: Dict[str, Tuple[str, str]] = {
+    "requests": ("counter", "Requests sent to the Portal API, by action and response status."),
+    "request_duration_seconds": ("histogram", "Duration of Portal API requests until the response body is read."),
+    "request_phase_seconds": ("histogram", "Duration of the phases of requests, with a SpectraAssureTimingAdapter."),
+    "retries": ("counter", "Requests retried after a throttle response."),
+    "throttle_events": ("counter", "Throttle (429) responses received."),
+    "throttle_seconds_slept": ("counter", "Seconds requests waited for the rate governor."),
+    "bandwidth_seconds_slept": ("counter", "Seconds transfers waited for the bandwidth limiter of the client."),
+    "bandwidth_limit_bytes_per_second": ("gauge", "The bandwidth limit of the client, 0 is unlimited."),
+    "upload_bytes": ("counter", "Bytes of files uploaded with scan."),
+    "download_bytes": ("counter", "Bytes of files downloaded."),
+    "hash_bytes": ("counter", "Bytes hashed to verify files, by hash keys."),
+    "hash_seconds": ("counter", "Seconds spent hashing files, by hash keys."),
+    "cache_hits": ("counter", "Cache hits, by cache."),
+    "cache_misses": ("counter", "Cache misses, by cache."),
+    "pool_connections_in_use": ("gauge", "HTTP connections currently checked out of the connection pools."),
+    "pool_connections_max": ("gauge", "The maximal number of connections kept per pool."),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]  # (name without prefix, labels, value)
+
+
+def action_from_url(url: str) -> str:
+    """Return the action of a Portal API url, e.g. 'status' for .../api/public/v1/status/org/group/pkg:rl/..."""
+    path = urllib.parse.urlsplit(url).path
+    k = "/api/public/"
+    i = path.find(k)
+    if i < 0:
+        return "download"  # the signed download URLs are not on the API
+    parts = path[i + len(k) :].split("/")
+    return parts[1] if len(parts) > 1 else "unknown"
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * (n_buckets + 1)  # the last one is +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+class SpectraAssureMetrics:
+
+    def __init__(
+        self,
+        *,
+        prefix: str = "spectra_assure",
+        buckets: List[float] | None = None,
+    ) -> None:
+        """
+        Action:
+            Initialize a registry of counters, gauges and histograms.
+
+        Args:
+         - prefix: str, default 'spectra_assure', optional;
+            The prefix of all metric names.
+
+         - buckets: List[float] | None, default None, optional;
+            The upper bounds of the histogram buckets, by default DEFAULT_BUCKETS (seconds).
+
+        Notes:
+            The registry is safe to use from multiple threads.
+            The client feeds the SDK_METRICS, see: SpectraAssureApiCore.
+            render() returns the OpenMetrics (or Prometheus) text,
+            export() writes it atomically to a file (e.g. for the textfile collector of the node-exporter)
+            and/or passes it to a callback; start_exporter() does that periodically in the background.
+        """
+        self.prefix = prefix
+        self.buckets = sorted(buckets or DEFAULT_BUCKETS)
+
+        self._lock = threading.Lock()
+        self._types: Dict[str, Tuple[str, str]] = {}
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._collectors: List[Callable[[], List[Sample]]] = []
+
+        self._exporter: threading.Thread | None = None
+        self._exporter_stop = threading.Event()
+
+        for name, (metric_type, help_text) in SDK_METRICS.items():
+            self.describe(name, metric_type=metric_type, help_text=help_text)
+
+    @staticmethod
+    def _label_key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(
+        self,
+        name: str,
+        *,
+        metric_type: str,
+        help_text: str = "",
+    ) -> None:
+        """Declare a metric, so it can be used with inc(), set() or observe()."""
+        assert metric_type in METRIC_TYPES, f"unsupported metric type: {metric_type}"
+        with self._lock:
+            self._types[name] = (metric_type, help_text)
+
+    def _check(self, name: str, metric_type: str) -> None:
+        t = self._types.get(name)
+        assert t is not None and t[0] == metric_type, f"{name} is not a declared {metric_type}"
+
+    def inc(
+        self,
+        name: str,
+        value: float = 1.0,
+        **labels: str,
+    ) -> None:
+        """Add 'value' to a counter."""
+        self._check(name, "counter")
+        key = self._label_key(labels)
+        with self._lock:
+            values = self._values.setdefault(name, {})
+            values[key] = values.get(key, 0.0) + value
+
+    def set(
+        self,
+        name: str,
+        value: float,
+        **labels: str,
+    ) -> None:
+        """Set a gauge to 'value'."""
+        self._check(name, "gauge")
+        key = self._label_key(labels)
+        with self._lock:
+            self._values.setdefault(name, {})[key] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        **labels: str,
+    ) -> None:
+        """Add one observation to a histogram."""
+        self._check(name, "histogram")
+        key = self._label_key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histograms = self._histograms.setdefault(name, {})
+            h = histograms.get(key)
+            if h is None:
+                h = _Histogram(len(self.buckets))
+                histograms[key] = h
+            h.counts[i] += 1
+            h.total += value
+            h.count += 1
+
+    def add_collector(
+        self,
+        collector: Callable[[], List[Sample]],
+    ) -> None:
+        """
+        Register a function that is called by render() and returns samples: (name, labels, value),
+        e.g. for values that are already counted elsewhere or are only known at the time of rendering.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def get(
+        self,
+        name: str,
+        **labels: str,
+    ) -> float:
+        """Return the current value of a counter or gauge (the count of a histogram), 0 if never set."""
+        key = self._label_key(labels)
+        with self._lock:
+            if name in self._histograms:
+                h = self._histograms[name].get(key)
+                return float(h.count) if h is not None else 0.0
+            return self._values.get(name, {}).get(key, 0.0)
+
+    # RENDERING
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value == int(value):
+            return str(int(value))
+        return repr(value)
+
+    @staticmethod
+    def _format_labels(key: LabelKey) -> str:
+        if len(key) == 0:
+            return ""
+        escaped = [(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in key]
+        return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+    def _collect(
+        self,
+    ) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, Dict[LabelKey, float]], Dict[str, Dict[LabelKey, _Histogram]]]:
+        with self._lock:
+            types = dict(self._types)
+            collectors = list(self._collectors)
+            values = {name: dict(v) for name, v in self._values.items()}
+            histograms = {name: dict(h) for name, h in self._histograms.items()}
+
+        for collector in collectors:
+            try:
+                samples = collector()
+            except Exception as e:  # pylint:disable=broad-exception-caught
+                logger.exception("metrics collector failed: %s", e)
+                continue
+            for name, labels, value in samples:
+                key = self._label_key(labels)
+                values.setdefault(name, {})[key] = values.get(name, {}).get(key, 0.0) + value
+
+        return types, values, histograms
+
+    def render(
+        self,
+        *,
+        text_format: str = "openmetrics",
+    ) -> str:
+        """
+        Return all metrics as text: 'openmetrics' (ends with '# EOF')
+        or 'prometheus' (the text format 0.0.4, e.g. for the node-exporter textfile collector).
+        """
+        assert text_format in TEXT_FORMATS, f"unsupported text format: {text_format}"
+        types, values, histograms = self._collect()
+        openmetrics = text_format == "openmetrics"
+
+        lines: List[str] = []
+        for name, (metric_type, help_text) in sorted(types.items()):
+            family = f"{self.prefix}_{name}"
+            if metric_type == "histogram":
+                if name not in histograms:
+                    continue
+            elif name not in values:
+                continue
+
+            # in openmetrics the family of a counter has no '_total', in the prometheus format it has
+            type_name = family if openmetrics or metric_type != "counter" else f"{family}_total"
+            if help_text:
+                lines.append(f"# HELP {type_name} {help_text}")
+            lines.append(f"# TYPE {type_name} {metric_type}")
+
+            if metric_type == "histogram":
+                for key, h in sorted(histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + [math.inf], h.counts):
+                        cumulative += count
+                        le = self._format_value(bound) if math.isinf(bound) else repr(float(bound))
+                        lines.append(f"{family}_bucket{self._format_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{family}_count{self._format_labels(key)} {h.count}")
+                    lines.append(f"{family}_sum{self._format_labels(key)} {self._format_value(h.total)}")
+                continue
+
+            suffix = "_total" if metric_type == "counter" else ""
+            for key, value in sorted(values[name].items()):
+                lines.append(f"{family}{suffix}{self._format_labels(key)} {self._format_value(value)}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    # EXPORT
+
+    def write_textfile(
+        self,
+        file_path: str,
+        *,
+        text_format: str = "openmetrics",
+    ) -> None:
+        """Write render() to 'file_path' atomically: readers never see a partial file."""
+        text = self.render(text_format=text_format)
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def export(
+        self,
+        *,
+        textfile: str | None = None,
+        callback: Callable[[str], None] | None = None,
+        text_format: str = "openmetrics",
+    ) -> None:
+        if textfile is not None:
+            self.write_textfile(textfile, text_format=text_format)
+        if callback is not None:
+            callback(self.render(text_format=text_format))
+
+    def start_exporter(
+        self,
+        *,
+        textfile: str | None = None,
+        callback: Callable[[str], None] | None = None,
+        interval: float = 15.0,  # in seconds
+        text_format: str = "openmetrics",
+    ) -> None:
+        """
+        Action:
+            Export every 'interval' seconds in a background (daemon) thread,
+            to a textfile and/or a callback, until stop_exporter().
+
+        Notes:
+            For the node-exporter, write a '*.prom' file in the directory of its '--collector.textfile.directory'.
+        """
+        assert textfile is not None or callback is not None, "the exporter needs a textfile or a callback"
+        self.stop_exporter()
+
+        def run() -> None:
+            while True:
+                try:
+                    self.export(textfile=textfile, callback=callback, text_format=text_format)
+                except Exception as e:  # pylint:disable=broad-exception-caught
+                    logger.exception("metrics export failed: %s", e)
+                if self._exporter_stop.wait(interval):
+                    # a last export, so the final values are not lost
+                    self.export(textfile=textfile, callback=callback, text_format=text_format)
+                    return
+
+        self._exporter_stop.clear()
+        self._exporter = threading.Thread(target=run, name="spectra-assure-metrics", daemon=True)
+        self._exporter.start()
+
+    def stop_exporter(self) -> None:
+        if self._exporter is None:
+            return
+        self._exporter_stop.set()
+        self._exporter.join()
+        self._exporter = None
@@ -33,10 +33,11 @@ class SpectraAssureApiPatch(
             payload=payload,
             headers=headers,
             url_params=None,
-            request_callable=requests.patch,
+            request_callable=self.session.patch,
         )
 
-        logger.debug("Proxies: %s", self.proxies)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Proxies: %s", self._redact(self.proxies))
         return self.execute_with_retry(
             auto_adapt_to_throttle=auto_adapt_to_throttle or self.auto_adapt_to_throttle,
             executor=executor,
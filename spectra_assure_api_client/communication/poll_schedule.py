@@ -0,0 +1,113 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
+
+
+class SpectraAssurePollSchedule:
+
+    def __init__(
+        self,
+        *,
+        initial_interval: float = 1.0,  # in seconds
+        max_interval: float = 30.0,  # in seconds
+        backoff: float = 1.5,
+    ) -> None:
+        """
+        Action:
+            Initialize an adaptive poll schedule for many items at once.
+
+        Args:
+         - initial_interval: float, default 1.0, optional;
+            The delay before the second poll of a new item; the first poll is due immediately.
+
+         - max_interval: float, default 30.0, optional;
+            The delay between polls never grows beyond this value.
+
+         - backoff: float, default 1.5, optional;
+            After every poll the delay of that item is multiplied by this factor.
+
+        Notes:
+            Items are polled from one loop in the order they become due,
+            so waiting for many items costs no more wall time than waiting for the slowest one.
+            The schedule is safe to use from multiple threads.
+        """
+        self.initial_interval = max(0.1, initial_interval)
+        self.max_interval = max(self.initial_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._intervals: Dict[str, float] = {}
+        # key -> the sequence number of its current heap entry; older entries of the key are dropped lazily
+        self._current: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._intervals)
+
+    def add(
+        self,
+        key: str,
+    ) -> None:
+        with self._lock:
+            if key in self._intervals:
+                return
+            self._intervals[key] = self.initial_interval
+            self._push(key, time.monotonic())
+
+    def _push(
+        self,
+        key: str,
+        due: float,
+    ) -> None:
+        # call with self._lock held
+        seq = next(self._counter)
+        self._current[key] = seq
+        heapq.heappush(self._heap, (due, seq, key))
+
+    def remove(
+        self,
+        key: str,
+    ) -> None:
+        with self._lock:
+            self._intervals.pop(key, None)
+            self._current.pop(key, None)  # the heap entry is dropped lazily, see: next_due()
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._intervals.keys())
+
+    def next_due(self) -> Tuple[str, float] | None:
+        """
+        Return:
+            (key, seconds until due) of the earliest item, or None if the schedule is empty.
+            The item stays scheduled; call reschedule() after polling it.
+        """
+        with self._lock:
+            while self._heap:
+                due, seq, key = self._heap[0]
+                if self._current.get(key) == seq:
+                    return key, max(0.0, due - time.monotonic())
+                heapq.heappop(self._heap)  # a removed item, or an entry replaced by reschedule()
+            return None
+
+    def reschedule(
+        self,
+        key: str,
+    ) -> None:
+        """Move the item to its next poll time and grow its interval."""
+        with self._lock:
+            interval = self._intervals.get(key)
+            if interval is None:
+                return
+
+            # the current heap entry of this key becomes stale: O(log n) instead of rebuilding the heap
+            self._push(key, time.monotonic() + interval)
+            self._intervals[key] = min(self.max_interval, interval * self.backoff)
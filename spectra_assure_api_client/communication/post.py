@@ -9,10 +9,15 @@ from typing import (
 
 import requests
 
+from .bandwidth import (
+    SpectraAssureBandwidthLimiter,
+    SpectraAssureThrottledReader,
+)
 from .core import SpectraAssureApiCore
 from .exceptions import (
     SpectraAssureInvalidAction,
 )
+from .metrics import action_from_url
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,7 @@ class SpectraAssureApiPost(
         headers: Dict[str, str],
         auto_adapt_to_throttle: bool = False,
         file_path: Any | None = None,
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None,
         **qp: Any,
     ) -> requests.Response:
         max_try = 1
@@ -36,25 +42,32 @@ class SpectraAssureApiPost(
         if auto_adapt_to_throttle or self.auto_adapt_to_throttle:
             max_try = 5
 
-        logger.debug("%s", url)
-        logger.debug("%s", qp)
-        logger.debug("%s", headers)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", url)
+            logger.debug("%s", qp)
+            logger.debug("%s", self._redact(headers))
 
         while current_try < max_try:
             current_try += 1
 
+            self.rate_governor.wait()
+            start = time.perf_counter()
             if file_path:
+                # the per-transfer limit (if any) and the limit of this client both apply
+                limiters = [limiter for limiter in [bandwidth_limiter, self.bandwidth_limiter] if limiter is not None]
                 with open(file_path, "rb") as fh:
-                    response = requests.post(
+                    reader = SpectraAssureThrottledReader(file=fh, limiters=limiters)
+                    response = self.session.post(
                         url,
                         params=qp,
                         headers=headers,
                         timeout=self.timeout,
                         proxies=self.proxies,
-                        data=fh,  # payload is now a fileHandle
+                        data=reader,  # payload is now a file
                     )
+                self.metrics.inc("upload_bytes", len(reader))
             else:
-                response = requests.post(
+                response = self.session.post(
                     url,
                     params=qp,
                     headers=headers,
@@ -62,21 +75,25 @@ class SpectraAssureApiPost(
                     proxies=self.proxies,
                     json=payload,  # payload here is dict
                 )
+            self._count_request(url=url, response=response, start=start)
 
             if response.status_code != 429:
                 break
 
-            # first try for Throttle
-            if response.status_code == 429 and current_try < max_try:  # auto retry 5 times if requested
-                logger.warning(
-                    "THROTTLE: %s; %s: current try: %s",
-                    url,
-                    response.text,
-                    current_try,
-                )
-                delay_time = self._get_throttle_delay(response.text)
-                time.sleep(delay_time)
-                continue
+            if current_try >= max_try:
+                # no retry follows, so the other requests of this client are not held back
+                break
+
+            # Throttle: auto retry 5 times if requested
+            logger.warning(
+                "THROTTLE: %s; %s: current try: %s",
+                url,
+                response.text,
+                current_try,
+            )
+            delay_time = self._get_throttle_delay(response.text)
+            self.rate_governor.penalize(delay_time)
+            self.metrics.inc("retries", action=action_from_url(url))
 
         return response
 
@@ -88,6 +105,7 @@ class SpectraAssureApiPost(
         headers: Dict[str, str],
         auto_adapt_to_throttle: bool = False,
         file_path: Any | None = None,
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None,
         **qp: Any,
     ) -> requests.Response:
         response = self._post_with_retry(
@@ -96,6 +114,7 @@ class SpectraAssureApiPost(
             headers=headers,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
             file_path=file_path,
+            bandwidth_limiter=bandwidth_limiter,
             **qp,
         )
         return self._log_response_status(
@@ -134,6 +153,7 @@ class SpectraAssureApiPost(
         url: str,
         auto_adapt_to_throttle: bool,
         file_path: str | None = None,
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None,
         **qp: Any,
     ) -> requests.Response:
         logger.debug(url)
@@ -163,5 +183,6 @@ class SpectraAssureApiPost(
             payload=payload,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
             file_path=file_path,
+            bandwidth_limiter=bandwidth_limiter,
             **qp,
         )
@@ -0,0 +1,394 @@
+import atexit
+import functools
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import types
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    TypeVar,
+    cast,
+)
+
+# cProfile, pstats and tracemalloc are only imported when profiling is enabled (import time of the SDK)
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES: List[str] = ["cprofile", "tracemalloc"]
+
+ENV_PROFILE = "SPECTRA_ASSURE_PROFILE"
+ENV_PROFILE_DIR = "SPECTRA_ASSURE_PROFILE_DIR"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _ActionStats:
+    __slots__ = ("calls", "seconds", "max_seconds", "max_peak_bytes", "total_peak_bytes", "stats", "skipped")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.max_peak_bytes = 0
+        self.total_peak_bytes = 0
+        self.stats: "pstats.Stats | None" = None
+        self.skipped = 0  # calls that ran while another profiler was active, see run()
+
+
+class _Measurement:  # pylint: disable=too-few-public-methods
+    # one call of an operation; for a generator it adds up all its steps
+    __slots__ = ("elapsed", "peak", "profile", "skipped")
+
+    def __init__(self) -> None:
+        self.elapsed = 0.0
+        self.peak = 0
+        self.profile: "cProfile.Profile | None" = None
+        self.skipped = False
+
+
+class SpectraAssureProfiler:
+
+    def __init__(
+        self,
+        *,
+        modes: str | List[str] | None = None,
+        output_dir: str | None = None,
+        dump_at_exit: bool = False,
+    ) -> None:
+        """
+        Action:
+            Initialize a profiler that aggregates cProfile and/or tracemalloc statistics per operation.
+
+        Args:
+         - modes: str | List[str] | None, default None, optional;
+            'cprofile', 'tracemalloc' or both (as a list or comma separated);
+            'all' or '1' means both, None (or '') leaves the profiler disabled.
+
+         - output_dir: str | None, default None, optional;
+            Where dump() writes the results; by default '<program name>-profile' in the current directory.
+
+         - dump_at_exit: bool, default False, optional;
+            Call dump() when the program exits.
+
+        Notes:
+            Only the outermost operation of a thread is profiled,
+            e.g. download() includes the time of the list() and status() calls it makes.
+            tracemalloc is process wide: with concurrent operations the peak of one includes the allocations of the others.
+        """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._actions: Dict[str, _ActionStats] = {}
+        self._tracemalloc_users = 0
+        self._started_tracemalloc = False
+
+        self.modes: List[str] = []
+        self.output_dir = output_dir or self._default_output_dir()
+        self.enable(modes=modes)
+
+        if dump_at_exit:
+            atexit.register(self.dump)
+
+    @classmethod
+    def from_environment(
+        cls,
+        *,
+        modes: str | List[str] | None = None,
+        output_dir: str | None = None,
+    ) -> "SpectraAssureProfiler":
+        """Create a profiler from the arguments, or else from SPECTRA_ASSURE_PROFILE and SPECTRA_ASSURE_PROFILE_DIR."""
+        if modes:
+            return cls(modes=modes, output_dir=output_dir, dump_at_exit=output_dir is not None)
+
+        env_modes = os.getenv(ENV_PROFILE, "")
+        env_dir = os.getenv(ENV_PROFILE_DIR) or output_dir
+        # enabled from the environment there is nobody to call dump(), so we do it at exit
+        return cls(modes=env_modes, output_dir=env_dir, dump_at_exit=len(env_modes) > 0)
+
+    @staticmethod
+    def _default_output_dir() -> str:
+        prog_name = os.path.basename(sys.argv[0]) or "python"
+        if prog_name.lower().endswith(".py"):
+            prog_name = prog_name[:-3]
+        return f"{prog_name}-profile"
+
+    @staticmethod
+    def _parse_modes(
+        modes: str | List[str] | None,
+    ) -> List[str]:
+        if not modes:
+            return []
+        if isinstance(modes, str):
+            modes = [m.strip().lower() for m in modes.split(",") if m.strip()]
+        if any(m in ["1", "all", "true", "yes"] for m in modes):
+            return list(PROFILE_MODES)
+
+        unknown = [m for m in modes if m not in PROFILE_MODES]
+        if len(unknown) > 0:
+            logger.warning("unknown profile modes ignored: %s; supported: %s", unknown, PROFILE_MODES)
+        return [m for m in PROFILE_MODES if m in modes]
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.modes) > 0
+
+    def enable(
+        self,
+        *,
+        modes: str | List[str] | None = "all",
+    ) -> None:
+        """Start profiling the following operations, e.g. enable(modes='tracemalloc')."""
+        self.modes = self._parse_modes(modes)
+        if self.enabled:
+            logger.info("profiling operations with: %s", self.modes)
+
+    def disable(self) -> None:
+        """Stop profiling; the statistics collected so far are kept until reset()."""
+        self.modes = []
+
+    def reset(self) -> None:
+        with self._lock:
+            self._actions = {}
+
+    def _tracemalloc_start(self) -> None:
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+
+        with self._lock:
+            if self._tracemalloc_users == 0:
+                self._started_tracemalloc = not tracemalloc.is_tracing()
+                if self._started_tracemalloc:
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+            self._tracemalloc_users += 1
+
+    def _tracemalloc_stop(self) -> int:
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+
+        with self._lock:
+            _, peak = tracemalloc.get_traced_memory()
+            self._tracemalloc_users -= 1
+            if self._tracemalloc_users == 0 and self._started_tracemalloc:
+                tracemalloc.stop()
+            return int(peak)
+
+    def _step(
+        self,
+        m: _Measurement,
+        modes: List[str],
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        # run func(*args, **kwargs) and add its time, memory peak and profile to m
+        depth = getattr(self._local, "depth", 0)
+        if depth > 0:
+            return func(*args, **kwargs)
+
+        self._local.depth = depth + 1
+        profile: "cProfile.Profile | None" = None
+        if "cprofile" in modes and not m.skipped:
+            import cProfile  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+            profile = m.profile or cProfile.Profile()
+            try:
+                profile.enable()
+                m.profile = profile
+            except ValueError:
+                # only one profiler can be active at a time (python >= 3.12: per process)
+                profile = None
+                m.skipped = True
+        if "tracemalloc" in modes:
+            self._tracemalloc_start()
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            m.elapsed += time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            if "tracemalloc" in modes:
+                m.peak = max(m.peak, self._tracemalloc_stop())
+            self._local.depth = depth
+
+    def _iterate(
+        self,
+        action: str,
+        m: _Measurement,
+        modes: List[str],
+        generator: Iterator[Any],
+    ) -> Iterator[Any]:
+        # the time in the generator counts, the time of the caller between the items does not
+        try:
+            while True:
+                try:
+                    item = self._step(m, modes, next, generator)
+                except StopIteration:
+                    return
+                yield item
+        finally:
+            if isinstance(generator, types.GeneratorType):
+                generator.close()
+            self._add(action, m)
+
+    def run(
+        self,
+        action: str,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Action:
+            Run func(*args, **kwargs) and add its statistics to 'action'.
+
+        Return:
+            The return value of func; a generator is wrapped,
+            so its statistics are added once it is exhausted or closed and include all its steps.
+
+        Notes:
+            Nested operations are not profiled separately.
+        """
+        modes = self.modes
+        if len(modes) == 0 or getattr(self._local, "depth", 0) > 0:
+            return func(*args, **kwargs)
+
+        m = _Measurement()
+        try:
+            result = self._step(m, modes, func, *args, **kwargs)
+        except BaseException:
+            self._add(action, m)
+            raise
+
+        if isinstance(result, types.GeneratorType):
+            # a generator does its work when iterated, e.g. bulk() and wait_until_done()
+            return self._iterate(action, m, modes, result)
+
+        self._add(action, m)
+        return result
+
+    def _add(
+        self,
+        action: str,
+        m: _Measurement,
+    ) -> None:
+        import pstats  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        with self._lock:
+            a = self._actions.get(action)
+            if a is None:
+                a = _ActionStats()
+                self._actions[action] = a
+
+            a.calls += 1
+            a.seconds += m.elapsed
+            a.max_seconds = max(a.max_seconds, m.elapsed)
+            a.max_peak_bytes = max(a.max_peak_bytes, m.peak)
+            a.total_peak_bytes += m.peak
+            a.skipped += int(m.skipped)
+            if m.profile is not None:
+                if a.stats is None:
+                    a.stats = pstats.Stats(m.profile, stream=io.StringIO())
+                else:
+                    a.stats.add(m.profile)
+
+    # PUBLIC
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return the aggregated statistics per action: calls, seconds, and with tracemalloc the peak memory."""
+        with self._lock:
+            return {
+                action: {
+                    "calls": a.calls,
+                    "seconds": round(a.seconds, 6),
+                    "mean_seconds": round(a.seconds / a.calls, 6),
+                    "max_seconds": round(a.max_seconds, 6),
+                    "max_peak_bytes": a.max_peak_bytes,
+                    "mean_peak_bytes": a.total_peak_bytes // a.calls,
+                    "cprofile_skipped": a.skipped,
+                }
+                for action, a in sorted(self._actions.items())
+            }
+
+    def dump(
+        self,
+        *,
+        output_dir: str | None = None,
+        top: int = 40,
+    ) -> List[str]:
+        """
+        Action:
+            Write the statistics collected so far.
+
+        Args:
+         - output_dir: str | None, default None, optional;
+            By default the output_dir given at init.
+         - top: int, default 40, optional;
+            The number of functions in the text reports.
+
+        Return:
+            The paths of the files written:
+             - summary.json: the summary() of all actions;
+             - <action>.prof: the cProfile statistics, for pstats, snakeviz, flameprof or gprof2dot;
+             - <action>.txt: the top functions by cumulative time.
+        """
+        import pstats  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        summary = self.summary()
+        if len(summary) == 0:
+            return []
+
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+        path = os.path.join(output_dir, "summary.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+        paths = [path]
+
+        with self._lock:
+            for action, a in sorted(self._actions.items()):
+                if a.stats is None:
+                    continue
+
+                path = os.path.join(output_dir, f"{action}.prof")
+                a.stats.dump_stats(path)
+                paths.append(path)
+
+                path = os.path.join(output_dir, f"{action}.txt")
+                with open(path, "w", encoding="utf-8") as f:
+                    a.stats.stream = f  # type: ignore[attr-defined]
+                    a.stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+                    a.stats.stream = io.StringIO()  # type: ignore[attr-defined]
+                paths.append(path)
+
+        logger.info("profile written to: %s", output_dir)
+        return paths
+
+
+def profiled(func: F) -> F:
+    """
+    Profile the decorated operation with the profiler of its instance (if enabled), under the name of the operation.
+    An operation returning a generator is profiled over the whole iteration, see: SpectraAssureProfiler.run().
+    """
+    action = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        profiler: SpectraAssureProfiler | None = getattr(self, "profiler", None)
+        if profiler is None or not profiler.enabled:
+            return func(self, *args, **kwargs)
+        return profiler.run(action, func, self, *args, **kwargs)
+
+    return cast(F, wrapper)
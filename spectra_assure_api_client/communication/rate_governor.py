@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureRateGovernor:
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 0.0,  # in seconds
+    ) -> None:
+        """
+        Action:
+            Initialize a rate governor shared by all requests of a client.
+
+        Args:
+         - min_interval: float, default 0.0, optional;
+            The minimal time between the start of two requests.
+            With the default of 0.0 requests are only delayed after a throttle response.
+
+        Notes:
+            When the Portal throttles a request (429) and we adapt to it,
+            the required wait time is registered with penalize(),
+            so every request of this client (in any thread) waits instead of being throttled again.
+        """
+        self.min_interval = max(0.0, min_interval)
+
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._next_start = 0.0
+
+        self.seconds_slept = 0.0
+        self.throttle_events = 0
+
+    def set_min_interval(
+        self,
+        min_interval: float,
+    ) -> None:
+        with self._lock:
+            self.min_interval = max(0.0, min_interval)
+
+    def blocked_for(self) -> float:
+        """Return the seconds left before the next request may start."""
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    def penalize(
+        self,
+        delay: float,
+    ) -> None:
+        """Block all requests for 'delay' seconds from now (an existing longer block is kept)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self.throttle_events += 1
+
+        logger.info("rate governor: requests blocked for %.1f seconds", delay)
+
+    def wait(self) -> float:
+        """
+        Action:
+            Sleep until a new request may start and reserve the start slot.
+
+        Return:
+            The seconds slept.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._blocked_until, self._next_start)
+            self._next_start = start + self.min_interval
+            delay = start - now
+            self.seconds_slept += delay
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
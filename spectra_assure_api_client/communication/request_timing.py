@@ -0,0 +1,478 @@
+import collections
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import urllib.parse
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+)
+
+import requests
+import requests.adapters
+import urllib3.connection
+import urllib3.connectionpool
+import urllib3.exceptions
+import urllib3.util.connection
+
+from .metrics import (
+    SpectraAssureMetrics,
+    action_from_url,
+)
+
+logger = logging.getLogger(__name__)
+
+# in the order they happen; dns, connect and tls only on a new connection
+REQUEST_PHASES: List[str] = ["pool_wait", "dns", "connect", "tls", "send", "wait", "transfer", "json_decode"]
+
+# the timing of the request being sent by the current thread, set by SpectraAssureTimingAdapter.send()
+_current = threading.local()
+
+
+def _strip_query(url: str) -> str:
+    # the query of a signed download url holds its signature
+    u_info = urllib.parse.urlsplit(url)
+    return urllib.parse.urlunsplit((u_info.scheme, u_info.netloc, u_info.path, "", ""))
+
+
+class RequestTiming:
+    __slots__ = ("method", "url", "thread_id", "start", "end", "status", "error", "reused", "phases")
+
+    def __init__(
+        self,
+        *,
+        method: str,
+        url: str,
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.thread_id = threading.get_ident()
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.status: int | None = None
+        self.error: str | None = None
+        self.reused = True  # False if a new connection was made
+        self.phases: List[Tuple[str, float, float]] = []  # (phase, start, seconds)
+
+    def add(
+        self,
+        phase: str,
+        start: float,
+        end: float | None = None,
+    ) -> float:
+        seconds = (end if end is not None else time.perf_counter()) - start
+        self.phases.append((phase, start, seconds))
+        return seconds
+
+    def seconds(self, phase: str) -> float:
+        return sum(s for p, _, s in self.phases if p == phase)
+
+    @property
+    def total(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def as_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "method": self.method,
+            "url": _strip_query(self.url),
+            "status": self.status,
+            "error": self.error,
+            "reused_connection": self.reused,
+            "total": round(self.total, 6),
+        }
+        for phase in REQUEST_PHASES:
+            result[phase] = round(self.seconds(phase), 6)
+        return result
+
+
+def _timing() -> RequestTiming | None:
+    return getattr(_current, "timing", None)
+
+
+def _seconds_since(
+    timing: RequestTiming,
+    n_phases: int,
+) -> float:
+    # the seconds of the phases added after the first n_phases, e.g. a connect inside send
+    return sum(s for _, _, s in timing.phases[n_phases:])
+
+
+class _TimedConnectionMixin:
+    # records dns, connect, tls, send and wait of the current request; without a current timing it does nothing extra
+
+    _dns_host: str
+    port: int
+
+    def _new_conn(self) -> socket.socket:
+        timing = _timing()
+        if timing is None:
+            return super()._new_conn()  # type: ignore[misc,no-any-return]
+
+        timing.reused = False
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(
+                host.strip("[]"),
+                self.port,
+                urllib3.util.connection.allowed_gai_family(),
+                socket.SOCK_STREAM,
+            )
+        except (OSError, UnicodeError):
+            # let urllib3 resolve again and raise its own exception
+            return super()._new_conn()  # type: ignore[misc,no-any-return]
+        timing.add("dns", start)
+
+        start = time.perf_counter()
+        try:
+            # connect to the address we resolved, so the resolution is not timed as part of the connect
+            self._dns_host = str(infos[0][4][0])
+            sock: socket.socket = super()._new_conn()  # type: ignore[misc]
+        except urllib3.exceptions.NewConnectionError:
+            if len(infos) < 2:
+                raise
+            self._dns_host = host  # urllib3 tries all addresses
+            sock = super()._new_conn()  # type: ignore[misc]
+        finally:
+            self._dns_host = host
+        timing.add("connect", start)
+        return sock
+
+    def connect(self) -> None:
+        timing = _timing()
+        if timing is None:
+            super().connect()  # type: ignore[misc]
+            return
+
+        n_phases = len(timing.phases)
+        start = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        end = time.perf_counter()
+        if isinstance(self, urllib3.connection.HTTPSConnection):
+            # what is not dns or connect is the handshake (and the proxy tunnel)
+            seconds = max(0.0, end - start - _seconds_since(timing, n_phases))
+            timing.phases.append(("tls", end - seconds, seconds))
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        timing = _timing()
+        if timing is None:
+            super().request(*args, **kwargs)  # type: ignore[misc]
+            return
+
+        n_phases = len(timing.phases)
+        start = time.perf_counter()
+        super().request(*args, **kwargs)  # type: ignore[misc]
+        end = time.perf_counter()
+        # a plain http connection connects lazily inside request()
+        seconds = max(0.0, end - start - _seconds_since(timing, n_phases))
+        timing.phases.append(("send", end - seconds, seconds))
+
+    def getresponse(self) -> Any:
+        timing = _timing()
+        start = time.perf_counter()
+        response = super().getresponse()  # type: ignore[misc]
+        if timing is not None:
+            timing.add("wait", start)  # the time to the first byte (the parsed headers)
+        return response
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, urllib3.connection.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, urllib3.connection.HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+    def _get_conn(self, timeout: float | None = None) -> Any:
+        timing = _timing()
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        if timing is not None:
+            timing.add("pool_wait", start)
+        return conn
+
+
+class _TimedHTTPSConnectionPool(urllib3.connectionpool.HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+    def _get_conn(self, timeout: float | None = None) -> Any:
+        timing = _timing()
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        if timing is not None:
+            timing.add("pool_wait", start)
+        return conn
+
+
+class SpectraAssureTimingAdapter(requests.adapters.HTTPAdapter):
+
+    def __init__(
+        self,
+        *,
+        slow_request_seconds: float | None = None,
+        max_timings: int = 10000,
+        metrics: SpectraAssureMetrics | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Action:
+            Initialize a transport adapter that records the timing of every request per phase:
+            pool_wait, dns, connect, tls, send, wait (time to first byte), transfer (the body) and json_decode.
+
+        Args:
+         - slow_request_seconds: float | None, default None, optional;
+            Log a warning with the timing of every request that takes longer.
+
+         - max_timings: int, default 10000, optional;
+            Keep the timing of this many recent requests for timings(), summary() and export_chrome_trace().
+
+         - metrics: SpectraAssureMetrics | None, default None, optional;
+            Also add every phase to the 'request_phase_seconds' histogram, e.g. of api_client.metrics.
+
+         - kwargs: passed on to requests.adapters.HTTPAdapter, e.g. pool_maxsize;
+            without pool arguments install() takes the pool settings of the adapter it replaces.
+
+        Notes:
+            Use it as:
+                SpectraAssureTimingAdapter(slow_request_seconds=5).install(api_client.session)
+
+            dns, connect and tls are only seen on a new connection.
+            With stream=True (downloads) the transfer ends when the body is consumed or closed.
+            json_decode is recorded when response.json() is called, after the request is finished,
+            so it is not part of 'total' nor of the slow request log.
+        """
+        super().__init__(**kwargs)
+        self._pool_args_given = any(k in kwargs for k in ["pool_connections", "pool_maxsize", "pool_block"])
+        self.slow_request_seconds = slow_request_seconds
+        self.metrics = metrics
+
+        self._lock = threading.Lock()
+        self._epoch = time.perf_counter()
+        self._timings: Deque[RequestTiming] = collections.deque(maxlen=max_timings)
+
+    @staticmethod
+    def _use_timed_pools(manager: Any) -> None:
+        manager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self._use_timed_pools(self.poolmanager)
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+        is_new = proxy not in self.proxy_manager
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if is_new and not proxy.lower().startswith("socks"):  # socks has its own pool classes
+            self._use_timed_pools(manager)
+        return manager
+
+    def install(
+        self,
+        session: requests.Session,
+    ) -> None:
+        """Route all http and https requests of 'session' (e.g. api_client.session) through this adapter."""
+        current = session.get_adapter("https://")
+        if not self._pool_args_given and isinstance(current, requests.adapters.HTTPAdapter):
+            # keep the pool of the session (e.g. pool_maxsize=32 of the client) instead of the default of 10
+            connections = getattr(current, "_pool_connections", requests.adapters.DEFAULT_POOLSIZE)
+            maxsize = getattr(current, "_pool_maxsize", requests.adapters.DEFAULT_POOLSIZE)
+            block = getattr(current, "_pool_block", requests.adapters.DEFAULT_POOLBLOCK)
+            self.init_poolmanager(connections, maxsize, block=block)
+            self._pool_connections, self._pool_maxsize, self._pool_block = connections, maxsize, block
+            self.max_retries = current.max_retries
+
+        session.mount("https://", self)
+        session.mount("http://", self)
+
+    def send(  # pylint: disable=too-many-arguments
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: None | float | Tuple[float, float] | Tuple[float, None] = None,
+        verify: bool | str = True,
+        cert: None | bytes | str | Tuple[bytes | str, bytes | str] = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        timing = RequestTiming(method=str(request.method), url=str(request.url))
+        _current.timing = timing
+        try:
+            response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        except Exception as e:
+            timing.error = repr(e)
+            self._finish(timing)
+            raise
+        finally:
+            _current.timing = None
+
+        timing.status = response.status_code
+        self._time_json(response, timing)
+
+        if not stream:
+            start = time.perf_counter()
+            _ = response.content  # what requests would do next anyway
+            timing.add("transfer", start)
+            self._finish(timing)
+            return response
+
+        self._time_stream(response, timing)
+        return response
+
+    def _time_stream(
+        self,
+        response: requests.Response,
+        timing: RequestTiming,
+    ) -> None:
+        raw = response.raw
+        raw_stream = raw.stream
+        start = time.perf_counter()
+
+        def stream(*args: Any, **kwargs: Any) -> Iterator[bytes]:
+            try:
+                yield from raw_stream(*args, **kwargs)
+            finally:
+                timing.add("transfer", start)
+                self._finish(timing)
+
+        raw.stream = stream  # type: ignore[method-assign]
+
+    def _time_json(
+        self,
+        response: requests.Response,
+        timing: RequestTiming,
+    ) -> None:
+        response_json = response.json
+
+        def timed_json(**kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return response_json(**kwargs)
+            finally:
+                seconds = timing.add("json_decode", start)
+                if self.metrics is not None:
+                    self.metrics.observe("request_phase_seconds", seconds, phase="json_decode")
+
+        response.json = timed_json  # type: ignore[method-assign]
+
+    def _finish(
+        self,
+        timing: RequestTiming,
+    ) -> None:
+        if timing.end is not None:
+            return
+        timing.end = time.perf_counter()
+
+        with self._lock:
+            self._timings.append(timing)
+
+        if self.metrics is not None:
+            for phase, _, seconds in list(timing.phases):
+                self.metrics.observe("request_phase_seconds", seconds, phase=phase)
+
+        if self.slow_request_seconds is not None and timing.total > self.slow_request_seconds:
+            phases = ", ".join(f"{p}={timing.seconds(p):.3f}" for p in REQUEST_PHASES[:-1])
+            logger.warning(
+                "SLOW REQUEST: %.3f seconds: %s %s -> %s; %s",
+                timing.total,
+                timing.method,
+                _strip_query(timing.url),
+                timing.status if timing.error is None else timing.error,
+                phases,
+            )
+
+    # PUBLIC
+
+    def timings(self) -> List[Dict[str, Any]]:
+        """Return the timing of the recent requests (urls without query), the seconds per phase, oldest first."""
+        with self._lock:
+            timings = list(self._timings)
+        return [t.as_dict() for t in timings]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, p50, p99 and max seconds per phase (and 'total') over the recent requests."""
+        with self._lock:
+            timings = list(self._timings)
+
+        values: Dict[str, List[float]] = {p: [] for p in ["total"] + REQUEST_PHASES}
+        for t in timings:
+            values["total"].append(t.total)
+            for phase, _, seconds in t.phases:
+                values[phase].append(seconds)
+
+        result: Dict[str, Dict[str, float]] = {}
+        for phase, v in values.items():
+            if len(v) == 0:
+                continue
+            v.sort()
+            result[phase] = {
+                "count": len(v),
+                "p50": round(v[int(0.50 * (len(v) - 1))], 6),
+                "p99": round(v[int(0.99 * (len(v) - 1))], 6),
+                "max": round(v[-1], 6),
+            }
+        return result
+
+    def export_chrome_trace(
+        self,
+        file_path: str,
+    ) -> None:
+        """
+        Action:
+            Write the recent requests as a Chrome trace (JSON), one slice per request with its phases nested below,
+            to be opened in chrome://tracing or https://ui.perfetto.dev.
+        """
+        with self._lock:
+            timings = list(self._timings)
+
+        pid = os.getpid()
+
+        def us(t: float) -> float:
+            return round((t - self._epoch) * 1e6, 1)
+
+        events: List[Dict[str, Any]] = []
+        for t in timings:
+            events.append(
+                {
+                    "name": f"{t.method} {action_from_url(t.url)}",
+                    "cat": "request",
+                    "ph": "X",
+                    "ts": us(t.start),
+                    "dur": round(t.total * 1e6, 1),
+                    "pid": pid,
+                    "tid": t.thread_id,
+                    "args": {
+                        "url": _strip_query(t.url),
+                        "status": t.status,
+                        "error": t.error,
+                        "reused_connection": t.reused,
+                    },
+                }
+            )
+            for phase, start, seconds in t.phases:
+                events.append(
+                    {
+                        "name": phase,
+                        "cat": "phase",
+                        "ph": "X",
+                        "ts": us(start),
+                        "dur": round(seconds * 1e6, 1),
+                        "pid": pid,
+                        "tid": t.thread_id,
+                    }
+                )
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
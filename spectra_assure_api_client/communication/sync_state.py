@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+)
+
+logger = logging.getLogger(__name__)
+
+SYNC_STATE_FILE_NAME = ".spectra-assure-sync.jsonl"
+
+
+class SpectraAssureSyncState:
+
+    def __init__(
+        self,
+        *,
+        file_path: str,
+        compact_min_lines: int = 1000,
+    ) -> None:
+        """
+        Actions:
+            Initialize the persistent progress of a sync.
+
+        Args:
+         - file_path: str, mandatory;
+            The JSON lines file holding the progress; it is created on the first completed version.
+
+         - compact_min_lines: int, default 1000, optional;
+            When loading or closing, a state with more lines than this and more than 2 lines per version
+            is rewritten with one line per version.
+
+        Notes:
+            The state maps 'project/package@version' to the file that was downloaded (or found verified) for it.
+            A version in the state is not inspected again as long as its file still exists,
+            so a run only costs one list() per package plus the requests for new versions.
+
+            Every completed version appends one line (a single write, outside the lock),
+            so an interrupted sync resumes where it stopped; flush() syncs the file to disk.
+            A line torn by a crash is ignored when loading.
+        """
+        self.file_path = file_path
+        self.compact_min_lines = compact_min_lines
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._n_lines = 0
+        self._needs_newline = False
+        self._fd: int | None = None
+
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.file_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            # a broken state only costs us a new inspection of all versions
+            logger.warning("ignoring unreadable sync state %s; %s", self.file_path, e)
+            return
+
+        self._needs_newline = len(data) > 0 and not data.endswith(b"\n")
+        for line in data.splitlines():
+            self._n_lines += 1
+            try:
+                record = json.loads(line)
+                self._entries[record.pop("purl")] = record
+            except Exception:  # pylint:disable=broad-exception-caught
+                logger.warning("ignoring a broken line in sync state %s", self.file_path)
+
+        self._compact_if_needed()
+
+    def _compact_if_needed(self) -> None:
+        # call without writers: on load or on close
+        if self._n_lines <= self.compact_min_lines or self._n_lines <= 2 * len(self._entries):
+            return
+
+        temp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for purl, entry in self._entries.items():
+                f.write(json.dumps({"purl": purl, **entry}, sort_keys=True) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.file_path)
+
+        self._n_lines = len(self._entries)
+        self._needs_newline = False
+        logger.info("sync state compacted: %s, %d versions", self.file_path, len(self._entries))
+
+    def _open(self) -> int:
+        # call with self._lock held
+        if self._fd is None:
+            self._fd = os.open(self.file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            if self._needs_newline:
+                os.write(self._fd, b"\n")  # terminate a line torn by an earlier crash
+                self._needs_newline = False
+        return self._fd
+
+    # PUBLIC
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def is_done(
+        self,
+        purl: str,
+    ) -> bool:
+        with self._lock:
+            entry = self._entries.get(purl)
+
+        if entry is None:
+            return False
+
+        # a file removed from the mirror is downloaded again
+        return os.path.isfile(str(entry.get("file", "")))
+
+    def mark_done(
+        self,
+        purl: str,
+        *,
+        file_path: str,
+        sha256: str | None = None,
+    ) -> None:
+        entry: Dict[str, Any] = {
+            "file": file_path,
+            "sha256": sha256,
+            "time": int(time.time()),
+        }
+        line = (json.dumps({"purl": purl, **entry}, sort_keys=True) + "\n").encode("utf-8")
+
+        with self._lock:
+            self._entries[purl] = entry
+            self._n_lines += 1
+            fd = self._open()
+
+        # one write on an O_APPEND file: lines of concurrent workers never interleave
+        os.write(fd, line)
+
+    def flush(self) -> None:
+        """Sync the appended lines to disk, e.g. at the end of a run."""
+        with self._lock:
+            fd = self._fd
+        if fd is not None:
+            os.fsync(fd)
+
+    def close(self) -> None:
+        """Sync and close the file, and compact it if needed; call when no version is marked done anymore."""
+        with self._lock:
+            fd, self._fd = self._fd, None
+            if fd is not None:
+                os.fsync(fd)
+                os.close(fd)
+            self._compact_if_needed()
@@ -0,0 +1,11 @@
+from .portal_server import (
+    MOCK_ACTIONS,
+    MOCK_REPORT_TYPES,
+    SpectraAssureMockPortal,
+)
+
+__all__ = [
+    "MOCK_ACTIONS",
+    "MOCK_REPORT_TYPES",
+    "SpectraAssureMockPortal",
+]
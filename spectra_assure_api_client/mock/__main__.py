@@ -0,0 +1,67 @@
+import argparse
+import logging
+
+from .portal_server import SpectraAssureMockPortal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m spectra_assure_api_client.mock",
+        description="Run a local mock of the Spectra Assure Portal API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token", default="mock-token", help="the accepted Bearer token, '' accepts any")
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--packages", type=int, default=2, help="per project")
+    parser.add_argument("--versions", type=int, default=3, help="per package")
+    parser.add_argument("--artifact-size", type=int, default=1024, help="bytes")
+    parser.add_argument("--discard-uploads", action="store_true", help="keep only the size and hashes of uploads")
+    parser.add_argument("--analysis-seconds", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="probability of a 429")
+    parser.add_argument("--throttle-seconds", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 5xx")
+    parser.add_argument("--fault-action", action="append", default=None, help="limit faults to this action")
+    parser.add_argument("--body-bytes-per-second", type=float, default=None)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall-seconds", type=float, default=30.0)
+    parser.add_argument("--report-size", type=int, default=0, help="bytes")
+    parser.add_argument("--url-ttl", type=int, default=3600, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    portal = SpectraAssureMockPortal(
+        host=args.host,
+        port=args.port,
+        token=args.token,
+        n_projects=args.projects,
+        n_packages=args.packages,
+        n_versions=args.versions,
+        artifact_size=args.artifact_size,
+        keep_uploads=not args.discard_uploads,
+        analysis_seconds=args.analysis_seconds,
+        latency=args.latency,
+        throttle_rate=args.throttle_rate,
+        throttle_seconds=args.throttle_seconds,
+        error_rate=args.error_rate,
+        fault_actions=args.fault_action,
+        body_bytes_per_second=args.body_bytes_per_second,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.stall_seconds,
+        report_size=args.report_size,
+        url_ttl=args.url_ttl,
+        seed=args.seed,
+    )
+    print(f"use: server='local', host='{args.host}:{args.port}', organization='{portal.organization}'", end="")
+    print(f", group='{portal.group}', token='{portal.token}'")
+    try:
+        portal.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
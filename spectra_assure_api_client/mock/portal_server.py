@@ -0,0 +1,1003 @@
+import calendar
+import hashlib
+import hmac
+import http.server
+import json
+import logging
+import random
+import threading
+import time
+import urllib.parse
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/public/"
+DOWNLOAD_PREFIX = "/download/"
+BLOCK_SIZE = 2**16  # 64KByte
+
+MOCK_ACTIONS: List[str] = [
+    "list",
+    "status",
+    "checks",
+    "report",
+    "scan",
+    "create",
+    "edit",
+    "delete",
+    "download",  # the signed URL, not a Portal API action
+]
+
+MOCK_REPORT_TYPES: List[str] = [
+    "cyclonedx",
+    "rl-checks",
+    "rl-cve",
+    "rl-json",
+    "rl-uri",
+    "sarif",
+    "spdx",
+]
+
+
+class _MockVersion:
+    __slots__ = [
+        "version",
+        "size",
+        "data",
+        "seed_key",
+        "approval_status",
+        "timestamp",
+        "is_released",
+        "done_at",
+        "fields",
+        "hashes",
+    ]
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        version: str,
+        size: int,
+        seed_key: str,
+        approval_status: str,
+        timestamp: str,
+        data: bytes | None = None,
+        done_at: float = 0.0,
+    ) -> None:
+        self.version = version
+        self.size = size
+        self.data = data  # None: the content is synthetic, derived from seed_key
+        self.seed_key = seed_key
+        self.approval_status = approval_status
+        self.timestamp = timestamp
+        self.is_released = False
+        self.done_at = done_at
+        self.fields: Dict[str, Any] = {}
+        self.hashes: Dict[str, str] | None = None  # computed on first use
+
+    def blocks(self) -> Iterator[bytes]:
+        if self.data is not None:
+            for offset in range(0, len(self.data), BLOCK_SIZE):
+                yield self.data[offset : offset + BLOCK_SIZE]
+            return
+
+        block = hashlib.sha256(self.seed_key.encode("utf-8")).digest() * (BLOCK_SIZE // 32)
+        remaining = self.size
+        while remaining > 0:
+            yield block[: min(remaining, BLOCK_SIZE)]
+            remaining -= BLOCK_SIZE
+
+    def get_hashes(self) -> Dict[str, str]:
+        if self.hashes is None:
+            sha1 = hashlib.sha1()
+            sha256 = hashlib.sha256()
+            for block in self.blocks():
+                sha1.update(block)
+                sha256.update(block)
+            self.hashes = {"sha1": sha1.hexdigest(), "sha256": sha256.hexdigest()}
+        return self.hashes
+
+
+class _MockPortalHttpServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 drops connections of concurrent clients
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        portal: "SpectraAssureMockPortal",
+    ) -> None:
+        self.portal = portal
+        super().__init__(address, _MockPortalHandler)
+
+
+class _MockPortalHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real Portal
+    disable_nagle_algorithm = True  # headers and body are written separately, avoid the delayed ACK stall
+
+    def _portal(self) -> "SpectraAssureMockPortal":
+        assert isinstance(self.server, _MockPortalHttpServer)
+        return self.server.portal
+
+    def log_message(  # pylint: disable=redefined-builtin
+        self,
+        format: str,
+        *args: Any,
+    ) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._portal().handle(self, "GET")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._portal().handle(self, "POST")
+
+    def do_PATCH(self) -> None:  # pylint: disable=invalid-name
+        self._portal().handle(self, "PATCH")
+
+    def do_DELETE(self) -> None:  # pylint: disable=invalid-name
+        self._portal().handle(self, "DELETE")
+
+
+class SpectraAssureMockPortal:  # pylint: disable=too-many-instance-attributes
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token: str = "mock-token",
+        n_projects: int = 2,
+        n_packages: int = 2,
+        n_versions: int = 3,
+        artifact_size: int = 1024,
+        approved_ratio: float = 1.0,
+        auto_approve: bool = True,
+        keep_uploads: bool = True,
+        analysis_seconds: float = 0.0,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        throttle_seconds: int = 1,
+        error_rate: float = 0.0,
+        fault_actions: List[str] | None = None,
+        body_bytes_per_second: float | None = None,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 30.0,
+        report_size: int = 0,
+        url_ttl: int = 3600,
+        seed: int = 0,
+    ) -> None:
+        """
+        Action:
+            Initialize a local stand-in for the Spectra Assure Portal API
+            with synthetic projects, packages and versions, and optional fault injection.
+
+        Args:
+         - host: str, default "127.0.0.1", optional.
+         - port: int, default 0, optional; 0 picks a free port.
+
+         - token: str, default "mock-token", optional;
+            The Bearer token the client must send; an empty string accepts any token.
+
+         - n_projects, n_packages, n_versions: int, default 2, 2, 3, optional;
+            The synthetic tree: every project has 'n_packages' packages, every package 'n_versions' versions.
+
+         - artifact_size: int, default 1024, optional;
+            The size in bytes of every synthetic artifact; the content is generated, not stored.
+
+         - approved_ratio: float, default 1.0, optional;
+            The fraction of synthetic versions that are approved.
+
+         - auto_approve: bool, default True, optional;
+            Approve versions created with scan().
+
+         - keep_uploads: bool, default True, optional;
+            Keep the content uploaded with scan() in memory, so it can be downloaded again;
+            if False, only the size and the hashes are kept and a download gets a 410,
+            e.g. for upload benchmarks with large files.
+
+         - analysis_seconds: float, default 0.0, optional;
+            The time after a scan() upload until status() shows the analysis as 'done'.
+
+         - latency: float, default 0.0, optional;
+            The seconds added to every request before it is handled.
+
+         - throttle_rate: float, default 0.0, optional;
+            The probability a request gets a 429 with "Expected available in N seconds.".
+
+         - throttle_seconds: int, default 1, optional; the N in the throttle message.
+
+         - error_rate: float, default 0.0, optional;
+            The probability a request gets a 5xx (500, 502 or 503).
+
+         - fault_actions: List[str] | None, default None, optional;
+            The actions (see MOCK_ACTIONS) that get throttled or fail; None means all.
+
+         - body_bytes_per_second: float | None, default None, optional;
+            Send the bodies of reports and downloads at this rate; None means as fast as possible.
+
+         - stall_rate: float, default 0.0, optional;
+            The probability a report or download body stops halfway for 'stall_seconds'
+            after which the connection is closed, so the client sees a truncated body (or its read timeout).
+
+         - report_size: int, default 0, optional;
+            Pad every report to about this many bytes, to test large reports.
+
+         - url_ttl: int, default 3600, optional;
+            The validity in seconds of signed download URLs; expired URLs get a 403.
+
+         - seed: int, default 0, optional;
+            Seeds the fault injection and the synthetic content, so runs are repeatable.
+
+        Notes:
+            Use it with the client as:
+                with SpectraAssureMockPortal() as portal:
+                    client = SpectraAssureApiOperations(**portal.client_args())
+
+            Every knob is a public attribute and may be changed while the server runs.
+            The synthetic names are 'project-000', 'package-000' and '1.0.0'.
+            Request counts per action, throttled, failed and stalled responses are kept in 'stats'.
+        """
+        self.host = host
+        self.port = port
+        self.token = token
+
+        self.artifact_size = artifact_size
+        self.auto_approve = auto_approve
+        self.keep_uploads = keep_uploads
+        self.analysis_seconds = analysis_seconds
+
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.throttle_seconds = throttle_seconds
+        self.error_rate = error_rate
+        self.fault_actions = fault_actions
+        self.body_bytes_per_second = body_bytes_per_second
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.report_size = report_size
+        self.url_ttl = url_ttl
+
+        self.organization = "mock-org"
+        self.group = "mock-group"
+
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._secret = hashlib.sha256(f"spectra-assure-mock-{seed}".encode("utf-8")).digest()
+        self._padding: Dict[int, List[Dict[str, str]]] = {}
+
+        self.stats: Dict[str, int] = {}
+
+        self._server: _MockPortalHttpServer | None = None
+        self._thread: threading.Thread | None = None
+
+        self._projects: Dict[str, Dict[str, Dict[str, _MockVersion]]] = {}
+        self._populate(
+            seed=seed,
+            n_projects=n_projects,
+            n_packages=n_packages,
+            n_versions=n_versions,
+            approved_ratio=approved_ratio,
+        )
+
+    def _populate(
+        self,
+        *,
+        seed: int,
+        n_projects: int,
+        n_packages: int,
+        n_versions: int,
+        approved_ratio: float,
+    ) -> None:
+        base_time = 1700000000  # the synthetic approval timestamps increase with the version
+        for i in range(n_projects):
+            project = f"project-{i:03d}"
+            self._projects[project] = {}
+            for j in range(n_packages):
+                package = f"package-{j:03d}"
+                versions: Dict[str, _MockVersion] = {}
+                for k in range(n_versions):
+                    version = f"1.0.{k}"
+                    approved = self._random.random() < approved_ratio
+                    versions[version] = _MockVersion(
+                        version=version,
+                        size=self.artifact_size,
+                        seed_key=f"{seed}/{project}/{package}@{version}",
+                        approval_status="approved" if approved else "pending",
+                        timestamp=self._iso_time(base_time + k * 3600),
+                    )
+                self._projects[project][package] = versions
+
+    @staticmethod
+    def _iso_time(epoch: float) -> str:
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+    def _count(
+        self,
+        key: str,
+        n: int = 1,
+    ) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def _chance(
+        self,
+        rate: float,
+    ) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    # REQUEST HANDLING
+
+    @staticmethod
+    def _iter_request_body(
+        handler: http.server.BaseHTTPRequestHandler,
+    ) -> Iterator[bytes]:
+        if handler.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(handler.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    handler.rfile.readline()  # the final empty line
+                    return
+                yield handler.rfile.read(size)
+                handler.rfile.readline()  # the CRLF after the chunk
+
+        remaining = int(handler.headers.get("Content-Length") or 0)
+        while remaining > 0:
+            data = handler.rfile.read(min(remaining, BLOCK_SIZE))
+            if len(data) == 0:
+                return
+            remaining -= len(data)
+            yield data
+
+    def _read_json_body(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+    ) -> Dict[str, Any]:
+        data = b"".join(self._iter_request_body(handler))
+        self._count("bytes_received", len(data))
+        if len(data) == 0:
+            return {}
+        try:
+            result = json.loads(data)
+        except ValueError:
+            return {}
+        return result if isinstance(result, dict) else {}
+
+    def _send_body(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        *,
+        status_code: int,
+        blocks: Iterator[bytes],
+        length: int,
+        content_type: str,
+        may_stall: bool = False,
+    ) -> None:
+        handler.send_response(status_code)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(length))
+        handler.end_headers()
+
+        stall_at = length // 2 if may_stall and self._chance(self.stall_rate) else -1
+        rate = self.body_bytes_per_second if may_stall else None
+
+        sent = 0
+        for block in blocks:
+            if 0 <= stall_at < sent + len(block):
+                handler.wfile.write(block[: stall_at - sent])
+                handler.wfile.flush()
+                self._count("stalled")
+                time.sleep(self.stall_seconds)
+                handler.close_connection = True  # the client gets a truncated body
+                return
+
+            handler.wfile.write(block)
+            sent += len(block)
+            if rate:
+                time.sleep(len(block) / rate)
+
+        self._count("bytes_sent", sent)
+
+    def _send_bytes(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        *,
+        status_code: int,
+        data: bytes,
+        content_type: str,
+        may_stall: bool = False,
+    ) -> None:
+        self._send_body(
+            handler,
+            status_code=status_code,
+            blocks=iter([data[offset : offset + BLOCK_SIZE] for offset in range(0, len(data), BLOCK_SIZE)]),
+            length=len(data),
+            content_type=content_type,
+            may_stall=may_stall,
+        )
+
+    def _send_json(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        status_code: int,
+        payload: Any,
+        may_stall: bool = False,
+    ) -> None:
+        self._send_bytes(
+            handler,
+            status_code=status_code,
+            data=json.dumps(payload).encode("utf-8"),
+            content_type="application/json",
+            may_stall=may_stall,
+        )
+
+    def _send_error(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        status_code: int,
+        message: str,
+    ) -> None:
+        self._send_json(handler, status_code, {"error": message})
+
+    def _inject_fault(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        action: str,
+    ) -> bool:
+        if self.fault_actions is not None and action not in self.fault_actions:
+            return False
+
+        if self._chance(self.throttle_rate):
+            self._count("throttled")
+            message = f"Request was throttled. Expected available in {self.throttle_seconds} seconds."
+            self._send_json(handler, 429, {"detail": message})
+            return True
+
+        if self._chance(self.error_rate):
+            self._count("failed")
+            with self._lock:
+                status_code = self._random.choice([500, 502, 503])
+            self._send_error(handler, status_code, "injected server error")
+            return True
+
+        return False
+
+    def handle(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        method: str,
+    ) -> None:
+        """Handle one request; called by the request handler thread."""
+        try:
+            self._handle(handler, method)
+        except (BrokenPipeError, ConnectionResetError):
+            handler.close_connection = True
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.exception("mock portal: %s %s failed; %s", method, handler.path, e)
+            handler.close_connection = True
+            try:
+                self._send_error(handler, 500, str(e))
+            except OSError:
+                pass
+
+    def _handle(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        method: str,
+    ) -> None:
+        u_info = urllib.parse.urlparse(handler.path)
+        query = {k: v[-1] for k, v in urllib.parse.parse_qs(u_info.query, keep_blank_values=True).items()}
+        path = u_info.path
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if path.startswith(DOWNLOAD_PREFIX):
+            self._count("download")
+            if self._inject_fault(handler, "download"):
+                return
+            self._serve_download(handler, path, query)
+            return
+
+        # /api/public/{api_version}/{action}/{org}/{group}[/...]
+        parts = [urllib.parse.unquote(p) for p in path[len(API_PREFIX) :].split("/")]
+        if not path.startswith(API_PREFIX) or len(parts) < 4 or parts[1] not in MOCK_ACTIONS:
+            for data in self._iter_request_body(handler):
+                self._count("bytes_received", len(data))
+            self._send_error(handler, 404, f"not found: {path}")
+            return
+
+        action = parts[1]
+        self._count(action)
+
+        # read the body first, so every answer leaves the connection usable
+        body: Dict[str, Any] = {}
+        if method == "PATCH":
+            body = self._read_json_body(handler)
+        elif not (method == "POST" and action == "scan"):
+            self._read_json_body(handler)  # e.g. the empty json body the SDK sends with GET and DELETE
+
+        if len(self.token) > 0 and handler.headers.get("Authorization") != f"Bearer {self.token}":
+            self._drain(handler, method, action)
+            self._send_error(handler, 401, "invalid token")
+            return
+
+        if self._inject_fault(handler, action):
+            self._drain(handler, method, action)
+            return
+
+        if action == "report":
+            # note the report_type is in the middle of the url: report/{org}/{group}/{report_type}/pkg:rl/...
+            if len(parts) < 5:
+                self._send_error(handler, 404, f"not found: {path}")
+                return
+            self._serve_report(handler, parts[4], self._split_target(parts[5:]), query)
+            return
+
+        routes = {
+            ("GET", "list"): self._serve_list,
+            ("GET", "status"): self._serve_status,
+            ("GET", "checks"): self._serve_checks,
+            ("POST", "scan"): self._serve_scan,
+            ("POST", "create"): self._serve_create,
+            ("PATCH", "edit"): self._serve_edit,
+            ("DELETE", "delete"): self._serve_delete,
+        }
+        route = routes.get((method, action))
+        if route is None:
+            self._drain(handler, method, action)
+            self._send_error(handler, 405, f"{method} is not supported for {action}")
+            return
+
+        query.update(body)
+        route(handler, self._split_target(parts[4:]), query)
+
+    def _drain(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        method: str,
+        action: str,
+    ) -> None:
+        if method == "POST" and action == "scan":
+            for data in self._iter_request_body(handler):
+                self._count("bytes_received", len(data))
+
+    @staticmethod
+    def _split_target(
+        parts: List[str],
+    ) -> Tuple[str | None, str | None, str | None]:
+        # ["pkg:rl", project, "package@version"]
+        if len(parts) < 2 or parts[0] != "pkg:rl":
+            return None, None, None
+
+        project = parts[1]
+        if len(parts) < 3:
+            return project, None, None
+
+        package, sep, version = parts[2].partition("@")
+        return project, package, version if sep else None
+
+    def _get_version(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+    ) -> _MockVersion | None:
+        project, package, version = target
+        with self._lock:
+            v = self._projects.get(project or "", {}).get(package or "", {}).get(version or "")
+        if v is None:
+            self._send_error(handler, 404, f"version not found: {project}/{package}@{version}")
+        return v
+
+    @staticmethod
+    def _is_true(value: Any) -> bool:
+        return str(value).lower() in ["true", "1", "yes"]
+
+    # ACTIONS
+
+    def _version_item(
+        self,
+        v: _MockVersion,
+    ) -> Dict[str, Any]:
+        item: Dict[str, Any] = {
+            "version": v.version,
+            "approval_status": v.approval_status,
+            "approval_information": {"timestamp": v.timestamp},
+            "is_released": v.is_released,
+        }
+        item.update(v.fields)
+        return item
+
+    def _serve_list(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],  # pylint: disable=unused-argument
+    ) -> None:
+        project, package, version = target
+        with self._lock:
+            if project is None:
+                payload: Dict[str, Any] = {"projects": [{"name": name} for name in self._projects]}
+                self._send_json(handler, 200, payload)
+                return
+
+            packages = self._projects.get(project)
+            if packages is None:
+                self._send_error(handler, 404, f"project not found: {project}")
+                return
+
+            if package is None:
+                payload = {"packages": [{"name": name} for name in packages]}
+                self._send_json(handler, 200, payload)
+                return
+
+            versions = packages.get(package)
+            if versions is None:
+                self._send_error(handler, 404, f"package not found: {project}/{package}")
+                return
+
+            if version is None:
+                payload = {"versions": [self._version_item(v) for v in versions.values()]}
+                self._send_json(handler, 200, payload)
+                return
+
+        v = self._get_version(handler, target)
+        if v is not None:
+            self._send_json(handler, 200, self._version_item(v))
+
+    def _signed_url(
+        self,
+        target: Tuple[str | None, str | None, str | None],
+        file_name: str,
+    ) -> str:
+        path = DOWNLOAD_PREFIX + "/".join(urllib.parse.quote(str(p), safe="") for p in target)
+        query = {
+            "X-Amz-Date": time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()),
+            "X-Amz-Expires": str(self.url_ttl),
+            "response-content-disposition": f'attachment; filename="{file_name}"',
+        }
+        query["X-Amz-Signature"] = self._sign(path, query)
+        return f"{self.url}{path}?{urllib.parse.urlencode(query)}"
+
+    def _sign(
+        self,
+        path: str,
+        query: Dict[str, str],
+    ) -> str:
+        message = "\n".join([path, query["X-Amz-Date"], query["X-Amz-Expires"]]).encode("utf-8")
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def _serve_status(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],
+    ) -> None:
+        v = self._get_version(handler, target)
+        if v is None:
+            return
+
+        if time.time() < v.done_at:
+            self._send_json(handler, 200, {"analysis": {"status": "in progress"}})
+            return
+
+        file_name = f"{target[1]}-{v.version}.bin"
+        hashes = v.get_hashes()
+        info: Dict[str, Any] = {
+            "file": {
+                "name": file_name,
+                "size": v.size,
+                "hashes": [[k, hashes[k]] for k in sorted(hashes)],
+            },
+            "statistics": {"quality": {"status": "pass"}},
+        }
+        if self._is_true(query.get("download")):
+            info["portal"] = {"download": self._signed_url(target, file_name)}
+
+        self._send_json(handler, 200, {"analysis": {"status": "done", "report": {"info": info}}})
+
+    def _serve_checks(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],  # pylint: disable=unused-argument
+    ) -> None:
+        v = self._get_version(handler, target)
+        if v is None:
+            return
+
+        payload = {
+            "analysis": {"status": "done" if time.time() >= v.done_at else "in progress"},
+            "checks": {"status": "pass", "policies": {"passed": 1, "failed": 0}},
+        }
+        self._send_json(handler, 200, payload)
+
+    def _get_padding(self) -> List[Dict[str, str]]:
+        size = self.report_size
+        with self._lock:
+            if size not in self._padding:
+                item = {"id": "x" * 80}
+                self._padding[size] = [item] * (size // 100)  # about 100 bytes per item
+            return self._padding[size]
+
+    def _serve_report(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        report_type: str,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],  # pylint: disable=unused-argument
+    ) -> None:
+        if report_type not in MOCK_REPORT_TYPES:
+            self._send_error(handler, 404, f"report type not found: {report_type}")
+            return
+
+        v = self._get_version(handler, target)
+        if v is None:
+            return
+
+        purl = f"pkg:rl/{target[0]}/{target[1]}@{v.version}"
+        padding = self._get_padding()
+
+        if report_type in ["rl-cve", "rl-uri"]:  # csv
+            lines = ["purl,item"] + [f"{purl},{item['id']}" for item in padding]
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            self._send_bytes(handler, status_code=200, data=data, content_type="text/csv", may_stall=True)
+            return
+
+        payload = {
+            "report_type": report_type,
+            "purl": purl,
+            "hashes": v.get_hashes(),
+            "items": padding,
+        }
+        self._send_json(handler, 200, payload, may_stall=True)
+
+    def _serve_download(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        path: str,
+        query: Dict[str, str],
+    ) -> None:
+        signature = query.get("X-Amz-Signature", "")
+        try:
+            expected = self._sign(path, query)
+            expires_at = calendar.timegm(time.strptime(query["X-Amz-Date"], "%Y%m%dT%H%M%SZ"))
+            expires_at += int(query["X-Amz-Expires"])
+        except (KeyError, ValueError):
+            self._send_error(handler, 403, "invalid signature")
+            return
+
+        if not hmac.compare_digest(signature, expected):
+            self._send_error(handler, 403, "invalid signature")
+            return
+
+        if time.time() > expires_at:
+            self._send_error(handler, 403, "Request has expired")
+            return
+
+        parts = [urllib.parse.unquote(p) for p in path[len(DOWNLOAD_PREFIX) :].split("/")]
+        if len(parts) != 3:
+            self._send_error(handler, 404, "not found")
+            return
+
+        v = self._get_version(handler, (parts[0], parts[1], parts[2]))
+        if v is None:
+            return
+
+        if v.data is not None and len(v.data) != v.size:
+            self._send_error(handler, 410, "the uploaded content was not kept")
+            return
+
+        self._send_body(
+            handler,
+            status_code=200,
+            blocks=v.blocks(),
+            length=v.size,
+            content_type="application/octet-stream",
+            may_stall=True,
+        )
+
+    def _serve_scan(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],
+    ) -> None:
+        project, package, version = target
+        if project is None or package is None or version is None:
+            self._drain(handler, "POST", "scan")
+            self._send_error(handler, 400, "scan needs a project, package and version")
+            return
+
+        with self._lock:
+            exists = version in self._projects.get(project, {}).get(package, {})
+        replace = self._is_true(query.get("replace")) or str(query.get("build", "")).lower() == "repro"
+        if exists and not replace:
+            self._drain(handler, "POST", "scan")
+            self._send_error(handler, 409, f"version already exists: {project}/{package}@{version}")
+            return
+
+        # the upload is kept in memory (this is a mock), or only hashed
+        size = 0
+        blocks: List[bytes] = []
+        sha1 = hashlib.sha1()
+        sha256 = hashlib.sha256()
+        for block in self._iter_request_body(handler):
+            size += len(block)
+            sha1.update(block)
+            sha256.update(block)
+            if self.keep_uploads:
+                blocks.append(block)
+        self._count("bytes_received", size)
+
+        v = _MockVersion(
+            version=version,
+            size=size,
+            seed_key=f"{project}/{package}@{version}",
+            approval_status="approved" if self.auto_approve else "pending",
+            timestamp=self._iso_time(time.time()),
+            data=b"".join(blocks) if self.keep_uploads else b"",
+            done_at=time.time() + self.analysis_seconds,
+        )
+        v.hashes = {"sha1": sha1.hexdigest(), "sha256": sha256.hexdigest()}
+        with self._lock:
+            self._projects.setdefault(project, {}).setdefault(package, {})[version] = v
+
+        self._send_json(handler, 200, {"detail": f"upload accepted for pkg:rl/{project}/{package}@{version}"})
+
+    def _serve_create(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],  # pylint: disable=unused-argument
+    ) -> None:
+        project, package, _ = target
+        if project is None:
+            self._send_error(handler, 400, "create needs a project")
+            return
+
+        with self._lock:
+            if package is None:
+                if project in self._projects:
+                    self._send_error(handler, 409, f"project already exists: {project}")
+                    return
+                self._projects[project] = {}
+            else:
+                packages = self._projects.get(project)
+                if packages is None:
+                    self._send_error(handler, 404, f"project not found: {project}")
+                    return
+                if package in packages:
+                    self._send_error(handler, 409, f"package already exists: {project}/{package}")
+                    return
+                packages[package] = {}
+
+        self._send_json(handler, 200, {"detail": "created"})
+
+    def _serve_edit(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],
+    ) -> None:
+        project, package, version = target
+        if version is not None:
+            v = self._get_version(handler, target)
+            if v is None:
+                return
+            with self._lock:
+                for k, value in query.items():
+                    if k == "is_released":
+                        v.is_released = self._is_true(value)
+                    else:
+                        v.fields[k] = value
+            self._send_json(handler, 200, self._version_item(v))
+            return
+
+        new_name = query.get("name")
+        with self._lock:
+            packages = self._projects.get(project or "")
+            if packages is None or (package is not None and package not in packages):
+                self._send_error(handler, 404, f"not found: {project}/{package}")
+                return
+
+            if new_name:
+                if package is None:
+                    self._projects[str(new_name)] = self._projects.pop(str(project))
+                else:
+                    packages[str(new_name)] = packages.pop(package)
+
+        self._send_json(handler, 200, {"detail": "edited"})
+
+    def _serve_delete(
+        self,
+        handler: http.server.BaseHTTPRequestHandler,
+        target: Tuple[str | None, str | None, str | None],
+        query: Dict[str, Any],  # pylint: disable=unused-argument
+    ) -> None:
+        project, package, version = target
+        with self._lock:
+            packages = self._projects.get(project or "")
+            if packages is not None and package is None:
+                del self._projects[str(project)]
+                found = True
+            elif packages is not None and version is None:
+                found = packages.pop(str(package), None) is not None
+            elif packages is not None:
+                found = packages.get(str(package), {}).pop(str(version), None) is not None
+            else:
+                found = False
+
+        if not found:
+            self._send_error(handler, 404, f"not found: {project}/{package}@{version}")
+            return
+
+        self._send_json(handler, 200, {"detail": "deleted"})
+
+    # PUBLIC
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def client_args(self) -> Dict[str, Any]:
+        """Return the arguments for SpectraAssureApiOperations to talk to this mock."""
+        return {
+            "server": "local",
+            "host": f"{self.host}:{self.port}",
+            "organization": self.organization,
+            "group": self.group,
+            "token": self.token or "mock-token",
+        }
+
+    def start(self) -> "SpectraAssureMockPortal":
+        """Start serving in a daemon thread; the port is known after this returns."""
+        assert self._server is None, "the mock portal is already running"
+
+        self._server = _MockPortalHttpServer((self.host, self.port), self)
+        self.port = int(self._server.server_address[1])
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="spectra-assure-mock-portal",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info("mock portal serving on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread, e.g. from the command line."""
+        self._server = _MockPortalHttpServer((self.host, self.port), self)
+        self.port = int(self._server.server_address[1])
+        logger.info("mock portal serving on %s", self.url)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "SpectraAssureMockPortal":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
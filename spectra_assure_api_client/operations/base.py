@@ -1,9 +1,13 @@
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import (
+    TYPE_CHECKING,
     Tuple,
     List,
     Dict,
@@ -11,13 +15,32 @@ from typing import (
 )
 
 from spectra_assure_api_client.communication.api import SpectraAssureApi
+from spectra_assure_api_client.communication.bandwidth import SpectraAssureBandwidthLimiter
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
 
+if TYPE_CHECKING:
+    import logging.handlers
+
 logger = logging.getLogger(__name__)
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """Format a record as one JSON object per line: time, level, logger, message (and exception)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        item: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            item["exception"] = self.formatException(record.exc_info)
+        return json.dumps(item, default=str)
+
+
 class SpectraAssureApiOperationsBase(
     ABC,
     SpectraAssureApi,
@@ -294,11 +317,15 @@ class SpectraAssureApiOperationsBase(
         return r
 
     @classmethod
-    def make_logger(
+    def make_logger(  # pylint: disable=too-many-arguments,too-many-locals
         cls,
         *,
         my_logger: logging.Logger,
-    ) -> None:
+        use_queue: bool = False,
+        max_bytes: int = 100 * 1024 * 1024,
+        backup_count: int = 5,
+        json_lines: bool | None = None,
+    ) -> "logging.handlers.QueueListener | None":
         """
         Action:
             Using the provided myLogger,
@@ -309,8 +336,24 @@ class SpectraAssureApiOperationsBase(
         Args:
             my_logger: logging.Logger, mandatory.
 
+            use_queue: bool, default False, optional;
+                If True, the calling threads only put records on a queue,
+                a background listener thread formats them and writes to stderr and the log file.
+
+            max_bytes: int, default 100MB, optional;
+                Rotate the log file when it would grow beyond this size, 0 never rotates.
+
+            backup_count: int, default 5, optional;
+                The number of rotated log files kept (<prog>.log.1 ... <prog>.log.N).
+
+            json_lines: bool | None, default None, optional;
+                Write one JSON object per record instead of plain text;
+                if None, this is enabled by LOG_FORMAT=json in the environment.
+
         Returns:
-            None
+            The started QueueListener when use_queue is True, otherwise None.
+            The listener is stopped (and the queue flushed) at exit;
+            call stop() on it to flush earlier.
 
         Raises
             no specific exceptions are raised by the implementation.
@@ -320,28 +363,41 @@ class SpectraAssureApiOperationsBase(
             and if the program name ends with '.py' that part is stripped.
 
             Supports reading LOG_LEVEL from the environment for stderr .
-            the file always uses DEBUG
+            the file uses INFO, or DEBUG if ENVIRONMENT is 'development' or 'testing'.
+
+            The level of my_logger is set to the lowest level of the handlers,
+            so debug records are not even created when no handler would write them.
         """
+        import logging.handlers  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
         assert my_logger is not None
-        my_logger.setLevel(logging.DEBUG)
 
         my_level = os.getenv("LOG_LEVEL", "WARNING")
         my_env = os.getenv("ENVIRONMENT", "PRODUCTION")
+        if json_lines is None:
+            json_lines = os.getenv("LOG_FORMAT", "").lower() == "json"
 
         prog_name = os.path.basename(sys.argv[0])
         if prog_name.lower().endswith(".py"):
             prog_name = prog_name[:-3]
         file_name = f"{prog_name}.log"
 
-        fh = logging.FileHandler(file_name)
+        fh = logging.handlers.RotatingFileHandler(
+            file_name,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+        )
         fh.setLevel(logging.INFO)
 
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        formatter: logging.Formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         if my_env.lower() in ["development", "testing"]:
             formatter = logging.Formatter(
                 "%(asctime)s - %(pathname)s:%(lineno)s - %(name)s - %(levelname)s - %(message)s"
             )
             fh.setLevel(logging.DEBUG)
+        if json_lines is True:
+            formatter = JsonLinesFormatter()
 
         ch = logging.StreamHandler()
         ch.setLevel(my_level)
@@ -349,9 +405,27 @@ class SpectraAssureApiOperationsBase(
         ch.setFormatter(formatter)
         fh.setFormatter(formatter)
 
-        # add the handlers to my_logger
-        my_logger.addHandler(ch)
-        my_logger.addHandler(fh)
+        my_logger.setLevel(min(ch.level, fh.level))
+
+        if use_queue is False:
+            # add the handlers to my_logger
+            my_logger.addHandler(ch)
+            my_logger.addHandler(fh)
+            return None
+
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, ch, fh, respect_handler_level=True)
+        my_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener.start()
+
+        def stop_at_exit() -> None:
+            # the caller may have stopped it already, QueueListener.stop() fails when called twice
+            if getattr(listener, "_thread", None) is not None:
+                listener.stop()
+
+        atexit.register(stop_at_exit)
+
+        return listener
 
     @abstractmethod
     def status(
@@ -376,3 +450,42 @@ class SpectraAssureApiOperationsBase(
         **qp: Any,  # not actually used in list
     ) -> Any:
         """needed here for the download operation"""
+
+    @abstractmethod
+    def scan(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        project: str,
+        package: str,
+        version: str,
+        file_path: str,
+        auto_adapt_to_throttle: bool = False,
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None,
+        **qp: Any,
+    ) -> Any:
+        """needed here for the scan job tracking"""
+
+    @abstractmethod
+    def checks(
+        self,
+        *,
+        project: str,
+        package: str,
+        version: str,
+        auto_adapt_to_throttle: bool = False,
+        **qp: Any,
+    ) -> Any:
+        """needed here for the scan job tracking"""
+
+    @abstractmethod
+    def report(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        project: str,
+        package: str,
+        version: str,
+        report_type: str,
+        auto_adapt_to_throttle: bool = False,
+        **qp: Any,
+    ) -> Any:
+        """needed here for the scan job tracking"""
@@ -0,0 +1,347 @@
+import concurrent.futures
+import logging
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+)
+
+import requests
+
+from spectra_assure_api_client.communication.profiling import profiled
+from spectra_assure_api_client.communication.exceptions import (
+    SpectraAssureInvalidAction,
+)
+from .base import SpectraAssureApiOperationsBase
+
+logger = logging.getLogger(__name__)
+
+BULK_OPERATIONS: List[str] = [
+    "create",
+    "scan",
+    "edit",
+    "delete",
+    "status",
+    "checks",
+    "report",
+]
+
+# operations that make their target exist on the Portal
+PRODUCING_OPERATIONS: List[str] = ["create", "scan"]
+
+Target = Tuple[str, str | None, str | None]  # (project, package, version)
+
+
+class _BulkItem:  # pylint: disable=too-few-public-methods
+    __slots__ = ("index", "id", "operation", "args", "target", "depends_on", "dependents")
+
+    def __init__(
+        self,
+        *,
+        index: int,
+        item: Dict[str, Any],
+    ) -> None:
+        self.index = index
+        self.id: Any = item.get("id", index)
+        self.operation = str(item.get("operation"))
+        self.args: Dict[str, Any] = dict(item.get("args") or {})
+
+        project = self.args.get("project")
+        package = self.args.get("package")
+        version = self.args.get("version")
+        if not project or (version and not package):
+            msg = f"bulk operation {self.id}: 'project' (and 'package' for a 'version') are mandatory; {self.args}"
+            raise SpectraAssureInvalidAction(message=msg)
+        self.target: Target = (str(project), package or None, (version or None) if package else None)
+
+        self.depends_on: Set[int] = set()
+        self.dependents: Set[int] = set()
+
+    def target_name(self) -> str:
+        project, package, version = self.target
+        name = project
+        if package:
+            name += f"/{package}"
+        if version:
+            name += f"@{version}"
+        return name
+
+
+class SpectraAssureApiOperationsBulk(  # pylint: disable=too-many-ancestors
+    SpectraAssureApiOperationsBase,
+):
+
+    @staticmethod
+    def _prefixes(target: Target) -> List[Target]:
+        # the target and what it is in: the project, the package, the version
+        project, package, version = target
+        r: List[Target] = [(project, None, None)]
+        if package is not None:
+            r.append((project, package, None))
+        if version is not None:
+            r.append((project, package, version))
+        return r
+
+    def _bulk_items(
+        self,
+        operations: List[Dict[str, Any]],
+    ) -> List[_BulkItem]:
+        """
+        Action:
+            Validate the operations and infer their order:
+             - create and scan run after the create of the project or package they are in;
+             - all other operations run after the create or scan of their target or of what it is in;
+             - edits of the same target run in the order given;
+             - a delete runs after all other operations on its target and on what is in it;
+             - 'depends_on' adds explicit dependencies (a list of ids).
+
+        Raises:
+            SpectraAssureInvalidAction: on an unknown operation, a duplicate id, an unknown or cyclic dependency.
+        """
+        items = [_BulkItem(index=i, item=item) for i, item in enumerate(operations)]
+
+        by_id: Dict[Any, _BulkItem] = {}
+        for item in items:
+            if item.operation not in BULK_OPERATIONS:
+                msg = (
+                    f"bulk operation {item.id}: unsupported operation '{item.operation}'; use one of {BULK_OPERATIONS}"
+                )
+                raise SpectraAssureInvalidAction(message=msg)
+            if item.id in by_id:
+                msg = f"bulk operation {item.id}: the id is not unique"
+                raise SpectraAssureInvalidAction(message=msg)
+            by_id[item.id] = item
+
+        # indexes, so the dependencies are found in O(n) instead of comparing all pairs
+        producers: Dict[Target, List[int]] = {}  # target -> create and scan operations on it
+        inside: Dict[Target, List[int]] = {}  # target -> all operations on it or on something in it
+        for item in items:
+            if item.operation in PRODUCING_OPERATIONS:
+                producers.setdefault(item.target, []).append(item.index)
+            for prefix in self._prefixes(item.target):
+                inside.setdefault(prefix, []).append(item.index)
+
+        last_edit: Dict[Target, int] = {}
+        for item in items:
+            prefixes = self._prefixes(item.target)
+
+            if item.operation == "delete":
+                for i in inside.get(item.target, []):
+                    other = items[i]
+                    if other is not item and (other.operation != "delete" or other.target != item.target):
+                        item.depends_on.add(i)
+                for prefix in prefixes[:-1]:
+                    item.depends_on.update(producers.get(prefix, []))
+            else:
+                for prefix in prefixes:
+                    for i in producers.get(prefix, []):
+                        # two creates (or scans) of the same target run in the order given
+                        same = prefix == item.target and item.operation in PRODUCING_OPERATIONS
+                        if i != item.index and (not same or i < item.index):
+                            item.depends_on.add(i)
+
+            if item.operation == "edit":
+                # edits of the same target run in the order given: each after the one before
+                if item.target in last_edit:
+                    item.depends_on.add(last_edit[item.target])
+                last_edit[item.target] = item.index
+
+        for item in items:
+            for dependency in operations[item.index].get("depends_on") or []:
+                if dependency not in by_id:
+                    msg = f"bulk operation {item.id}: unknown dependency '{dependency}'"
+                    raise SpectraAssureInvalidAction(message=msg)
+                item.depends_on.add(by_id[dependency].index)
+
+        for item in items:
+            for dependency in item.depends_on:
+                items[dependency].dependents.add(item.index)
+
+        self._check_acyclic(items)
+        return items
+
+    @staticmethod
+    def _check_acyclic(items: List[_BulkItem]) -> None:
+        pending = {item.index: len(item.depends_on) for item in items}
+        ready = [i for i, n in pending.items() if n == 0]
+        seen = 0
+        while ready:
+            i = ready.pop()
+            seen += 1
+            for dependent in items[i].dependents:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if seen != len(items):
+            cyclic = [items[i].id for i, n in pending.items() if n > 0]
+            msg = f"bulk operations with cyclic dependencies: {cyclic}"
+            raise SpectraAssureInvalidAction(message=msg)
+
+    def _run_bulk_item(
+        self,
+        item: _BulkItem,
+        auto_adapt_to_throttle: bool,
+    ) -> Dict[str, Any]:
+        result = self._new_bulk_result(item)
+        start = time.monotonic()
+        try:
+            args = dict(item.args)
+            args.setdefault("auto_adapt_to_throttle", auto_adapt_to_throttle)
+            response = getattr(self, item.operation)(**args)
+            assert isinstance(response, requests.Response)
+
+            result["status_code"] = response.status_code
+            result["ok"] = response.status_code < 400
+            try:
+                result["data"] = response.json()
+            except ValueError:
+                result["data"] = response.text
+            if result["ok"] is False:
+                result["error"] = f"{response.status_code} {response.reason}"
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.exception("bulk operation %s failed", item.id)
+            result["error"] = f"{type(e).__name__}: {e}"
+
+        result["elapsed"] = time.monotonic() - start
+        return result
+
+    def _bulk_run(  # pylint: disable=too-many-locals
+        self,
+        items: List[_BulkItem],
+        max_workers: int,
+        auto_adapt_to_throttle: bool,
+    ) -> Iterator[Dict[str, Any]]:
+        pending = {item.index: len(item.depends_on) for item in items}
+        ready = [item.index for item in items if pending[item.index] == 0]
+        skipped: List[Tuple[int, Any]] = []  # (index, id of the failed dependency)
+        done: Set[int] = set()
+
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        running: Dict[concurrent.futures.Future[Dict[str, Any]], int] = {}
+        try:
+            while ready or running or skipped:
+                # start in the order given, so the shared rate limit is spent on the earliest operations first
+                ready.sort(reverse=True)
+                while ready:
+                    i = ready.pop()
+                    running[pool.submit(self._run_bulk_item, items[i], auto_adapt_to_throttle)] = i
+
+                while skipped:
+                    i, failed_id = skipped.pop()
+                    done.add(i)
+                    result = self._new_bulk_result(items[i])
+                    result["skipped"] = True
+                    result["error"] = f"skipped: dependency {failed_id} failed"
+                    logger.warning("bulk operation %s skipped: dependency %s failed", items[i].id, failed_id)
+                    yield result
+
+                if not running:
+                    continue
+
+                finished, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    done.add(i)
+                    result = future.result()
+
+                    if result["ok"] is True:
+                        for dependent in items[i].dependents:
+                            pending[dependent] -= 1
+                            if pending[dependent] == 0 and dependent not in done:
+                                ready.append(dependent)
+                    else:
+                        skipped.extend(self._bulk_dependents(items, i, done))
+
+                    yield result
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _new_bulk_result(item: _BulkItem) -> Dict[str, Any]:
+        return {
+            "id": item.id,
+            "operation": item.operation,
+            "target": item.target_name(),
+            "ok": False,
+            "skipped": False,
+            "status_code": None,
+            "data": None,
+            "error": None,
+            "elapsed": 0.0,
+        }
+
+    # PUBLIC
+
+    @profiled
+    def bulk(
+        self,
+        *,
+        operations: List[Dict[str, Any]],
+        max_workers: int = 4,
+        auto_adapt_to_throttle: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Action:
+            Run a set of create, scan, edit, delete, status, checks and report operations
+            in the order their targets require, with independent operations running concurrently.
+
+        Args:
+         - operations: List[Dict[str, Any]], mandatory;
+            Each operation is a dict:
+             - operation: str; one of BULK_OPERATIONS.
+             - args: Dict[str, Any]; the keyword arguments of the operation, e.g. project, package, version, file_path.
+             - id: Any, optional; default: the index in the list.
+             - depends_on: List[Any], optional; ids of operations that must succeed first.
+
+         - max_workers: int = 4, optional;
+            The number of operations running at the same time.
+
+         - auto_adapt_to_throttle: bool, default True, optional;
+            Used for all operations that do not specify it in their args;
+            all operations share the throttle handling of this client.
+
+        Return:
+            A generator that yields one dict per operation, in the order they finish:
+             - id, operation, target ('project/package@version')
+             - ok: bool; True if the operation returned a status code below 400
+             - skipped: bool; True if the operation did not run because a dependency failed
+             - status_code: int | None
+             - data: the json (or text) of the response, or None
+             - error: str | None
+             - elapsed: float, seconds
+
+        Raises:
+            SpectraAssureInvalidAction: on invalid operations or dependencies, when called (before any operation runs).
+
+        Notes:
+            A project is created before its packages, a package before its versions are scanned,
+            and edits, status, checks and reports run after the create or scan of their target.
+            A failure only skips the operations that depend on it (also indirectly); all others still run.
+            Stop iterating to stop starting new operations; running ones finish.
+        """
+        # validate all operations now, not on the first next() of the generator
+        items = self._bulk_items(operations)
+        return self._bulk_run(items, max_workers, auto_adapt_to_throttle)
+
+    @staticmethod
+    def _bulk_dependents(
+        items: List[_BulkItem],
+        failed: int,
+        done: Set[int],
+    ) -> List[Tuple[int, Any]]:
+        # all operations that (also indirectly) depend on the failed one
+        r: List[Tuple[int, Any]] = []
+        todo = list(items[failed].dependents)
+        while todo:
+            i = todo.pop()
+            if i in done:
+                continue
+            done.add(i)
+            r.append((i, items[failed].id))
+            todo.extend(items[i].dependents)
+        return r
@@ -3,6 +3,7 @@ from typing import (
     Any,
 )
 
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -15,6 +16,7 @@ class SpectraAssureApiOperationsChecks(  # pylint: disable=too-many-ancestors
     SpectraAssureApiOperationsBase,
 ):  # pylint: disable=too-many-instance-attributes
 
+    @profiled
     def checks(
         self,
         *,
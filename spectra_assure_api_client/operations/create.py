@@ -4,6 +4,7 @@ from typing import (
     Dict,
 )
 
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -29,6 +30,7 @@ class SpectraAssureApiOperationsCreate(  # pylint: disable=too-many-ancestors
                 r[k] = qp[k]
         return r
 
+    @profiled
     def create(
         self,
         *,
@@ -4,6 +4,7 @@ from typing import (
     Dict,
 )
 
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -32,6 +33,7 @@ class SpectraAssureApiOperationsDelete(  # pylint: disable=too-many-ancestors
 
         return r
 
+    @profiled
     def delete(
         self,
         *,
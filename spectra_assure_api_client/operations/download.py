@@ -1,3 +1,4 @@
+import copy
 import logging
 import os
 import time
@@ -5,11 +6,19 @@ from typing import (
     Any,
     Dict,
     List,
+    Set,
     Tuple,
 )
 
+import requests
+
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.download_criteria import SpectraAssureDownloadCriteria
+from spectra_assure_api_client.communication.download_url_cache import SpectraAssureDownloadUrlCache
 from spectra_assure_api_client.communication.downloader import UrlDownloader
+from spectra_assure_api_client.communication.download_journal import UrlDownloaderJournal
+from spectra_assure_api_client.communication.downloader_blob_store import UrlDownloaderBlobStore
+from spectra_assure_api_client.communication.downloader_manifest import UrlDownloaderManifest
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
     SpectraAssureInvalidPath,
@@ -26,17 +35,29 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
     SpectraAssureApiOperationsBase,
 ):
 
-    def _prep_criteria(
+    def _init_transport(
         self,
-        download_criteria: SpectraAssureDownloadCriteria | None = None,
+        **kwargs: Any,
     ) -> None:
-        # pylint: disable=attribute-defined-outside-init
-        self.download_criteria = SpectraAssureDownloadCriteria()  # start with a default
-        if download_criteria:
-            self.download_criteria = download_criteria
+        super()._init_transport(**kwargs)
 
-        self.download_criteria.must_be_approved = True  # OVERRIDE must_be_approved = True
-        logger.info("download_criteria: %s", download_criteria)
+        # signed download URLs are reused while valid, see: _get_download_url()
+        self.download_url_cache = SpectraAssureDownloadUrlCache()
+
+    def _transport_attributes(self) -> Set[str]:
+        return super()._transport_attributes() | {"download_url_cache"}
+
+    @staticmethod
+    def _prep_criteria(
+        download_criteria: SpectraAssureDownloadCriteria | None = None,
+    ) -> SpectraAssureDownloadCriteria:
+        # a copy per call: the criteria of the caller are not modified,
+        # and concurrent downloads on this client never see each other's criteria
+        criteria = copy.copy(download_criteria or SpectraAssureDownloadCriteria())
+
+        criteria.must_be_approved = True  # OVERRIDE must_be_approved = True
+        logger.info("download_criteria: %s", criteria)
+        return criteria
 
     def _validate_target_dir(self, target_dir: str) -> str:
         target_dir_posix = self.simple_path_to_posix(target_path=target_dir)
@@ -64,6 +85,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         ud: UrlDownloader,
         info: Dict[str, Dict[str, Any]],
         auto_adapt_to_throttle: bool = False,
+        journal_key: str | None = None,
         **qp: Any,
     ) -> Tuple[bool, str]:
 
@@ -73,11 +95,69 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             version=version,
         )
 
-        # if we need to download, request the download link
         qp_status = self.qp_status(
             what=what,
             **qp,
         )
+
+        cache_key = f"{self.get_customer_context()}:{project}/{package}@{version}"
+        if qp_status.get("build"):
+            cache_key += f"?build={qp_status['build']}"
+
+        max_try = 2
+        current_try = 0
+        while True:
+            current_try += 1
+
+            download_url = self._get_download_url(
+                project=project,
+                package=package,
+                version=version,
+                cache_key=cache_key,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+                **qp_status,
+            )
+
+            try:
+                download_status, target_file_path = ud.download_file_from_url(
+                    download_url=download_url,
+                    hashes=info["hashes"],
+                    journal_key=journal_key,
+                )
+                break
+            except requests.RequestException as e:
+                if current_try >= max_try:
+                    raise e
+
+                # a rejected URL has most likely expired, anything else can retry with the same URL
+                response = e.response
+                if response is not None and response.status_code in [401, 403, 410]:
+                    self.download_url_cache.invalidate(cache_key)
+
+                logger.warning("retry download of %s/%s@%s after: %s", project, package, version, e)
+
+        if download_status is True:
+            logger.info("targetFile: %s", target_file_path)
+
+        return download_status, target_file_path
+
+    def _get_download_url(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        project: str,
+        package: str,
+        version: str,
+        cache_key: str,
+        auto_adapt_to_throttle: bool = False,
+        **qp_status: Any,
+    ) -> str:
+        download_url = self.download_url_cache.get(cache_key)
+        if download_url is not None:
+            self.metrics.inc("cache_hits", cache="download_url")
+            return download_url
+        self.metrics.inc("cache_misses", cache="download_url")
+
+        # request the download link, this reduces the Portal download capacity
         qp_status["download"] = True
 
         data = self.status(
@@ -102,15 +182,66 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             logger.error(msg)
             raise SpectraAssureNoDownloadUrlInResult(msg)
 
-        download_status, target_file_path = ud.download_file_from_url(
-            download_url=download_url,
-            hashes=info["hashes"],
-        )
+        self.download_url_cache.put(cache_key, str(download_url))
+        return str(download_url)
 
-        if download_status is True:
-            logger.info("targetFile: %s", target_file_path)
+    @staticmethod
+    def _journal_key(
+        *,
+        project: str,
+        package: str,
+        version: str,
+        **qp: Any,
+    ) -> str:
+        key = f"{project}/{package}@{version}"
+        if qp.get("build"):
+            key += f"?build={qp['build']}"
+        return key
 
-        return download_status, target_file_path
+    @staticmethod
+    def _info_from_journal(entry: Dict[str, Any]) -> Dict[str, Any]:
+        # the fields _do_status() would collect, as far as needed to select and report this version
+        return {
+            "analysis": "done",
+            "quality": None,
+            "hashes": [[k, v] for k, v in (entry.get("hashes") or {}).items()],
+            "file-name": entry.get("file"),
+            "target_file_path": entry["path"],
+            "from_journal": True,
+        }
+
+    @staticmethod
+    def _plan_one_download(
+        *,
+        ud: UrlDownloader,
+        info: Dict[str, Any],
+    ) -> Tuple[bool, str | None]:
+        """
+        Action:
+            Decide from the local target directory and the already fetched status data
+            if this version needs a transfer at all.
+
+        Args:
+         - ud: UrlDownloader, mandatory.
+         - info: Dict[str, Any], mandatory; the collected data for this version.
+
+        Return:
+            Tuple[must_transfer: bool, target_file_path: str | None]
+             - If the file name is not known from the status data, we cannot decide locally:
+               must_transfer is True and target_file_path is None.
+             - Otherwise we report the decision of the UrlDownloader for the target file.
+
+        Raises:
+            UrlDownloaderFileVerifyIssue: if an existing target file does not verify.
+        """
+        target_file_name = info.get("file-name")
+        if target_file_name is None:
+            return True, None
+
+        return ud.check_target_file(
+            target_file_name=target_file_name,
+            hashes=info["hashes"],
+        )
 
     def _process_candidates(  # pylint: disable=too-many-arguments
         self,
@@ -119,32 +250,98 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         package: str,
         chosen: Dict[str, Dict[str, Any]],
         target_dir: str,
+        criteria: SpectraAssureDownloadCriteria,
         auto_adapt_to_throttle: bool = False,
+        journal: UrlDownloaderJournal | None = None,
+        manifest: UrlDownloaderManifest | None = None,
         **qp: Any,
     ) -> Dict[str, Dict[str, Any]]:
+        blob_store: UrlDownloaderBlobStore | None = None
+        if criteria.blob_store_dir is not None:
+            blob_store = UrlDownloaderBlobStore(
+                store_dir=criteria.blob_store_dir,
+                link_mode=criteria.blob_store_link_mode,
+            )
+
         # create a UrlDownloader to do the actual download
         ud = UrlDownloader(
             target_dir=target_dir,
-            with_verify_existing_files=self.download_criteria.with_verify_existing_files,
-            with_verify_after_download=self.download_criteria.with_verify_after_download,
-            with_overwrite_existing_files=self.download_criteria.with_overwrite_existing_files,
+            with_verify_existing_files=criteria.with_verify_existing_files,
+            with_verify_after_download=criteria.with_verify_after_download,
+            with_overwrite_existing_files=criteria.with_overwrite_existing_files,
+            with_verification_manifest=criteria.with_verification_manifest,
+            blob_store=blob_store,
+            # the limit from the criteria (if any) and the limit of this client both apply
+            bandwidth_limiter=[
+                limiter for limiter in [criteria.bandwidth_limiter, self.bandwidth_limiter] if limiter is not None
+            ],
+            journal=journal,
+            manifest=manifest,
+            session=self.session,
+            metrics=self.metrics,
         )
 
-        for version_, info in chosen.items():
-            logger.info("try download: version %s, with info: %s", version_, info)
-
-            download_status, target_file_path = self._do_one_download(
-                project=project,
-                package=package,
-                version=version_,
-                info=info,
-                ud=ud,
-                auto_adapt_to_throttle=auto_adapt_to_throttle,
-                **qp,
-            )
-
-            chosen[version_]["target_file_path"] = os.path.realpath(target_file_path)
-            chosen[version_]["downloaded"] = download_status
+        try:
+            for version_, info in chosen.items():
+                if info.get("from_journal") is True:
+                    # completed in an earlier run: no download URL, no rehash
+                    logger.info("from journal: version %s, file: %s", version_, info["target_file_path"])
+                    chosen[version_]["downloaded"] = False
+                    continue
+
+                journal_key = self._journal_key(project=project, package=package, version=version_, **qp)
+                if journal is not None:
+                    journal.record(journal_key, "planned", file=info.get("file-name"), hashes=info["hashes"])
+
+                must_transfer, planned_file_path = self._plan_one_download(
+                    ud=ud,
+                    info=info,
+                )
+                if must_transfer is False and planned_file_path is not None:
+                    # skip without requesting a download URL, so no download capacity is used
+                    logger.info("planned skip: version %s, existing file: %s", version_, planned_file_path)
+                    chosen[version_]["target_file_path"] = os.path.realpath(planned_file_path)
+                    chosen[version_]["downloaded"] = False
+                    if journal is not None:
+                        journal.record_renamed(journal_key, planned_file_path)
+                    continue
+
+                if info.get("file-name") is not None:
+                    # the same artifact may already be in the blob store from another package or version
+                    linked, linked_file_path = ud.link_from_blob_store(
+                        target_file_name=info["file-name"],
+                        hashes=info["hashes"],
+                    )
+                    if linked is True:
+                        logger.info("from blob store: version %s, file: %s", version_, linked_file_path)
+                        chosen[version_]["target_file_path"] = linked_file_path
+                        chosen[version_]["downloaded"] = False
+                        chosen[version_]["from_blob_store"] = True
+                        if journal is not None:
+                            journal.record_renamed(journal_key, linked_file_path)
+                        continue
+
+                logger.info("try download: version %s, with info: %s", version_, info)
+                if journal is not None:
+                    journal.record(journal_key, "in-progress")
+
+                download_status, target_file_path = self._do_one_download(
+                    project=project,
+                    package=package,
+                    version=version_,
+                    info=info,
+                    ud=ud,
+                    auto_adapt_to_throttle=auto_adapt_to_throttle,
+                    journal_key=journal_key,
+                    **qp,
+                )
+
+                chosen[version_]["target_file_path"] = os.path.realpath(target_file_path)
+                chosen[version_]["downloaded"] = download_status
+        finally:
+            # the records of this call are saved once, not per file; a manifest passed in is flushed by its owner
+            if ud.manifest is not None and manifest is None:
+                ud.manifest.flush()
 
         return chosen
 
@@ -156,6 +353,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         version: str | None = None,
         with_sort: bool = True,
         auto_adapt_to_throttle: bool = False,
+        list_items: Dict[str, Dict[str, Any]] | None = None,
     ) -> List[str]:
 
         data = self.list(
@@ -169,8 +367,15 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             msg = f"NO DATA FOUND with list({project},{package},{version}) :: {data.status_code} {data.text}"
             raise SpectraAssureUnexpectedNoDataFound(msg)
 
+        json_data = data.json()
+        if list_items is not None:
+            # keep the per version items so we can reuse them later instead of listing each version again
+            for item in json_data.get("versions") or []:
+                if item.get("version"):
+                    list_items[item["version"]] = item
+
         return self._flatten_list(
-            data.json(),
+            json_data,
             multiple="versions",
             single="version",
             with_sort=with_sort,
@@ -182,6 +387,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         project: str,
         package: str,
         auto_adapt_to_throttle: bool = False,
+        list_items: Dict[str, Dict[str, Any]] | None = None,
     ) -> List[str]:
         version_list: List[str] = []
 
@@ -189,6 +395,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             project=project,
             package=package,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
+            list_items=list_items,
         ):
             version_list.append(version)
 
@@ -201,6 +408,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         package: str,
         version: str | None = None,
         auto_adapt_to_throttle: bool = False,
+        list_items: Dict[str, Dict[str, Any]] | None = None,
     ) -> Dict[str, Dict[str, Any]]:
         info_dict: Dict[str, Dict[str, Any]] = {}
 
@@ -214,6 +422,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             project=project,
             package=package,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
+            list_items=list_items,
         )
 
         for version_ in version_list:
@@ -227,46 +436,47 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         project: str,
         package: str,
         version: str,
-        skip: List[str],
+        skip: Set[str],
         info_dict: Dict[str, Dict[str, Any]],
+        criteria: SpectraAssureDownloadCriteria,
     ) -> None:
         if info_dict[version]["analysis"].lower() != "done":
             # waiting on 'done', was already completed while fetching the VersionStatus data
             msg = f"{project}/{package}@{version} has not yet finished processing; it will be skipped"
             if version not in skip:
-                skip.append(version)
+                skip.add(version)
                 logger.info(msg)
             return
 
-        if self.download_criteria.must_be_approved is True:
+        if criteria.must_be_approved is True:
             msg = f"{project}/{package}@{version} has not been approved; it will be skipped"
             if info_dict[version]["approved"].lower() != "approved":
                 if version not in skip:
-                    skip.append(version)
+                    skip.add(version)
                     logger.info(msg)
                 return
 
     @staticmethod
     def _update_time_for_repeat(
-        current_time: int,
-        step_time: int,
+        current_time: float,
+        step_time: float,
         msg: str,
-    ) -> int:
+    ) -> Tuple[float, float]:
         logger.info(msg)
         time.sleep(step_time)
         current_time += step_time
-        return current_time
+        # poll quickly at first, then back off; a scan that just finished is noticed within a second or two
+        step_time = min(step_time * 1.5, 30.0)
+        return current_time, step_time
 
-    def _get_start_times_for_repeat(self) -> Tuple[int, int, int]:
+    @staticmethod
+    def _get_start_times_for_repeat(
+        criteria: SpectraAssureDownloadCriteria,
+    ) -> Tuple[float, float, float]:
         # prep time settings
-        max_time = self.download_criteria.max_wait_time_for_scan_done
-
-        step_time = int(self.download_criteria.max_wait_time_for_scan_done / 5)
-        step_time = max(step_time, 10)
-        if step_time > 60:
-            step_time = 30
-
-        current_time = 0
+        max_time = float(criteria.max_wait_time_for_scan_done)
+        step_time = 1.0
+        current_time = 0.0
 
         return current_time, step_time, max_time
 
@@ -276,11 +486,12 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         project: str,
         package: str,
         version: str,
+        criteria: SpectraAssureDownloadCriteria,
         auto_adapt_to_throttle: bool = False,
     ) -> Dict[str, Any]:
         a_dict: Dict[str, Any] = {}
 
-        current_time, step_time, max_time = self._get_start_times_for_repeat()
+        current_time, step_time, max_time = self._get_start_times_for_repeat(criteria)
 
         while True:
             data = self.status(
@@ -297,13 +508,15 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
                 "analysis": "analysis/status",  # we are looking for "done"
                 "quality": "analysis/report/info/statistics/quality/status",
                 "hashes": "analysis/report/info/file/hashes",
+                "file-name": "analysis/report/info/file/name",  # lets us plan the download before asking for a URL
             }
+            json_data = data.json()
             for k, path in path_info.items():
-                a_dict[k] = self._get_path(path=path, data=data.json())
-                if a_dict[k] is not None and k != "hashes":
+                a_dict[k] = self._get_path(path=path, data=json_data)
+                if a_dict[k] is not None and k not in ["hashes", "file-name"]:
                     a_dict[k] = a_dict[k].lower()
 
-            if self.download_criteria.wait_for_scan_done is False:
+            if criteria.wait_for_scan_done is False:
                 return a_dict
 
             if a_dict["analysis"].lower() == "done":
@@ -311,9 +524,9 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             # pylint: disable-next=line-too-long
             msg = (
                 f"waiting for analysis to finish on: {project}/{package}@{version}"
-                + " (max {max_time}s, current {current_time}s"
+                + f" (max {max_time:.0f}s, current {current_time:.0f}s)"
             )
-            current_time = self._update_time_for_repeat(
+            current_time, step_time = self._update_time_for_repeat(
                 current_time,
                 step_time,
                 msg,
@@ -327,14 +540,16 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         project: str,
         package: str,
         version: str,
-        skip: List[str],  # pylint: disable=unused-argument
+        skip: Set[str],  # pylint: disable=unused-argument
         info_dict: Dict[str, Dict[str, Any]],
+        criteria: SpectraAssureDownloadCriteria,
         auto_adapt_to_throttle: bool = False,
     ) -> None:
         a_dict = self._get_info_status(
             project=project,
             package=package,
             version=version,
+            criteria=criteria,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
         )
 
@@ -345,20 +560,18 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         self,
         *,
         info_dict: Dict[str, Any],
-        skip: List[str],
+        skip: Set[str],
     ) -> Dict[str, Dict[str, Any]]:
         result_dict: Dict[str, Dict[str, Any]] = {}
 
+        # the info dicts are ours, so we reuse them instead of copying every version
         for version, info in info_dict.items():
             if version in skip:
                 continue
 
-            result_dict[version] = {}
-            for k, v in info.items():
-                result_dict[version][k] = v
-
-                if k in ["hashes"]:
-                    result_dict[version][k] = self._extract_hashes(v)
+            if "hashes" in info:
+                info["hashes"] = self._extract_hashes(info["hashes"])
+            result_dict[version] = info
 
         logger.info("candidate versions after skip removal: %s", result_dict.keys())
 
@@ -371,41 +584,46 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         project: str,
         package: str,
         version: str,
-        skip: List[str],  # pylint: disable=unused-argument
+        skip: Set[str],  # pylint: disable=unused-argument
         info_dict: Dict[str, Dict[str, Any]],
         auto_adapt_to_throttle: bool = False,
+        list_item: Dict[str, Any] | None = None,
     ) -> None:
-        # get the data
-        data = self.list(
-            project=project,
-            package=package,
-            version=version,
-            auto_adapt_to_throttle=auto_adapt_to_throttle,
-        )
-        if data.status_code != 200:
-            msg = f"NO DATA FOUND with list({project},{package},{version}) :: {data.status_code} {data.text}"
-            raise SpectraAssureUnexpectedNoDataFound(msg)
-
-        # process the data
         path_info: Dict[str, str] = {
             "approved": "approval_status",  # we are looking for "approved"
             "approval-stamp": "approval_information/timestamp",
             "released": "is_released",
         }
 
+        # reuse the version fields from the package level list() if they are all present
+        json_data = list_item
+        if json_data is None or not all(path.split("/")[0] in json_data for path in path_info.values()):
+            data = self.list(
+                project=project,
+                package=package,
+                version=version,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+            )
+            if data.status_code != 200:
+                msg = f"NO DATA FOUND with list({project},{package},{version}) :: {data.status_code} {data.text}"
+                raise SpectraAssureUnexpectedNoDataFound(msg)
+            json_data = data.json()
+
+        # process the data
         a_dict: Dict[str, Any] = {}
         for k, path in path_info.items():
-            a_dict[k] = self._get_path(path=path, data=data.json())
+            a_dict[k] = self._get_path(path=path, data=json_data)
             if a_dict[k] is not None and isinstance(a_dict[k], str):
                 a_dict[k] = a_dict[k].lower()
 
         for k, v in a_dict.items():
             info_dict[version][k] = v
 
+    @staticmethod
     def _filter_latest_approved_version(
-        self,
         *,
         temp_result_dict: Dict[str, Dict[str, Any]],
+        criteria: SpectraAssureDownloadCriteria,
     ) -> str:
         # sort by latest approval timestamp
 
@@ -419,7 +637,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         latest_most_recent = sorted_by_time[-1]  # let's assume this is actually unique
         latest_version_string = tt[latest_most_recent]
 
-        msg = f"strategy {self.download_criteria.current_strategy} selected {latest_version_string}"
+        msg = f"strategy {criteria.current_strategy} selected {latest_version_string}"
         logger.info(msg)
 
         return latest_version_string
@@ -428,9 +646,8 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         self,
         *,
         result_dict: Dict[str, Dict[str, Any]],
+        criteria: SpectraAssureDownloadCriteria,
     ) -> Dict[str, Dict[str, Any]] | None:
-        assert self.download_criteria is not None
-
         if len(result_dict) == 0:
             msg = "no versions exist after filters have been applied"
             logger.info(msg)
@@ -441,18 +658,18 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             logger.info(msg)
             return result_dict
 
-        if self.download_criteria.current_strategy.lower() == "AllApproved".lower():
-            msg = f"used strategy {self.download_criteria.current_strategy} on {result_dict.keys()}"
+        if criteria.current_strategy.lower() == "AllApproved".lower():
+            msg = f"used strategy {criteria.current_strategy} on {result_dict.keys()}"
             logger.info(msg)
             return result_dict
 
-        if self.download_criteria.current_strategy.lower() == "LatestApproved_ByApprovalTimeStamp".lower():
-            msg = f"used strategy {self.download_criteria.current_strategy} on {result_dict.keys()}"
+        if criteria.current_strategy.lower() == "LatestApproved_ByApprovalTimeStamp".lower():
+            msg = f"used strategy {criteria.current_strategy} on {result_dict.keys()}"
             logger.info(msg)
-            latest = self._filter_latest_approved_version(temp_result_dict=result_dict)
+            latest = self._filter_latest_approved_version(temp_result_dict=result_dict, criteria=criteria)
             return {latest: result_dict[latest]}
 
-        msg = f"unsupported strategy {self.download_criteria.current_strategy}"
+        msg = f"unsupported strategy {criteria.current_strategy}"
         logger.info(msg)
         raise SpectraAssureUnsupportedStrategy(msg)
 
@@ -462,29 +679,44 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         project: str,
         package: str,
         version: str | None = None,
+        criteria: SpectraAssureDownloadCriteria,
         auto_adapt_to_throttle: bool = False,
+        journal: UrlDownloaderJournal | None = None,
+        list_items: Dict[str, Dict[str, Any]] | None = None,
         **qp: Any,
     ) -> Dict[str, Dict[str, Any]] | None:
-        skip: List[str] = []
+        skip: Set[str] = set()  # a set: with many versions, a list makes the skip checks quadratic
+        # the items of a package level list() the caller already made, see: sync()
+        list_items = dict(list_items or {})
 
         info_dict = self._make_initial_info_dict_on_all_versions_in_this_package(
             project=project,
             package=package,
             version=version,  # may be None
             auto_adapt_to_throttle=auto_adapt_to_throttle,
+            list_items=list_items,
         )
 
         # from now on version is no longer None
         for version_ in info_dict:
             logger.debug("%s/%s@%s", project, package, version_)
-            self._do_status(
-                project=project,
-                package=package,
-                version=version_,
-                skip=skip,
-                info_dict=info_dict,
-                auto_adapt_to_throttle=auto_adapt_to_throttle,
-            )
+            entry = None
+            if journal is not None:
+                entry = journal.completed(self._journal_key(project=project, package=package, version=version_, **qp))
+
+            if entry is not None:
+                # completed in an earlier run, no status() needed
+                info_dict[version_].update(self._info_from_journal(entry))
+            else:
+                self._do_status(
+                    project=project,
+                    package=package,
+                    version=version_,
+                    skip=skip,
+                    info_dict=info_dict,
+                    criteria=criteria,
+                    auto_adapt_to_throttle=auto_adapt_to_throttle,
+                )
             self._do_list(
                 project=project,
                 package=package,
@@ -492,6 +724,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
                 skip=skip,
                 info_dict=info_dict,
                 auto_adapt_to_throttle=auto_adapt_to_throttle,
+                list_item=list_items.pop(version_, None),  # used once, free it as we go
             )
 
             self._update_skip_list(
@@ -500,6 +733,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
                 version=version_,
                 skip=skip,
                 info_dict=info_dict,
+                criteria=criteria,
             )
 
         logger.info("candidate versions: %s", info_dict.keys())
@@ -512,6 +746,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
 
         return self._select_version_from_result(
             result_dict=result_dict,
+            criteria=criteria,
         )
 
     def _prep_candidates(
@@ -520,13 +755,14 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
         target_dir: str,  # pylint: disable=unused-argument
         project: str,
         package: str,
+        criteria: SpectraAssureDownloadCriteria,
         version: str | None = None,
         auto_adapt_to_throttle: bool = False,
+        journal: UrlDownloaderJournal | None = None,
+        list_items: Dict[str, Dict[str, Any]] | None = None,
         **qp: Any,
     ) -> Dict[str, Dict[str, Any]] | None:
-
-        assert self.download_criteria is not None
-        self.download_criteria.must_be_approved = True  # Force True, we only currently support approved versions
+        assert criteria.must_be_approved is True  # we only currently support approved versions, see: _prep_criteria()
 
         what = self._what(
             project=project,
@@ -548,10 +784,76 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
             project=project,
             package=package,
             version=version,
+            criteria=criteria,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
+            journal=journal,
+            list_items=list_items,
             **valid_qp,
         )
 
+    def _download(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        target_dir: str,
+        project: str,
+        package: str,
+        criteria: SpectraAssureDownloadCriteria,
+        version: str | None = None,
+        auto_adapt_to_throttle: bool = False,
+        journal: UrlDownloaderJournal | None = None,
+        list_items: Dict[str, Dict[str, Any]] | None = None,
+        manifest: UrlDownloaderManifest | None = None,
+        **qp: Any,
+    ) -> Dict[str, Dict[str, Any]] | None:
+        # download() after its arguments are validated; 'target_dir' is a posix path that exists
+
+        # only the query parameters status() gets, so the journal keys are the same for the lookup and the record
+        qp = self.qp_download(
+            what=self._what(project=project, package=package, version=version),
+            **qp,
+        )
+
+        if journal is not None:
+            if version is not None:
+                key = self._journal_key(project=project, package=package, version=version, **qp)
+                entry = journal.completed(key)
+                if entry is not None:
+                    # completed in an earlier run: no Portal request and no rehash
+                    logger.info("from journal: %s, file: %s", key, entry["path"])
+                    info = self._info_from_journal(entry)
+                    info["hashes"] = self._extract_hashes(info["hashes"])
+                    info["downloaded"] = False
+                    return {version: info}
+
+        # find the version(s) and see if they are candidates
+        chosen = self._prep_candidates(
+            target_dir=target_dir,
+            project=project,
+            package=package,
+            version=version,
+            criteria=criteria,
+            auto_adapt_to_throttle=auto_adapt_to_throttle,
+            journal=journal,
+            list_items=list_items,
+            **qp,
+        )
+
+        if chosen is None:
+            logger.info("the resulting candidate list is empty")
+            return None
+
+        return self._process_candidates(
+            target_dir=target_dir,
+            project=project,
+            package=package,
+            chosen=chosen,
+            criteria=criteria,
+            auto_adapt_to_throttle=auto_adapt_to_throttle,
+            journal=journal,
+            manifest=manifest,
+            **qp,
+        )
+
     # PUBLIC
     @staticmethod
     def qp_download(
@@ -566,6 +868,7 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
                     r[k] = qp[k]
         return r
 
+    @profiled
     def download(  # pylint: disable=too-many-arguments
         self,
         *,
@@ -646,29 +949,23 @@ class SpectraAssureApiOperationsDownload(  # pylint: disable=too-many-ancestors
 
             Using status() with 'download' directly influences your Spectra Assure Portal download capacity.
 
+            The 'download_criteria' are not modified (a copy is used), so one criteria object
+            can be shared by concurrent downloads on the same client.
         """
-        self._prep_criteria(download_criteria)
+        criteria = self._prep_criteria(download_criteria)
         target_dir_posix = self._validate_target_dir(target_dir)
 
-        # find the version(s) and see if they are candidates
-        chosen = self._prep_candidates(
-            target_dir=target_dir_posix,
-            project=project,
-            package=package,
-            version=version,
-            auto_adapt_to_throttle=auto_adapt_to_throttle,
-            **qp,
-        )
-
-        if chosen is None:
-            logger.info("the resulting candidate list is empty")
-            return None
+        journal: UrlDownloaderJournal | None = None
+        if criteria.with_journal is True:
+            journal = UrlDownloaderJournal(target_dir=target_dir_posix)
 
-        return self._process_candidates(
+        return self._download(
             target_dir=target_dir_posix,
             project=project,
             package=package,
-            chosen=chosen,
+            version=version,
+            criteria=criteria,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
+            journal=journal,
             **qp,
         )
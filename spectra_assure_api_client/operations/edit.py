@@ -6,6 +6,7 @@ from typing import (
 
 import logging
 
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -50,6 +51,7 @@ class SpectraAssureApiOperationsEdit(  # pylint: disable=too-many-ancestors
 
         return r
 
+    @profiled
     def edit(
         self,
         *,
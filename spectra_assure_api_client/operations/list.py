@@ -4,6 +4,7 @@ from typing import (
 
 import logging
 
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -17,6 +18,7 @@ logger = logging.getLogger(__name__)
 class SpectraAssureApiOperationsList(  # pylint: disable=too-many-ancestors
     SpectraAssureApiOperationsBase,
 ):  # pylint: disable=too-many-instance-attributes
+    @profiled
     def list(
         self,
         *,
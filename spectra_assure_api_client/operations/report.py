@@ -5,6 +5,7 @@ from typing import (
     List,
 )
 
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -41,6 +42,7 @@ class SpectraAssureApiOperationsReport(  # pylint: disable=too-many-ancestors
                     r[k] = qp[k]
         return r
 
+    @profiled
     def report(  # pylint: disable=too-many-arguments
         self,
         *,
@@ -7,6 +7,8 @@ from typing import (
 import os
 import logging
 
+from spectra_assure_api_client.communication.profiling import profiled
+from spectra_assure_api_client.communication.bandwidth import SpectraAssureBandwidthLimiter
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -59,6 +61,7 @@ class SpectraAssureApiOperationsScan(  # pylint: disable=too-many-ancestors
 
         return r
 
+    @profiled
     def scan(  # pylint: disable=too-many-arguments
         self,
         *,
@@ -67,6 +70,7 @@ class SpectraAssureApiOperationsScan(  # pylint: disable=too-many-ancestors
         version: str,
         file_path: str,
         auto_adapt_to_throttle: bool = False,
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None,
         **qp: Any,
     ) -> Any:
         """
@@ -81,6 +85,8 @@ class SpectraAssureApiOperationsScan(  # pylint: disable=too-many-ancestors
          - version: str, mandatory.
          - file_path: str, mandatory, must exist
          - auto_adapt_to_throttle: bool, default False, optional.
+         - bandwidth_limiter: SpectraAssureBandwidthLimiter | None, default None, optional;
+            Limit the upload rate of this transfer; the limit of the client applies as well.
          - qp: Dict[str,Any] , optional.
 
         Return:
@@ -133,5 +139,6 @@ class SpectraAssureApiOperationsScan(  # pylint: disable=too-many-ancestors
             url=url,
             auto_adapt_to_throttle=auto_adapt_to_throttle,
             file_path=file_path,
+            bandwidth_limiter=bandwidth_limiter,
             **valid_qp,
         )
@@ -0,0 +1,216 @@
+import concurrent.futures
+import logging
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Set,
+)
+
+from spectra_assure_api_client.communication.profiling import profiled
+from spectra_assure_api_client.communication.bandwidth import SpectraAssureBandwidthLimiter
+from spectra_assure_api_client.communication.exceptions import (
+    SpectraAssureInvalidAction,
+    SpectraAssureScanJobFailed,
+)
+from .report import SpectraAssureApiOperationsReport
+from .scan_tracker import SpectraAssureScanTracker
+from .wait import SpectraAssureApiOperationsWait
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureApiOperationsScanAsync(  # pylint: disable=too-many-ancestors
+    SpectraAssureApiOperationsWait,
+):
+
+    def _init_transport(
+        self,
+        **kwargs: Any,
+    ) -> None:
+        super()._init_transport(**kwargs)
+
+        # created on the first submit_scan(), shared by all jobs of this client
+        self._scan_tracker: SpectraAssureScanTracker | None = None
+        self._scan_tracker_lock = threading.Lock()
+
+    def _transport_attributes(self) -> Set[str]:
+        # the jobs of the tracker stay with the process that submitted them
+        return super()._transport_attributes() | {"_scan_tracker", "_scan_tracker_lock"}
+
+    def _init_view(self) -> None:
+        super()._init_view()
+        # the tracker polls with the organization and group of its client
+        self._scan_tracker = None
+        self._scan_tracker_lock = threading.Lock()
+
+    def _get_scan_tracker(self) -> SpectraAssureScanTracker:
+        with self._scan_tracker_lock:
+            if self._scan_tracker is None:
+                self._scan_tracker = SpectraAssureScanTracker(
+                    poll=self._poll_scan_job,
+                    collect=self._collect_scan_job,
+                )
+            return self._scan_tracker
+
+    def _poll_scan_job(
+        self,
+        purl: str,
+    ) -> Dict[str, Any]:
+        return self._poll_status_once(
+            purl=purl,
+            auto_adapt_to_throttle=True,
+        )
+
+    def _collect_scan_job(
+        self,
+        purl: str,
+        status_result: Dict[str, Any],
+        options: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        project, package, version = self._split_purl(purl)
+        result: Dict[str, Any] = {
+            "purl": purl,
+            "project": project,
+            "package": package,
+            "version": version,
+            "status": status_result["data"],
+            "checks": None,
+            "reports": {},
+            "errors": {},
+        }
+
+        what = {
+            "project": project,
+            "package": package,
+            "version": version,
+            "auto_adapt_to_throttle": options["auto_adapt_to_throttle"],
+        }
+
+        # a failing prefetch does not fail the job, the analysis itself is done
+        if options["prefetch_checks"] is True:
+            try:
+                data = self.checks(**what)
+                if data.status_code == 200:
+                    result["checks"] = data.json()
+                else:
+                    result["errors"]["checks"] = f"{data.status_code} {data.text}"
+            except Exception as e:  # pylint:disable=broad-exception-caught
+                result["errors"]["checks"] = str(e)
+
+        for report_type in options["prefetch_reports"]:
+            try:
+                data = self.report(report_type=report_type, **what)
+                if data.status_code != 200:
+                    result["errors"][report_type] = f"{data.status_code} {data.text}"
+                    continue
+                try:
+                    result["reports"][report_type] = data.json()
+                except ValueError:
+                    result["reports"][report_type] = data.text  # not all report types are json
+            except Exception as e:  # pylint:disable=broad-exception-caught
+                result["errors"][report_type] = str(e)
+
+        return result
+
+    # PUBLIC
+
+    @profiled
+    def submit_scan(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        project: str,
+        package: str,
+        version: str,
+        file_path: str,
+        timeout: int = 3600,  # in seconds
+        prefetch_checks: bool = False,
+        prefetch_reports: List[str] | None = None,
+        auto_adapt_to_throttle: bool = False,
+        bandwidth_limiter: SpectraAssureBandwidthLimiter | None = None,
+        **qp: Any,
+    ) -> concurrent.futures.Future[Dict[str, Any]]:
+        """
+        Action:
+            Upload a file with scan() and return a job handle
+            that resolves in the background when the analysis is done.
+
+        Args:
+         - project: str, mandatory.
+         - package: str, mandatory.
+         - version: str, mandatory.
+         - file_path: str, mandatory, must exist.
+
+         - timeout: int, default 3600, optional;
+            The time in seconds after the upload we wait for the analysis to finish.
+
+         - prefetch_checks: bool, default False, optional;
+            Also fetch checks() when the analysis is done.
+
+         - prefetch_reports: List[str] | None, default None, optional;
+            The report types (see: report()) to fetch when the analysis is done.
+
+         - auto_adapt_to_throttle: bool, default False, optional;
+            Used for the upload and the prefetch requests; status polling always adapts to throttling.
+
+         - bandwidth_limiter: SpectraAssureBandwidthLimiter | None, default None, optional;
+            Limit the upload rate of this transfer; the limit of the client applies as well.
+
+         - qp: Dict[str,Any], optional; the query parameters of scan().
+
+        Return:
+            A concurrent.futures.Future; its result is a dict with:
+             - purl, project, package, version
+             - status: the json of the last status response
+             - checks: the json of checks() or None
+             - reports: dict report_type -> json (or text)
+             - errors: dict 'checks' or report_type -> error message for failed prefetch requests
+             - elapsed: the seconds from the end of the upload until the result was complete
+
+        Raises:
+            SpectraAssureInvalidAction: on invalid arguments, as scan() would.
+
+            The future raises SpectraAssureScanJobFailed
+            if the upload fails, if status() shows a client error, or if the analysis is not done in time.
+
+        Notes:
+            The upload runs in the calling thread; polling and prefetching run in the background.
+            All jobs of a client share a single poller thread with an adaptive interval,
+            so a pipeline can upload everything first and then collect the results with maximal overlap.
+            Use concurrent.futures.as_completed() or wait() on the returned futures,
+            or wrap them with asyncio.wrap_future() to await them.
+        """
+        prefetch_reports = prefetch_reports or []
+        r_type_list = sorted(SpectraAssureApiOperationsReport.current_report_names())
+        for report_type in prefetch_reports:
+            if report_type not in r_type_list:
+                msg = f"'prefetch_reports' is not valid, must be a list of: {', '.join(r_type_list)}"
+                raise SpectraAssureInvalidAction(message=msg)
+
+        purl = f"{project}/{package}@{version}"
+        response = self.scan(
+            project=project,
+            package=package,
+            version=version,
+            file_path=file_path,
+            auto_adapt_to_throttle=auto_adapt_to_throttle,
+            bandwidth_limiter=bandwidth_limiter,
+            **qp,
+        )
+        if response.status_code >= 300:
+            future: concurrent.futures.Future[Dict[str, Any]] = concurrent.futures.Future()
+            msg = f"scan upload of {purl} failed: {response.status_code} {response.text}"
+            future.set_exception(SpectraAssureScanJobFailed(msg))
+            return future
+
+        options = {
+            "prefetch_checks": prefetch_checks,
+            "prefetch_reports": prefetch_reports,
+            "auto_adapt_to_throttle": auto_adapt_to_throttle,
+        }
+        return self._get_scan_tracker().track(
+            purl=purl,
+            timeout=timeout,
+            options=options,
+        )
@@ -0,0 +1,194 @@
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+)
+
+from spectra_assure_api_client.communication.exceptions import (
+    SpectraAssureScanJobFailed,
+)
+from spectra_assure_api_client.communication.poll_schedule import SpectraAssurePollSchedule
+
+logger = logging.getLogger(__name__)
+
+
+class _ScanJob:  # pylint: disable=too-few-public-methods
+    def __init__(
+        self,
+        *,
+        purl: str,
+        deadline: float,
+        options: Dict[str, Any],
+    ) -> None:
+        self.purl = purl
+        self.deadline = deadline
+        self.options = options
+        self.start = time.monotonic()
+        self.future: concurrent.futures.Future[Dict[str, Any]] = concurrent.futures.Future()
+
+
+class SpectraAssureScanTracker:
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        poll: Callable[[str], Dict[str, Any]],
+        collect: Callable[[str, Dict[str, Any], Dict[str, Any]], Dict[str, Any]],
+        initial_interval: float = 1.0,  # in seconds
+        max_interval: float = 30.0,  # in seconds
+        backoff: float = 1.5,
+        max_workers: int = 4,
+    ) -> None:
+        """
+        Action:
+            Initialize a tracker that resolves scan job futures from a single background poller thread.
+
+        Args:
+         - poll: Callable[[purl], Dict], mandatory;
+            Polls the status of one version once, see: SpectraAssureApiOperationsWait._poll_status_once().
+
+         - collect: Callable[[purl, status result, options], Dict], mandatory;
+            Builds the result of a finished job, e.g. by fetching checks and reports.
+            It runs in a small thread pool, so a slow report never delays the polling of other jobs.
+
+         - initial_interval, max_interval, backoff: the adaptive poll schedule, see: SpectraAssurePollSchedule.
+
+         - max_workers: int, default 4, optional;
+            The number of threads used to collect the results of finished jobs.
+
+        Notes:
+            The poller thread only runs while there are jobs to track.
+            The timeout of a job is checked after each poll, so it is accurate to about 'max_interval'.
+        """
+        self._poll = poll
+        self._collect = collect
+        self.max_workers = max_workers
+
+        self._schedule = SpectraAssurePollSchedule(
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            backoff=backoff,
+        )
+        self._jobs: Dict[str, _ScanJob] = {}
+        self._wakeup = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def _start_thread(self) -> None:
+        # call with self._wakeup held
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="spectra-assure-scan-tracker",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _finish(
+        self,
+        job: _ScanJob,
+        result: Dict[str, Any],
+    ) -> None:
+        with self._wakeup:
+            self._schedule.remove(job.purl)
+            self._jobs.pop(job.purl, None)
+
+        if not job.future.set_running_or_notify_cancel():
+            return  # cancelled by the caller
+
+        if result["done"] is False:
+            msg = f"scan job {job.purl} did not finish: {result['status_code']} {result['analysis']}"
+            if result["final"] is False:
+                msg = f"scan job {job.purl} not done after {time.monotonic() - job.start:.0f} seconds: {result['analysis']}"
+            job.future.set_exception(SpectraAssureScanJobFailed(msg))
+            return
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="spectra-assure-scan-collect",
+            )
+        self._executor.submit(self._collect_into_future, job, result)
+
+    def _collect_into_future(
+        self,
+        job: _ScanJob,
+        result: Dict[str, Any],
+    ) -> None:
+        try:
+            collected = self._collect(job.purl, result, job.options)
+            collected["elapsed"] = time.monotonic() - job.start
+            job.future.set_result(collected)
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            job.future.set_exception(e)
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                item = self._schedule.next_due()
+                if item is None:
+                    self._thread = None
+                    return
+
+                purl, delay = item
+                if delay > 0:
+                    # a newly submitted job may be due earlier, so re-evaluate after waking up
+                    self._wakeup.wait(timeout=delay)
+                    continue
+
+                job = self._jobs[purl]
+
+            if job.future.cancelled():
+                with self._wakeup:
+                    self._schedule.remove(purl)
+                    self._jobs.pop(purl, None)
+                continue
+
+            try:
+                result = self._poll(purl)
+            except Exception as e:  # pylint:disable=broad-exception-caught
+                logger.warning("status of %s failed, will retry; %s", purl, e)
+                result = {"done": False, "final": False, "status_code": None, "analysis": None}
+
+            if result["final"] is True or time.monotonic() >= job.deadline:
+                self._finish(job, result)
+                continue
+
+            self._schedule.reschedule(purl)
+
+    # PUBLIC
+
+    def track(
+        self,
+        *,
+        purl: str,
+        timeout: float,  # in seconds
+        options: Dict[str, Any],
+    ) -> concurrent.futures.Future[Dict[str, Any]]:
+        """
+        Return:
+            A future that resolves when the analysis of 'purl' is done.
+            If the version is already tracked, the existing future is returned.
+        """
+        with self._wakeup:
+            job = self._jobs.get(purl)
+            if job is not None:
+                return job.future
+
+            job = _ScanJob(purl=purl, deadline=time.monotonic() + timeout, options=options)
+            self._jobs[purl] = job
+            self._schedule.add(purl)
+            self._start_thread()
+            self._wakeup.notify()
+
+        return job.future
+
+    def pending(self) -> int:
+        with self._wakeup:
+            return len(self._jobs)
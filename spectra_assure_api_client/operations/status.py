@@ -7,6 +7,7 @@ from typing import (
 import logging
 
 
+from spectra_assure_api_client.communication.profiling import profiled
 from spectra_assure_api_client.communication.exceptions import (
     SpectraAssureInvalidAction,
 )
@@ -21,6 +22,7 @@ class SpectraAssureApiOperationsStatus(  # pylint: disable=too-many-ancestors
     SpectraAssureApiOperationsBase,
 ):  # pylint: disable=too-many-instance-attributes
 
+    @profiled
     def status(
         self,
         *,
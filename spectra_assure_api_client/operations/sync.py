@@ -0,0 +1,443 @@
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+)
+
+from spectra_assure_api_client.communication.profiling import profiled
+from spectra_assure_api_client.communication.bandwidth import SpectraAssureBandwidthLimiter
+from spectra_assure_api_client.communication.download_criteria import SpectraAssureDownloadCriteria
+from spectra_assure_api_client.communication.download_journal import UrlDownloaderJournal
+from spectra_assure_api_client.communication.downloader_manifest import UrlDownloaderManifest
+from spectra_assure_api_client.communication.exceptions import (
+    SpectraAssureInvalidPath,
+    SpectraAssureUnexpectedNoDataFound,
+)
+from spectra_assure_api_client.communication.sync_state import (
+    SYNC_STATE_FILE_NAME,
+    SpectraAssureSyncState,
+)
+from .download import SpectraAssureApiOperationsDownload
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureApiOperationsSync(  # pylint: disable=too-many-ancestors
+    SpectraAssureApiOperationsDownload,
+):
+
+    def _sync_list_names(
+        self,
+        *,
+        multiple: str,
+        auto_adapt_to_throttle: bool,
+        **what: Any,
+    ) -> List[str]:
+        data = self.list(auto_adapt_to_throttle=auto_adapt_to_throttle, **what)
+        if data.status_code != 200:
+            msg = f"NO DATA FOUND with list({what}) :: {data.status_code} {data.text}"
+            raise SpectraAssureUnexpectedNoDataFound(msg)
+
+        return self._flatten_list(data.json(), multiple=multiple, single="name")
+
+    def _sync_discover(
+        self,
+        *,
+        projects: List[str] | None,
+        max_workers: int,
+        auto_adapt_to_throttle: bool,
+        report: Dict[str, Any],
+    ) -> List[Tuple[str, str]]:
+        if projects is None:
+            projects = self._sync_list_names(multiple="projects", auto_adapt_to_throttle=auto_adapt_to_throttle)
+
+        packages: List[Tuple[str, str]] = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(
+                    self._sync_list_names,
+                    multiple="packages",
+                    auto_adapt_to_throttle=auto_adapt_to_throttle,
+                    project=project,
+                ): project
+                for project in projects
+            }
+            for future in concurrent.futures.as_completed(futures):
+                project = futures[future]
+                try:
+                    packages.extend((project, package) for package in future.result())
+                except Exception as e:  # pylint:disable=broad-exception-caught
+                    logger.error("cannot list the packages of %s; %s", project, e)
+                    report["errors"].append({"target": project, "error": str(e)})
+
+        return sorted(packages)
+
+    @staticmethod
+    def _sync_select_versions(
+        *,
+        items: List[Dict[str, Any]],
+        criteria: SpectraAssureDownloadCriteria,
+    ) -> List[str]:
+        approved: Dict[str, str] = {}  # version -> approval timestamp
+        for item in items:
+            if item.get("version") and str(item.get("approval_status", "")).lower() == "approved":
+                approved[item["version"]] = str((item.get("approval_information") or {}).get("timestamp", ""))
+
+        if len(approved) == 0:
+            return []
+
+        if criteria.current_strategy.lower() == "AllApproved".lower():
+            return sorted(approved.keys())
+
+        # LatestApproved_ByApprovalTimeStamp
+        return [max(approved.keys(), key=lambda v: approved[v])]
+
+    def _sync_plan_package(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        target_dir: str,
+        project: str,
+        package: str,
+        criteria: SpectraAssureDownloadCriteria,
+        state: SpectraAssureSyncState,
+        auto_adapt_to_throttle: bool,
+        report: Dict[str, Any],
+        report_lock: threading.Lock,
+    ) -> List[Dict[str, Any]]:
+        # one list() per package: its items select the versions and are reused by the download of each version
+        data = self.list(project=project, package=package, auto_adapt_to_throttle=auto_adapt_to_throttle)
+        if data.status_code != 200:
+            msg = f"NO DATA FOUND with list({project},{package}) :: {data.status_code} {data.text}"
+            raise SpectraAssureUnexpectedNoDataFound(msg)
+
+        items = {item["version"]: item for item in data.json().get("versions") or [] if item.get("version")}
+        versions = self._sync_select_versions(
+            items=list(items.values()),
+            criteria=criteria,
+        )
+
+        new_versions: List[str] = []
+        for version in versions:
+            if state.is_done(f"{project}/{package}@{version}"):
+                with report_lock:
+                    report["unchanged"] += 1
+                continue
+            new_versions.append(version)
+
+        if len(new_versions) == 0:
+            return []
+
+        package_dir = f"{target_dir}/{project}/{package}"
+        os.makedirs(package_dir, exist_ok=True)
+
+        # one journal and manifest per package directory, shared by the concurrent downloads of its versions
+        journal = UrlDownloaderJournal(target_dir=package_dir) if criteria.with_journal is True else None
+        manifest = UrlDownloaderManifest(target_dir=package_dir) if criteria.with_verification_manifest else None
+
+        return [
+            {
+                "project": project,
+                "package": package,
+                "version": version,
+                "list_item": items[version],
+                "package_dir": package_dir,
+                "journal": journal,
+                "manifest": manifest,
+            }
+            for version in new_versions
+        ]
+
+    def _sync_one_version(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        work: Dict[str, Any],
+        criteria: SpectraAssureDownloadCriteria,
+        state: SpectraAssureSyncState,
+        stop_event: threading.Event,
+        auto_adapt_to_throttle: bool,
+        report: Dict[str, Any],
+        report_lock: threading.Lock,
+    ) -> None:
+        if stop_event.is_set():
+            return
+
+        version = work["version"]
+        purl = f"{work['project']}/{work['package']}@{version}"
+        try:
+            result = self._download(
+                target_dir=work["package_dir"],
+                project=work["project"],
+                package=work["package"],
+                version=version,
+                criteria=criteria,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+                journal=work["journal"],
+                manifest=work["manifest"],
+                list_items={version: work["list_item"]},  # no list() per version
+            )
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.error("sync of %s failed; %s", purl, e)
+            with report_lock:
+                report["errors"].append({"target": purl, "error": str(e)})
+            return
+
+        info = (result or {}).get(version) or {}
+        if info.get("target_file_path") is None:
+            return  # e.g. no longer approved
+
+        state.mark_done(
+            purl,
+            file_path=info["target_file_path"],
+            sha256=(info.get("hashes") or {}).get("sha256"),
+        )
+        with report_lock:
+            key = "downloaded" if info.get("downloaded") is True else "verified"
+            report[key].append(purl)
+
+    def _sync_run(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        target_dir: str,
+        projects: List[str] | None,
+        criteria: SpectraAssureDownloadCriteria,
+        state: SpectraAssureSyncState,
+        stop_event: threading.Event,
+        max_workers: int,
+        auto_adapt_to_throttle: bool,
+    ) -> Dict[str, Any]:
+        start = time.monotonic()
+        report: Dict[str, Any] = {
+            "packages": 0,
+            "downloaded": [],
+            "verified": [],
+            "unchanged": 0,
+            "errors": [],
+        }
+        report_lock = threading.Lock()
+
+        try:
+            packages = self._sync_discover(
+                projects=projects,
+                max_workers=max_workers,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+                report=report,
+            )
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.error("cannot list the projects; %s", e)
+            report["errors"].append({"target": "", "error": str(e)})
+            packages = []
+
+        report["packages"] = len(packages)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # first list all packages, then download the new versions of all packages concurrently
+            work: List[Dict[str, Any]] = []
+            futures = {
+                pool.submit(
+                    self._sync_plan_package,
+                    target_dir=target_dir,
+                    project=project,
+                    package=package,
+                    criteria=criteria,
+                    state=state,
+                    auto_adapt_to_throttle=auto_adapt_to_throttle,
+                    report=report,
+                    report_lock=report_lock,
+                ): f"{project}/{package}"
+                for project, package in packages
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    work.extend(future.result())
+                except Exception as e:  # pylint:disable=broad-exception-caught
+                    logger.error("sync of %s failed; %s", futures[future], e)
+                    with report_lock:
+                        report["errors"].append({"target": futures[future], "error": str(e)})
+
+            work.sort(key=lambda w: (w["project"], w["package"], w["version"]))
+            for _ in pool.map(
+                lambda w: self._sync_one_version(
+                    work=w,
+                    criteria=criteria,
+                    state=state,
+                    stop_event=stop_event,
+                    auto_adapt_to_throttle=auto_adapt_to_throttle,
+                    report=report,
+                    report_lock=report_lock,
+                ),
+                work,
+            ):
+                pass
+
+        # the manifests are saved once per package, not per version
+        for manifest in {id(w["manifest"]): w["manifest"] for w in work if w["manifest"] is not None}.values():
+            manifest.flush()
+
+        for k in ["downloaded", "verified"]:
+            report[k].sort()
+        report["elapsed"] = time.monotonic() - start
+        return report
+
+    # PUBLIC
+
+    @profiled
+    def sync(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        *,
+        target_dir: str,
+        projects: List[str] | None = None,
+        download_criteria: SpectraAssureDownloadCriteria | None = None,
+        interval: float = 300.0,  # in seconds
+        max_runs: int | None = 1,
+        stop_event: threading.Event | None = None,
+        max_workers: int = 4,
+        max_bytes_per_second: float | None = None,
+        state_file: str | None = None,
+        on_run: Callable[[Dict[str, Any]], None] | None = None,
+        auto_adapt_to_throttle: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Action:
+            Mirror the approved versions of all packages in the current group (or in the specified projects)
+            to '<target_dir>/<project>/<package>/', repeatedly if requested.
+
+        Args:
+         - target_dir: str, mandatory;
+            The root of the mirror; MUST exist.
+
+         - projects: List[str] | None = None, optional;
+            The projects to mirror; if None, all projects in the group are discovered on every run.
+
+         - download_criteria: SpectraAssureDownloadCriteria | None = None, optional;
+            Selects the versions ('current_strategy') and controls verification, overwrite and the blob store.
+            The criteria you pass are not modified.
+
+         - interval: float = 300.0, optional;
+            The seconds between the start of two runs.
+
+         - max_runs: int | None = 1, optional;
+            The number of runs; None runs until 'stop_event' is set.
+
+         - stop_event: threading.Event | None = None, optional;
+            Set it (e.g. from a signal handler) to stop after the current downloads.
+
+         - max_workers: int = 4, optional;
+            The number of packages listed and versions downloaded concurrently.
+
+         - max_bytes_per_second: float | None = None, optional;
+            Limit the download rate of all concurrent downloads together.
+            Ignored if 'download_criteria' already has a 'bandwidth_limiter'.
+
+         - state_file: str | None = None, optional;
+            The file holding the progress, by default '<target_dir>/.spectra-assure-sync.jsonl'.
+
+         - on_run: Callable[[Dict], None] | None = None, optional;
+            Called with the report of every run.
+
+         - auto_adapt_to_throttle: bool = True, optional.
+
+        Return:
+            The report of the last run, a dict with:
+             - run: int, the number of the run, starting at 1
+             - packages: int, the number of packages inspected
+             - downloaded: list of 'project/package@version' that were downloaded
+             - verified: list of 'project/package@version' whose file already existed (or came from the blob store)
+             - unchanged: int, the number of selected versions already completed in an earlier run
+             - errors: list of {target, error}
+             - elapsed: float, seconds
+
+        Raises:
+            SpectraAssureInvalidPath: if the target directory does not exist.
+
+        Notes:
+            Only versions not completed in an earlier run are inspected with status() or downloaded,
+            so a run costs one list() per package when nothing changed.
+            Errors are reported per package or version and never stop the sync.
+        """
+        target_dir_posix = self.simple_path_to_posix(target_path=target_dir)
+        exists, what = self.exists_posix_path(item_path=target_dir_posix)
+        if exists is False or what != "D":
+            msg = f"the target directory you specified does not exist or is not a directory; {target_dir_posix}"
+            raise SpectraAssureInvalidPath(msg)
+
+        # work on a copy, so the caller's criteria are not modified
+        criteria = self._prep_criteria(download_criteria)
+        if criteria.bandwidth_limiter is None and max_bytes_per_second:
+            criteria.bandwidth_limiter = SpectraAssureBandwidthLimiter(bytes_per_second=max_bytes_per_second)
+
+        state = SpectraAssureSyncState(file_path=state_file or f"{target_dir_posix}/{SYNC_STATE_FILE_NAME}")
+        stop_event = stop_event or threading.Event()
+
+        try:
+            return self._sync_runs(
+                target_dir=target_dir_posix,
+                projects=projects,
+                criteria=criteria,
+                state=state,
+                stop_event=stop_event,
+                interval=interval,
+                max_runs=max_runs,
+                max_workers=max_workers,
+                on_run=on_run,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+            )
+        finally:
+            state.close()
+
+    def _sync_runs(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        target_dir: str,
+        projects: List[str] | None,
+        criteria: SpectraAssureDownloadCriteria,
+        state: SpectraAssureSyncState,
+        stop_event: threading.Event,
+        interval: float,
+        max_runs: int | None,
+        max_workers: int,
+        on_run: Callable[[Dict[str, Any]], None] | None,
+        auto_adapt_to_throttle: bool,
+    ) -> Dict[str, Any]:
+        run = 0
+        report: Dict[str, Any] = {}
+        while not stop_event.is_set():
+            run += 1
+            start = time.monotonic()
+
+            report = self._sync_run(
+                target_dir=target_dir,
+                projects=projects,
+                criteria=criteria,
+                state=state,
+                stop_event=stop_event,
+                max_workers=max_workers,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+            )
+            report["run"] = run
+            state.flush()
+
+            logger.info(
+                "sync run %d: packages %d, downloaded %d, verified %d, unchanged %d, errors %d",
+                run,
+                report["packages"],
+                len(report["downloaded"]),
+                len(report["verified"]),
+                report["unchanged"],
+                len(report["errors"]),
+            )
+            if on_run is not None:
+                on_run(report)
+
+            if max_runs is not None and run >= max_runs:
+                break
+
+            stop_event.wait(max(0.0, interval - (time.monotonic() - start)))
+
+        return report
@@ -0,0 +1,344 @@
+import concurrent.futures
+import logging
+import os
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+from spectra_assure_api_client.communication.profiling import profiled
+from spectra_assure_api_client.communication.download_journal import JOURNAL_FILE_NAME
+from spectra_assure_api_client.communication.downloader_manifest import MANIFEST_FILE_NAME
+from spectra_assure_api_client.communication.exceptions import (
+    SpectraAssureInvalidAction,
+    SpectraAssureInvalidPath,
+    SpectraAssureUnexpectedNoDataFound,
+)
+from spectra_assure_api_client.communication.hashing import (
+    SUPPORTED_HASH_KEYS,
+    file_hex_digests,
+)
+from .base import SpectraAssureApiOperationsBase
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureApiOperationsVerifyMirror(  # pylint: disable=too-many-ancestors
+    SpectraAssureApiOperationsBase,
+):
+
+    @staticmethod
+    def _is_internal_file(file_name: str) -> bool:
+        # temp files of the UrlDownloader and our own bookkeeping files are never 'extra'
+        for internal in [MANIFEST_FILE_NAME, JOURNAL_FILE_NAME]:
+            if file_name == internal or file_name.startswith(f"{internal}."):
+                return True
+        return file_name.startswith(".") and file_name.endswith(".tmp")
+
+    def _get_mirror_versions(
+        self,
+        *,
+        project: str,
+        package: str,
+        auto_adapt_to_throttle: bool = False,
+    ) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        data = self.list(
+            project=project,
+            package=package,
+            auto_adapt_to_throttle=auto_adapt_to_throttle,
+        )
+        if data.status_code != 200:
+            msg = f"NO DATA FOUND with list({project},{package}) :: {data.status_code} {data.text}"
+            raise SpectraAssureUnexpectedNoDataFound(msg)
+
+        json_data = data.json()
+        list_items: Dict[str, Dict[str, Any]] = {}
+        for item in json_data.get("versions") or []:
+            if item.get("version"):
+                list_items[item["version"]] = item
+
+        versions = self._flatten_list(
+            json_data,
+            multiple="versions",
+            single="version",
+        )
+        return versions, list_items
+
+    def _get_mirror_expectation(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        project: str,
+        package: str,
+        version: str,
+        list_item: Dict[str, Any] | None,
+        only_approved: bool,
+        auto_adapt_to_throttle: bool = False,
+        **qp: Any,
+    ) -> Dict[str, Any] | None:
+        """
+        Return:
+            None if the version is not expected in the mirror (not approved),
+            otherwise a dict with the 'file-name' and 'hashes' of the version.
+        """
+        if only_approved is True:
+            if list_item is None or "approval_status" not in list_item:
+                data = self.list(
+                    project=project,
+                    package=package,
+                    version=version,
+                    auto_adapt_to_throttle=auto_adapt_to_throttle,
+                )
+                if data.status_code != 200:
+                    msg = f"NO DATA FOUND with list({project},{package},{version}) :: {data.status_code} {data.text}"
+                    raise SpectraAssureUnexpectedNoDataFound(msg)
+                list_item = data.json()
+
+            assert list_item is not None
+            if str(list_item.get("approval_status", "")).lower() != "approved":
+                return None
+
+        valid_qp = self.qp_status(what="version", **qp)
+        valid_qp.pop("download", None)  # never spend download capacity on a verification
+
+        data = self.status(
+            project=project,
+            package=package,
+            version=version,
+            auto_adapt_to_throttle=auto_adapt_to_throttle,
+            **valid_qp,
+        )
+        if data.status_code != 200:
+            msg = f"NO DATA FOUND with status({project},{package},{version}) :: {data.status_code} {data.text}"
+            raise SpectraAssureUnexpectedNoDataFound(msg)
+
+        json_data = data.json()
+        file_name = self._get_path(path="analysis/report/info/file/name", data=json_data)
+        hashes = self._get_path(path="analysis/report/info/file/hashes", data=json_data)
+        if file_name is None or hashes is None:
+            msg = f"no file name or hashes in status for {project}/{package}@{version}"
+            raise SpectraAssureUnexpectedNoDataFound(msg)
+
+        return {
+            "file-name": self.simple_path_to_posix(target_path=str(file_name)).split("/")[-1],
+            "hashes": self._extract_hashes(hashes),
+        }
+
+    # PUBLIC
+
+    @profiled
+    def verify_mirror(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        *,
+        target_dir: str,
+        project: str,
+        package: str,
+        versions: List[str] | None = None,
+        only_approved: bool = True,
+        hash_key: str = "sha256",
+        max_workers: int = 4,
+        use_processes: bool = False,
+        auto_adapt_to_throttle: bool = False,
+        **qp: Any,
+    ) -> Dict[str, Any]:
+        """
+        Action:
+            Verify a download directory (a mirror of one project/package)
+            against the file names and hashes known on the Portal.
+
+        Args:
+         - target_dir: str, mandatory;
+            The directory holding the downloaded files; MUST exist.
+
+         - project: str, mandatory.
+         - package: str, mandatory.
+
+         - versions: List[str] | None = None, optional;
+            The versions expected in the mirror.
+            If None, all versions of the package are inspected.
+
+         - only_approved: bool = True, optional;
+            Only approved versions are expected in the mirror, as only those can be downloaded.
+
+         - hash_key: str = "sha256", optional;
+            The hash used for the verification: 'sha1' or 'sha256'.
+
+         - max_workers: int = 4, optional;
+            The number of concurrent status() requests and of concurrent file hash workers.
+
+         - use_processes: bool = False, optional;
+            Hash files in a process pool instead of a thread pool.
+            hashlib releases the GIL, so threads are usually sufficient.
+
+         - auto_adapt_to_throttle: bool = False, optional.
+         - qp: Dict[str,Any], optional; 'build' is passed on to status().
+
+        Return:
+            A dict that can be serialized as JSON with:
+             - target_dir, project, package, hash_key
+             - ok: list of {file, version}
+             - missing: list of {file, version}
+             - corrupt: list of {file, version, expected, actual}
+             - extra: list of file names in the directory that belong to no expected version
+               (empty when there are errors, as those files may belong to the failing versions)
+             - collisions: list of {file, versions} for a file name expected for more than one version
+             - errors: list of {version, error} for versions we could not get information for
+               or whose file could not be hashed
+             - elapsed: float, seconds
+
+        Raises:
+            SpectraAssureInvalidAction: if the hash_key is not supported.
+            SpectraAssureInvalidPath: if the target directory does not exist.
+            SpectraAssureUnexpectedNoDataFound: if the package versions cannot be listed.
+
+        Notes:
+            The status() requests never ask for a download URL, so the Portal download capacity is not used.
+            Files are always hashed again; the verification manifest is not consulted.
+            A directory holds one file per name: of the versions in a collision,
+            the ones whose hash the file does not have are reported as missing
+            (or all as corrupt if the file matches none of them).
+        """
+        start = time.monotonic()
+
+        if hash_key not in SUPPORTED_HASH_KEYS:
+            msg = f"the hash key you provided is not supported; it must be one of {SUPPORTED_HASH_KEYS}"
+            raise SpectraAssureInvalidAction(message=msg)
+
+        target_dir_posix = self.simple_path_to_posix(target_path=target_dir)
+        exists, what = self.exists_posix_path(item_path=target_dir_posix)
+        if exists is False or what != "D":
+            msg = f"the target directory you specified does not exist or is not a directory; {target_dir_posix}"
+            raise SpectraAssureInvalidPath(msg)
+
+        all_versions, list_items = self._get_mirror_versions(
+            project=project,
+            package=package,
+            auto_adapt_to_throttle=auto_adapt_to_throttle,
+        )
+        if versions is None:
+            versions = all_versions
+
+        report: Dict[str, Any] = {
+            "target_dir": target_dir_posix,
+            "project": project,
+            "package": package,
+            "hash_key": hash_key,
+            "ok": [],
+            "missing": [],
+            "corrupt": [],
+            "extra": [],
+            "collisions": [],
+            "errors": [],
+        }
+
+        # fetch the expected hashes concurrently
+        expected: Dict[Tuple[str, str], Dict[str, str]] = {}  # (file name, version) -> hashes
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            status_futures = {
+                pool.submit(
+                    self._get_mirror_expectation,
+                    project=project,
+                    package=package,
+                    version=version,
+                    list_item=list_items.get(version),
+                    only_approved=only_approved,
+                    auto_adapt_to_throttle=auto_adapt_to_throttle,
+                    **qp,
+                ): version
+                for version in versions
+            }
+            for future in concurrent.futures.as_completed(status_futures):
+                version = status_futures[future]
+                try:
+                    expectation = future.result()
+                except Exception as e:  # pylint:disable=broad-exception-caught
+                    logger.error("cannot get the expected hashes of %s/%s@%s; %s", project, package, version, e)
+                    report["errors"].append({"version": version, "error": str(e)})
+                    continue
+
+                if expectation is not None:
+                    expected[(expectation["file-name"], version)] = expectation["hashes"]
+
+        by_file: Dict[str, List[str]] = {}  # file name -> versions
+        for file_name, version in sorted(expected.keys()):
+            by_file.setdefault(file_name, []).append(version)
+
+        for file_name, file_versions in by_file.items():
+            if len(file_versions) > 1:
+                logger.warning("file name '%s' is expected for more than one version: %s", file_name, file_versions)
+                report["collisions"].append({"file": file_name, "versions": file_versions})
+
+        present = {
+            entry.name
+            for entry in os.scandir(target_dir_posix)
+            if entry.is_file() and not self._is_internal_file(entry.name)
+        }
+
+        # hash all present expected files concurrently
+        pool_class: Any = concurrent.futures.ThreadPoolExecutor
+        if use_processes is True:
+            pool_class = concurrent.futures.ProcessPoolExecutor
+
+        with pool_class(max_workers=max_workers) as pool:
+            hash_futures: Dict[concurrent.futures.Future[Dict[str, str]], str] = {}
+            for file_name, file_versions in by_file.items():
+                if file_name not in present:
+                    report["missing"].extend({"file": file_name, "version": version} for version in file_versions)
+                    continue
+                hash_future = pool.submit(
+                    file_hex_digests,
+                    f"{target_dir_posix}/{file_name}",
+                    [hash_key],
+                    metrics=None if use_processes else self.metrics,  # the registry cannot go to another process
+                )
+                hash_futures[hash_future] = file_name
+
+            for hash_future in concurrent.futures.as_completed(hash_futures):
+                file_name = hash_futures[hash_future]
+                file_versions = by_file[file_name]
+                try:
+                    actual = hash_future.result()[hash_key]
+                except Exception as e:  # pylint:disable=broad-exception-caught
+                    # e.g. an OSError, or BrokenProcessPool if a hash worker process died
+                    logger.error("cannot hash '%s'; %s", file_name, e)
+                    report["errors"].extend({"version": version, "error": str(e)} for version in file_versions)
+                    continue
+
+                matching = [v for v in file_versions if expected[(file_name, v)].get(hash_key) == actual]
+                for version in file_versions:
+                    digest = expected[(file_name, version)].get(hash_key)
+                    if version in matching:
+                        report["ok"].append({"file": file_name, "version": version})
+                    elif len(matching) > 0:
+                        # the file with this name holds the content of another version
+                        report["missing"].append({"file": file_name, "version": version})
+                    else:
+                        logger.error(
+                            "verify of '%s' fails, expected: '%s:%s' but got: '%s'", file_name, hash_key, digest, actual
+                        )
+                        report["corrupt"].append(
+                            {"file": file_name, "version": version, "expected": digest, "actual": actual}
+                        )
+
+        # with errors we cannot tell which files are extra, so we report none rather than too many
+        if len(report["errors"]) == 0:
+            report["extra"] = sorted(present - set(by_file.keys()))
+
+        for k in ["ok", "missing", "corrupt"]:
+            report[k].sort(key=lambda x: (str(x["file"]), str(x["version"])))
+        report["elapsed"] = time.monotonic() - start
+
+        logger.info(
+            "verify_mirror %s/%s: ok %d, missing %d, corrupt %d, extra %d, collisions %d, errors %d",
+            project,
+            package,
+            len(report["ok"]),
+            len(report["missing"]),
+            len(report["corrupt"]),
+            len(report["extra"]),
+            len(report["collisions"]),
+            len(report["errors"]),
+        )
+        return report
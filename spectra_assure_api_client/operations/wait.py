@@ -0,0 +1,221 @@
+import logging
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Tuple,
+)
+
+import requests
+
+from spectra_assure_api_client.communication.profiling import profiled
+from spectra_assure_api_client.communication.poll_schedule import SpectraAssurePollSchedule
+from .base import SpectraAssureApiOperationsBase
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureApiOperationsWait(  # pylint: disable=too-many-ancestors
+    SpectraAssureApiOperationsBase,
+):
+
+    def _split_purl(self, purl: str) -> Tuple[str, str, str]:
+        # 'project/package@version', optionally prefixed with 'pkg:rl/'
+        if purl.startswith("pkg:rl/"):
+            purl = purl[len("pkg:rl/") :]
+
+        return self.extract_purl_components(purl)
+
+    def _new_poll_result(self, purl: str) -> Dict[str, Any]:
+        project, package, version = self._split_purl(purl)
+        return {
+            "purl": purl,
+            "project": project,
+            "package": package,
+            "version": version,
+            "status_code": None,
+            "analysis": None,
+            "done": False,
+            "final": False,
+            "data": None,
+        }
+
+    def _poll_status_once(
+        self,
+        *,
+        purl: str,
+        auto_adapt_to_throttle: bool = False,
+        **qp: Any,
+    ) -> Dict[str, Any]:
+        """
+        Return:
+            A dict with:
+             - purl, project, package, version
+             - status_code: int | None; None if the request itself failed
+             - analysis: str | None; the lowercase 'analysis/status', e.g. 'done'
+             - done: bool
+             - final: bool; True if polling again makes no sense (done, or a client error)
+             - data: the json of the status response or None
+        """
+        result = self._new_poll_result(purl)
+        project, package, version = result["project"], result["package"], result["version"]
+
+        try:
+            response = self.status(
+                project=project,
+                package=package,
+                version=version,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+                **qp,
+            )
+        except requests.RequestException as e:
+            logger.warning("status of %s failed, will retry; %s", purl, e)
+            return result
+
+        result["status_code"] = response.status_code
+        if response.status_code != 200:
+            # a version may not be visible yet just after the upload (404),
+            # throttling and server errors are transient, all other errors are final
+            if response.status_code not in [404, 429] and response.status_code < 500:
+                result["final"] = True
+            logger.info("status of %s: %s %s", purl, response.status_code, response.text)
+            return result
+
+        result["data"] = response.json()
+        analysis = self._get_path(path="analysis/status", data=result["data"])
+        if analysis is not None:
+            result["analysis"] = str(analysis).lower()
+
+        if result["analysis"] == "done":
+            result["done"] = True
+            result["final"] = True
+
+        return result
+
+    def _wait_run(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        schedule: SpectraAssurePollSchedule,
+        last: Dict[str, Dict[str, Any]],
+        start: float,
+        timeout: int,
+        auto_adapt_to_throttle: bool,
+        **valid_qp: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        deadline = start + timeout
+
+        while time.monotonic() < deadline:
+            item = schedule.next_due()
+            if item is None:
+                return
+
+            # a poll that would be due after the deadline is done at the deadline instead
+            purl, delay = item
+            delay = min(delay, deadline - time.monotonic())
+            if delay > 0:
+                time.sleep(delay)
+
+            result = self._poll_status_once(
+                purl=purl,
+                auto_adapt_to_throttle=auto_adapt_to_throttle,
+                **valid_qp,
+            )
+            result["elapsed"] = time.monotonic() - start
+            last[purl] = result
+
+            if result["final"] is True:
+                schedule.remove(purl)
+                logger.info("%s: analysis %s after %.1f seconds", purl, result["analysis"], result["elapsed"])
+                yield result
+                continue
+
+            schedule.reschedule(purl)
+
+        # timeout: report the last status of all versions still pending
+        for purl in schedule.keys():
+            schedule.remove(purl)
+            result = last[purl]
+            result["elapsed"] = time.monotonic() - start
+            logger.warning("%s: analysis not done after %d seconds: %s", purl, timeout, result["analysis"])
+            yield result
+
+    # PUBLIC
+
+    @profiled
+    def wait_until_done(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        versions: List[str],
+        timeout: int = 3600,  # in seconds
+        initial_interval: float = 1.0,  # in seconds
+        max_interval: float = 30.0,  # in seconds
+        backoff: float = 1.5,
+        auto_adapt_to_throttle: bool = True,
+        **qp: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Action:
+            Wait until the analysis of all specified versions is done,
+            polling all pending versions from one loop with an adaptive interval.
+
+        Args:
+         - versions: List[str], mandatory;
+            The versions to wait for as: 'project/package@version'.
+
+         - timeout: int, default 3600, optional;
+            The maximal wall time in seconds for waiting on all versions together.
+
+         - initial_interval: float, default 1.0, optional;
+            Each version is polled immediately and again after this many seconds.
+
+         - max_interval: float, default 30.0, optional;
+            The interval grows by 'backoff' after each poll but never beyond this value.
+
+         - backoff: float, default 1.5, optional.
+
+         - auto_adapt_to_throttle: bool, default True, optional;
+            On a throttle response all requests of this client wait for the time the Portal asks for,
+            the poll schedule itself is not changed.
+
+         - qp: Dict[str,Any], optional; 'build' is passed on to status().
+
+        Return:
+            A generator that yields one dict per version (see _poll_status_once()):
+             - as soon as the analysis of the version is 'done',
+             - as soon as the status shows a client error (e.g. 403), with 'done' False,
+             - on timeout, for all remaining versions with their last status and 'done' False.
+            Each dict also has 'elapsed': the seconds since the start of the wait.
+
+        Raises:
+            SpectraAssureInvalidAction: if a version is not a valid 'project/package@version', when called.
+
+        Notes:
+            Versions are yielded in the order they finish, not in the order specified.
+            The timeout starts when wait_until_done() is called.
+            Stop iterating at any time to stop waiting.
+            The download query parameter is never used here, so no download capacity is spent.
+        """
+        # validate all versions now, not on the first next() of the generator
+        last: Dict[str, Dict[str, Any]] = {purl: self._new_poll_result(purl) for purl in versions}
+
+        valid_qp = self.qp_status(what="version", **qp)
+        valid_qp.pop("download", None)
+
+        schedule = SpectraAssurePollSchedule(
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            backoff=backoff,
+        )
+        for purl in versions:
+            schedule.add(purl)
+
+        return self._wait_run(
+            schedule=schedule,
+            last=last,
+            start=time.monotonic(),  # the timeout starts now, not when the caller starts iterating
+            timeout=timeout,
+            auto_adapt_to_throttle=auto_adapt_to_throttle,
+            **valid_qp,
+        )
@@ -0,0 +1,216 @@
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Tuple,
+)
+
+import requests
+
+from spectra_assure_api_client.communication.exceptions import (
+    SpectraAssureInvalidAction,
+)
+from .spectra_assure_api_operations import SpectraAssureApiOperations
+
+logger = logging.getLogger(__name__)
+
+
+class SpectraAssureApiClientPool:
+
+    def __init__(
+        self,
+        *,
+        organization: str | None = None,
+        group: str | None = None,
+        **client_args: Any,
+    ) -> None:
+        """
+        Action:
+            Initialize a pool of clients for many organizations and groups on one Portal server.
+
+        Args:
+         - organization: str | None = None, optional;
+            The default organization of client() and fan_out().
+
+         - group: str | None = None, optional;
+            If the organization and group are given, the first client is created (and validated) now.
+
+         - client_args: Any;
+            The arguments of SpectraAssureApiOperations, e.g. server, token, timeout, auto_adapt_to_throttle,
+            proxy_*, max_bytes_per_second or config_file.
+
+        Notes:
+            All clients of the pool are views of the first one (see: SpectraAssureApi.view()):
+            they share one session (connection pool), rate governor, bandwidth limit,
+            download URL cache, metrics registry and profiler,
+            so a throttle response for one group slows down the requests of all groups.
+            The pool is safe to use from multiple threads.
+        """
+        self.organization = organization
+        self.client_args = client_args
+
+        self._lock = threading.Lock()
+        self._root: SpectraAssureApiOperations | None = None
+        self._clients: Dict[Tuple[str, str], SpectraAssureApiOperations] = {}
+
+        if organization is not None and group is not None:
+            self.client(group=group)
+
+    def __enter__(self) -> "SpectraAssureApiClientPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _split_group(
+        self,
+        group: str,
+    ) -> Tuple[str, str]:
+        # 'group' or 'organization/group'
+        organization, sep, name = group.rpartition("/")
+        if sep == "":
+            organization = str(self.organization or "")
+        if organization == "" or name == "":
+            msg = (
+                f"no organization for the group, use 'organization/group' or set the organization of the pool: {group}"
+            )
+            raise SpectraAssureInvalidAction(message=msg)
+        return organization, name
+
+    @staticmethod
+    def _fan_out_one(
+        client: SpectraAssureApiOperations,
+        operation: str,
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "organization": client.organization,
+            "group": client.group,
+            "ok": False,
+            "result": None,
+            "error": None,
+        }
+        start = time.monotonic()
+        try:
+            r = getattr(client, operation)(**kwargs)
+            result["result"] = r
+            result["ok"] = True
+            if isinstance(r, requests.Response) and r.status_code >= 400:
+                # like bulk() and the cli: an error response is a failure
+                result["ok"] = False
+                result["error"] = f"{r.status_code} {r.reason}"
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.exception("%s for %s/%s failed", operation, client.organization, client.group)
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["elapsed"] = time.monotonic() - start
+        return result
+
+    def _fan_out_run(
+        self,
+        *,
+        clients: List[SpectraAssureApiOperations],
+        operation: str,
+        max_workers: int,
+        kwargs: Dict[str, Any],
+    ) -> Iterator[Dict[str, Any]]:
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [pool.submit(self._fan_out_one, client, operation, kwargs) for client in clients]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # PUBLIC
+
+    def client(
+        self,
+        *,
+        group: str,
+        organization: str | None = None,
+    ) -> SpectraAssureApiOperations:
+        """
+        Action:
+            Return the client for a group; the same client is returned for every call with the same group.
+
+        Args:
+         - group: str, mandatory; 'group' or 'organization/group'.
+         - organization: str | None = None, optional; default: the organization of the pool.
+
+        Raises:
+         - SpectraAssureInvalidAction: if there is no organization, or the first client cannot be created.
+        """
+        if organization is not None:
+            group = f"{organization}/{group}"
+        key = self._split_group(group)
+
+        with self._lock:
+            r = self._clients.get(key)
+            if r is not None:
+                return r
+
+            if self._root is None:
+                self._root = SpectraAssureApiOperations(organization=key[0], group=key[1], **self.client_args)
+                r = self._root
+            else:
+                r = self._root.view(organization=key[0], group=key[1])
+
+            self._clients[key] = r
+            return r
+
+    def clients(self) -> List[SpectraAssureApiOperations]:
+        """Return all clients created so far."""
+        with self._lock:
+            return list(self._clients.values())
+
+    def fan_out(
+        self,
+        *,
+        groups: List[str],
+        operation: str,
+        max_workers: int = 8,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Action:
+            Run the same operation for many groups concurrently.
+
+        Args:
+         - groups: List[str], mandatory; each 'group' or 'organization/group'.
+         - operation: str, mandatory; the name of an operation of SpectraAssureApiOperations, e.g. 'list'.
+         - max_workers: int = 8, optional; the number of groups processed at the same time.
+         - kwargs: Any; the arguments of the operation, the same for all groups.
+
+        Return:
+            A generator that yields one dict per group, in the order they finish:
+             - organization, group
+             - ok: bool; False if the operation raised an exception or returned a status code of 400 or above
+             - result: the return value of the operation, or None
+             - error: str | None; the exception as text, or the status code and reason
+             - elapsed: float, seconds
+
+        Raises:
+         - SpectraAssureInvalidAction: if the operation is unknown or a group has no organization,
+           when called (before any operation runs).
+        """
+        if operation.startswith("_") or not callable(getattr(SpectraAssureApiOperations, operation, None)):
+            msg = f"unknown operation: {operation}"
+            raise SpectraAssureInvalidAction(message=msg)
+
+        # validate all groups now, not on the first next() of the generator
+        clients = [self.client(group=group) for group in groups]
+        return self._fan_out_run(clients=clients, operation=operation, max_workers=max_workers, kwargs=kwargs)
+
+    def close(self) -> None:
+        """Close the shared session and stop the metrics exporter, if any."""
+        with self._lock:
+            root = self._root
+        if root is None:
+            return
+        root.metrics.stop_exporter()
+        root.session.close()
@@ -12,6 +12,11 @@ from spectra_assure_api_client.operations.status import SpectraAssureApiOperatio
 
 # pseudo operation
 from spectra_assure_api_client.operations.download import SpectraAssureApiOperationsDownload
+from spectra_assure_api_client.operations.verify_mirror import SpectraAssureApiOperationsVerifyMirror
+from spectra_assure_api_client.operations.wait import SpectraAssureApiOperationsWait
+from spectra_assure_api_client.operations.scan_async import SpectraAssureApiOperationsScanAsync
+from spectra_assure_api_client.operations.sync import SpectraAssureApiOperationsSync
+from spectra_assure_api_client.operations.bulk import SpectraAssureApiOperationsBulk
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +30,18 @@ class SpectraAssureApiOperations(  # pylint: disable=too-many-ancestors
     SpectraAssureApiOperationsReport,  # Download analysis report for a version
     SpectraAssureApiOperationsStatus,  # Show analysis status for a version
     SpectraAssureApiOperationsChecks,  # Show performed checks for a version
+    SpectraAssureApiOperationsSync,  # Mirror all approved versions of a group, repeatedly (uses List and Download)
     SpectraAssureApiOperationsDownload,  # Get artifact download link for a version (uses List and Status)
+    SpectraAssureApiOperationsVerifyMirror,  # Verify a download directory against the Portal hashes (uses List and Status)
+    SpectraAssureApiOperationsScanAsync,  # Scan and track the analysis in the background (uses Scan, Status, Checks, Report)
+    SpectraAssureApiOperationsWait,  # Wait until the analysis of many versions is done (uses Status)
+    SpectraAssureApiOperationsBulk,  # Run many operations in dependency order, concurrently (uses Create, Scan, ...)
 ):
-    """A class that combines all operations"""
+    """
+    A class that combines all operations.
+
+    One instance can be shared by many threads: the operations keep their per-call state local
+    (e.g. the download criteria), and the shared parts (session, rate governor, bandwidth limit,
+    download URL cache, metrics, profiler and scan tracker) are thread-safe.
+    Changing the attributes of an instance (e.g. the group) while operations run is not; use view() instead.
+    """
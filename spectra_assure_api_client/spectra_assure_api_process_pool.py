@@ -0,0 +1,172 @@
+import concurrent.futures
+import logging
+import multiprocessing.context
+import os
+import pickle
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+)
+
+from spectra_assure_api_client.communication.exceptions import (
+    SpectraAssureUnexpectedNoDataFound,
+)
+from .spectra_assure_api_operations import SpectraAssureApiOperations
+
+logger = logging.getLogger(__name__)
+
+# the client of a worker process, see: _init_worker()
+_worker_client: SpectraAssureApiOperations | None = None
+
+
+def _init_worker(client_state: bytes) -> None:
+    # unpickled (not inherited with fork): every worker gets its own session, rate governor and caches
+    global _worker_client  # pylint: disable=global-statement
+    _worker_client = pickle.loads(client_state)
+
+
+def _run_version(
+    func: Callable[..., Any],
+    purl: str,
+    kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    assert _worker_client is not None
+    result: Dict[str, Any] = {
+        "version": purl,
+        "ok": False,
+        "result": None,
+        "error": None,
+    }
+    start = time.monotonic()
+    try:
+        project, package, version = _worker_client.extract_purl_components(purl)
+        result["result"] = func(_worker_client, project=project, package=package, version=version, **kwargs)
+        result["ok"] = True
+    except Exception as e:  # pylint:disable=broad-exception-caught
+        logger.exception("%s failed for %s", getattr(func, "__name__", func), purl)
+        # as text: not every exception can be pickled back to the parent
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+class SpectraAssureApiProcessPool:
+
+    def __init__(
+        self,
+        *,
+        client: SpectraAssureApiOperations,
+        max_workers: int | None = None,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+    ) -> None:
+        """
+        Action:
+            Initialize a pool of worker processes for CPU-heavy work per version, e.g. hashing or report parsing.
+
+        Args:
+         - client: SpectraAssureApiOperations, mandatory;
+            Pickled once per worker: only its configuration (server, organization, group, token, proxies,
+            timeout, throttle handling, bandwidth limit, min request interval, profile modes) is sent,
+            and each worker makes its own session, rate governor, download URL cache and metrics.
+            To keep the token out of the pickle, see: client.reference_secrets().
+
+         - max_workers: int | None = None, optional;
+            The number of worker processes, default: the number of CPUs.
+
+         - mp_context: multiprocessing.context.BaseContext | None = None, optional;
+            E.g. multiprocessing.get_context("spawn"); default: the platform default.
+
+        Notes:
+            The workers do not share the throttle handling and the bandwidth limit with each other
+            or with the client, so lower max_bytes_per_second accordingly.
+            The metrics and profiles of the workers stay in the workers.
+            Session adapters mounted on the client (e.g. a cassette or the timing adapter) are not sent.
+        """
+        self.client = client
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(pickle.dumps(client),),
+        )
+
+    def __enter__(self) -> "SpectraAssureApiProcessPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    # PUBLIC
+
+    def map_versions(
+        self,
+        *,
+        func: Callable[..., Any],
+        versions: Iterable[str],
+        max_in_flight: int | None = None,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Action:
+            Run func for every version in the worker processes.
+
+        Args:
+         - func: Callable[..., Any], mandatory;
+            Called in a worker as: func(client, project=..., package=..., version=..., **kwargs);
+            it must be picklable (a function defined at the top level of a module)
+            and so must its return value.
+
+         - versions: Iterable[str], mandatory; each 'project/package@version'.
+         - max_in_flight: int | None = None, optional;
+            The versions submitted but not yet finished, default: 2 * the number of workers;
+            the versions are read as needed, so they can be a generator of any length.
+
+         - kwargs: Any; passed to every call of func.
+
+        Return:
+            A generator that yields one dict per version, in the order they finish:
+             - version: str, 'project/package@version'
+             - ok: bool; False if func raised an exception
+             - result: the return value of func, or None
+             - error: str | None; the exception as text
+             - elapsed: float, seconds (in the worker)
+        """
+        limit = max_in_flight or 2 * self.max_workers
+        in_flight: Set[concurrent.futures.Future[Dict[str, Any]]] = set()
+
+        for purl in versions:
+            if len(in_flight) >= limit:
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            in_flight.add(self._pool.submit(_run_version, func, purl, kwargs))
+
+        for future in concurrent.futures.as_completed(in_flight):
+            yield future.result()
+
+    def versions(
+        self,
+        *,
+        project: str,
+        package: str,
+        auto_adapt_to_throttle: bool = False,
+    ) -> List[str]:
+        """Return all versions of a package as 'project/package@version', listed with the client of the pool."""
+        data = self.client.list(project=project, package=package, auto_adapt_to_throttle=auto_adapt_to_throttle)
+        if data.status_code != 200:
+            msg = f"NO DATA FOUND with list({project},{package}) :: {data.status_code} {data.text}"
+            raise SpectraAssureUnexpectedNoDataFound(msg)
+        return [f"{project}/{package}@{item['version']}" for item in data.json().get("versions") or []]
+
+    def close(self) -> None:
+        """Stop the worker processes after the submitted versions are done; a running map_versions() still gets them."""
+        # cancelled futures never complete for as_completed(), a running map_versions() would block on them
+        self._pool.shutdown(wait=True, cancel_futures=False)